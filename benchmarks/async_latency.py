@@ -0,0 +1,80 @@
+"""Measure how long generation blocks the asyncio event loop.
+
+Generates each corpus of benchmarks/suite.py inside an event loop while
+another task counts the loop's turns, with plain jscodegen.generate, with
+generate_async and its default time budget, with a node budget and in a
+thread executor.  Reports the total time and the longest stretch the loop
+was blocked for.
+
+    python benchmarks/async_latency.py [--time-budget S] [--node-budget N] [corpus ...]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+from suite import corpora
+
+
+async def run(generate):
+    longest = 0
+    done = False
+
+    async def tick():
+        nonlocal longest
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0)
+            now = time.perf_counter()
+            longest = max(longest, now - last)
+            last = now
+
+    ticker = asyncio.create_task(tick())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    code = await generate()
+    elapsed = time.perf_counter() - start
+    done = True
+    await ticker
+    return code, elapsed, longest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpora", nargs="*", help="corpora to run, all by default")
+    parser.add_argument("--time-budget", type=float, default=jscodegen.aio.TIME_BUDGET)
+    parser.add_argument("--node-budget", type=int, default=100)
+    args = parser.parse_args()
+
+    executor = ThreadPoolExecutor(1)
+
+    async def blocking(tree):
+        return jscodegen.generate(tree)
+
+    modes = {
+        "generate": blocking,
+        "time": lambda tree: jscodegen.generate_async(tree, time_budget=args.time_budget),
+        "nodes": lambda tree: jscodegen.generate_async(tree, node_budget=args.node_budget),
+        "thread": lambda tree: jscodegen.generate_async(tree, executor=executor),
+    }
+    print("%-8s %-9s %10s %14s" % ("corpus", "mode", "ms", "max block ms"))
+    for name, build in corpora():
+        if args.corpora and name not in args.corpora:
+            continue
+        tree = build()
+        expected = jscodegen.generate(tree)
+        for mode, generate in modes.items():
+            code, elapsed, longest = asyncio.run(run(lambda: generate(tree)))
+            if code != expected:
+                sys.exit("%s: the code differs with %s" % (name, mode))
+            print("%-8s %-9s %10.1f %14.1f" % (name, mode, elapsed * 1e3, longest * 1e3))
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Measure how generate_many scales with the number of worker processes.
+
+Replicates the trees in ``benchmarks/corpus`` into a batch and generates
+it with 1 up to ``os.cpu_count()`` workers, passing the items both as
+trees and as JSON strings (which pickle much faster).
+
+    python benchmarks/batch.py [--copies N] [--workers N ...]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+
+CORPUS = Path(__file__).parent / "corpus"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--copies", type=int, default=64)
+    parser.add_argument("--workers", type=int, nargs="*")
+    args = parser.parse_args()
+
+    sources = [path.read_text() for path in sorted(CORPUS.glob("*.json"))]
+    inputs = {"tree": [json.loads(source) for source in sources] * args.copies,
+              "json": sources * args.copies}
+    workers = args.workers or sorted({1, 2, 4, 8, os.cpu_count() or 1} & set(range(1, (os.cpu_count() or 1) + 1)))
+    print("%d items, %d CPUs" % (len(inputs["tree"]), os.cpu_count() or 1))
+    print("%-6s %8s %10s %8s" % ("input", "workers", "items/s", "speedup"))
+    for kind, items in inputs.items():
+        base = None
+        for count in workers:
+            start = time.perf_counter()
+            for _ in jscodegen.generate_many(items, workers=count):
+                pass
+            rate = len(items) / (time.perf_counter() - start)
+            base = base or rate
+            print("%-6s %8d %10.1f %7.2fx" % (kind, count, rate, rate / base))
+
+
+if __name__ == "__main__":
+    main()
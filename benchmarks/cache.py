@@ -0,0 +1,95 @@
+"""Measure the subtree cache on programs that share helper functions.
+
+Builds programs from the functions in ``benchmarks/corpus``, stripped of
+their locations like template trees, each with a statement of its own and
+a random selection of shared helpers.  Times generating them without a
+cache, with identity keys and with structural keys (for which every
+program gets its own copy of the helpers, as if it had been parsed again).
+
+    python benchmarks/cache.py [--programs N] [--helpers N] [--maxsize N]
+"""
+import argparse
+import copy
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+from jscodegen.cache import SubtreeCache
+
+CORPUS = Path(__file__).parent / "corpus"
+
+
+def strip_locations(node):
+    if isinstance(node, dict):
+        return {key: strip_locations(value) for key, value in node.items() if key not in ("loc", "range")}
+    if isinstance(node, list):
+        return [strip_locations(value) for value in node]
+    return node
+
+
+def functions(node):
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if node.get("type") == "FunctionExpression":
+                yield node
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+
+def statement(expression):
+    return {"type": "ExpressionStatement", "expression": expression}
+
+
+def program(helpers, index):
+    body = [statement({"type": "AssignmentExpression", "operator": "=",
+                       "left": {"type": "Identifier", "name": "helper%d" % i}, "right": helper})
+            for i, helper in enumerate(helpers)]
+    body.append(statement({"type": "CallExpression", "callee": {"type": "Identifier", "name": "main"},
+                           "arguments": [{"type": "Literal", "value": index, "raw": str(index)}]}))
+    return {"type": "Program", "body": body}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--programs", type=int, default=1000)
+    parser.add_argument("--helpers", type=int, default=5)
+    parser.add_argument("--maxsize", type=int, default=256)
+    args = parser.parse_args()
+
+    shared = []
+    for path in sorted(CORPUS.glob("*.json")):
+        with open(path) as fp:
+            shared.extend(functions(strip_locations(json.load(fp))))
+    random.seed(0)
+    selections = [random.sample(shared, min(args.helpers, len(shared))) for _ in range(args.programs)]
+    programs = [program(helpers, i) for i, helpers in enumerate(selections)]
+    copies = [program(copy.deepcopy(helpers), i) for i, helpers in enumerate(selections)]
+
+    print("%d programs, %d shared functions" % (args.programs, len(shared)))
+    print("%-10s %9s %9s %9s %8s" % ("cache", "ms", "hits", "misses", "speedup"))
+    expected = []
+    start = time.perf_counter()
+    for tree in programs:
+        expected.append(jscodegen.generate(tree))
+    base = time.perf_counter() - start
+    print("%-10s %9.1f %9s %9s %7.2fx" % ("none", base * 1e3, "-", "-", 1))
+    for name, trees, structural in (("identity", programs, False), ("structure", copies, True)):
+        cache = SubtreeCache(args.maxsize, structural)
+        start = time.perf_counter()
+        for tree, code in zip(trees, expected):
+            assert jscodegen.generate(tree, cache=cache) == code
+        elapsed = time.perf_counter() - start
+        info = cache.cache_info()
+        print("%-10s %9.1f %9d %9d %7.2fx" % (name, elapsed * 1e3, info.hits, info.misses, base / elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Compare the size of compact and default output on the benchmark corpus.
+
+Generates every ESTree JSON file in ``benchmarks/corpus`` in the default
+pretty format and in the compact format and reports the byte reduction,
+raw and gzipped, together with the generation time of each format.
+
+    python benchmarks/compact.py [--repeat N]
+"""
+import argparse
+import gzip
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+
+CORPUS = Path(__file__).parent / "corpus"
+
+
+def best_time(tree, compact, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        code = jscodegen.generate(tree, compact=compact)
+        best = min(best, time.perf_counter() - start)
+    return code.encode("utf-8"), best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    print("%-12s %9s %9s %7s %10s %10s %7s %10s %10s" % (
+        "file", "pretty", "compact", "saved", "pretty.gz", "compact.gz", "saved", "pretty ms", "compact ms"))
+    for path in sorted(CORPUS.glob("*.json")):
+        with open(path) as fp:
+            tree = json.load(fp)
+        pretty, pretty_time = best_time(tree, False, args.repeat)
+        compact, compact_time = best_time(tree, True, args.repeat)
+        pretty_gz = len(gzip.compress(pretty, 9))
+        compact_gz = len(gzip.compress(compact, 9))
+        print("%-12s %9d %9d %6.1f%% %10d %10d %6.1f%% %10.2f %10.2f" % (
+            path.stem, len(pretty), len(compact), 100 - 100.0 * len(compact) / len(pretty),
+            pretty_gz, compact_gz, 100 - 100.0 * compact_gz / pretty_gz,
+            pretty_time * 1e3, compact_time * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Compare compressing code while it is generated with compressing it after.
+
+For the trees in ``benchmarks/corpus``, repeated N times, generates gzip
+output with ``generate_compressed_to`` and with ``generate`` followed by
+encoding and ``zlib``, and reports the raw and compressed size, the time
+until the first compressed bytes are written, the total time and the peak
+memory of both, per compression level and flush mode.
+
+    python benchmarks/compress.py [--copies N] [--repeat N]
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+from jscodegen.compress import FORMATS
+
+CORPUS = Path(__file__).parent / "corpus"
+
+
+class Sink:
+    """A binary file that only notes when it is first written to."""
+
+    def __init__(self):
+        self.first = None
+
+    def write(self, data):
+        if self.first is None:
+            self.first = time.perf_counter()
+
+
+def after(tree, level, sink):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, FORMATS["gzip"])
+    data = jscodegen.generate(tree).encode("utf-8")
+    compressed = compressor.compress(data) + compressor.flush()
+    sink.write(compressed)
+    return len(data), len(compressed)
+
+
+def streamed(tree, level, flush, sink):
+    return jscodegen.generate_compressed_to(tree, sink, level=level, flush=flush)
+
+
+def measure(run, repeat):
+    first = best = float("inf")
+    for _ in range(repeat):
+        sink = Sink()
+        start = time.perf_counter()
+        run(sink)
+        best = min(best, time.perf_counter() - start)
+        first = min(first, sink.first - start)
+    tracemalloc.start()
+    sizes = run(Sink())
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return sizes, first, best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--copies", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print("%-10s %-17s %10s %10s %9s %9s %9s" % ("corpus", "mode", "KB", "gzip KB", "first ms", "ms", "peak KB"))
+    for path in sorted(CORPUS.glob("*.json")):
+        tree = json.loads(path.read_text())
+        tree = {"type": "Program", "body": tree["body"] * args.copies}
+        for level in (1, 6, 9):
+            runs = [("after, %d" % level, lambda sink: after(tree, level, sink))]
+            for flush in (None, "sync"):
+                runs.append(("streamed, %d%s" % (level, ", " + flush if flush else ""),
+                             lambda sink, flush=flush: streamed(tree, level, flush, sink)))
+            for mode, run in runs:
+                sizes, first, seconds, peak = measure(run, args.repeat)
+                print("%-10s %-17s %10.1f %10.1f %9.1f %9.1f %9.1f" % (
+                    path.stem, mode, sizes[0] / 1024, sizes[1] / 1024, first * 1e3, seconds * 1e3, peak / 1024))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+var Emitter = (function () {
+    function Emitter() {
+        this.listeners = {};
+        this.maxListeners = 10;
+    }
+
+    Emitter.prototype.on = function (name, listener) {
+        var list = this.listeners[name];
+        if (!list) {
+            list = this.listeners[name] = [];
+        }
+        if (list.length >= this.maxListeners) {
+            throw new Error("Too many listeners for " + name + ": " + list.length);
+        }
+        list.push(listener);
+        return this;
+    };
+
+    Emitter.prototype.off = function (name, listener) {
+        var list = this.listeners[name], i;
+        if (!list) {
+            return this;
+        }
+        for (i = list.length - 1; i >= 0; i--) {
+            if (list[i] === listener) {
+                list.splice(i, 1);
+                break;
+            }
+        }
+        return this;
+    };
+
+    Emitter.prototype.emit = function (name) {
+        var list = this.listeners[name], args = [], i;
+        if (!list || !list.length) {
+            return false;
+        }
+        for (i = 1; i < arguments.length; i++) {
+            args.push(arguments[i]);
+        }
+        list = list.slice();
+        for (i = 0; i < list.length; i++) {
+            list[i].apply(this, args);
+        }
+        return true;
+    };
+
+    return Emitter;
+})();
+
+var utils = {
+    extend: function (target) {
+        var i, key, source;
+        for (i = 1; i < arguments.length; i++) {
+            source = arguments[i];
+            for (key in source) {
+                if (Object.prototype.hasOwnProperty.call(source, key)) {
+                    target[key] = source[key];
+                }
+            }
+        }
+        return target;
+    },
+    debounce: function (fn, wait) {
+        var timer = null;
+        return function () {
+            var self = this, args = arguments;
+            if (timer !== null) {
+                clearTimeout(timer);
+            }
+            timer = setTimeout(function () {
+                timer = null;
+                fn.apply(self, args);
+            }, wait);
+        };
+    },
+    escape: function (text) {
+        return String(text).replace(/&/g, "&amp;").replace(/</g, "&lt;").replace(/>/g, "&gt;").replace(/"/g, "&quot;");
+    },
+    pad: function (value, width) {
+        var text = String(value);
+        while (text.length < width) {
+            text = "0" + text;
+        }
+        return text;
+    },
+    formatDate: function (date) {
+        return date.getFullYear() + "-" + utils.pad(date.getMonth() + 1, 2) + "-" + utils.pad(date.getDate(), 2);
+    },
+    range: function (start, stop, step) {
+        var result = [], i;
+        step = step || 1;
+        for (i = start; step > 0 ? i < stop : i > stop; i += step) {
+            result.push(i);
+        }
+        return result;
+    }
+};
+
+function Store(name, storage) {
+    Emitter.call(this);
+    this.name = name;
+    this.storage = storage;
+    this.items = [];
+    this.nextId = 1;
+    this.load();
+}
+
+Store.prototype = Object.create(Emitter.prototype);
+Store.prototype.constructor = Store;
+
+Store.prototype.load = function () {
+    var raw = this.storage.getItem(this.name), data, i;
+    if (!raw) {
+        return;
+    }
+    data = JSON.parse(raw);
+    this.items = data.items || [];
+    for (i = 0; i < this.items.length; i++) {
+        if (this.items[i].id >= this.nextId) {
+            this.nextId = this.items[i].id + 1;
+        }
+    }
+    this.emit("load", this.items);
+};
+
+Store.prototype.save = function () {
+    this.storage.setItem(this.name, JSON.stringify({
+        items: this.items,
+        saved: +new Date()
+    }));
+    this.emit("save");
+};
+
+Store.prototype.add = function (title, tags) {
+    var item = {
+        id: this.nextId++,
+        title: title.trim(),
+        done: false,
+        tags: tags || [],
+        created: new Date().toISOString()
+    };
+    if (!item.title) {
+        throw new TypeError("An item needs a title");
+    }
+    this.items.push(item);
+    this.emit("add", item);
+    this.save();
+    return item;
+};
+
+Store.prototype.find = function (id) {
+    var i;
+    for (i = 0; i < this.items.length; i++) {
+        if (this.items[i].id === id) {
+            return this.items[i];
+        }
+    }
+    return null;
+};
+
+Store.prototype.toggle = function (id) {
+    var item = this.find(id);
+    if (item === null) {
+        return false;
+    }
+    item.done = !item.done;
+    this.emit("change", item);
+    this.save();
+    return true;
+};
+
+Store.prototype.remove = function (id) {
+    var index = -1, i;
+    for (i = 0; i < this.items.length; i++) {
+        if (this.items[i].id === id) {
+            index = i;
+            break;
+        }
+    }
+    if (index < 0) {
+        return false;
+    }
+    this.emit("remove", this.items.splice(index, 1)[0]);
+    this.save();
+    return true;
+};
+
+Store.prototype.filter = function (mode, query) {
+    var result = [], i, item, pattern = query ? new RegExp(query, "i") : null;
+    for (i = 0; i < this.items.length; i++) {
+        item = this.items[i];
+        switch (mode) {
+            case "active":
+                if (item.done) {
+                    continue;
+                }
+                break;
+            case "done":
+                if (!item.done) {
+                    continue;
+                }
+                break;
+            default:
+                break;
+        }
+        if (pattern && !pattern.test(item.title)) {
+            continue;
+        }
+        result.push(item);
+    }
+    return result;
+};
+
+Store.prototype.stats = function () {
+    var done = 0, tags = {}, i, j, item;
+    for (i = 0; i < this.items.length; i++) {
+        item = this.items[i];
+        done += item.done ? 1 : 0;
+        for (j = 0; j < item.tags.length; j++) {
+            tags[item.tags[j]] = (tags[item.tags[j]] || 0) + 1;
+        }
+    }
+    return {
+        total: this.items.length,
+        done: done,
+        active: this.items.length - done,
+        ratio: this.items.length ? Math.round(done / this.items.length * 100) : 0,
+        tags: tags
+    };
+};
+
+function View(root, store) {
+    this.root = root;
+    this.store = store;
+    this.mode = "all";
+    this.query = "";
+    this.render = utils.debounce(this.render, 16);
+    store.on("add", this.render.bind(this)).on("change", this.render.bind(this)).on("remove", this.render.bind(this));
+}
+
+View.prototype.template = function (item) {
+    var classes = ["item"];
+    if (item.done) {
+        classes.push("done");
+    }
+    return "<li class=\"" + classes.join(" ") + "\" data-id=\"" + item.id + "\">" +
+        "<input type=\"checkbox\"" + (item.done ? " checked" : "") + ">" +
+        "<span>" + utils.escape(item.title) + "</span>" +
+        "<button class=\"remove\">&times;</button></li>";
+};
+
+View.prototype.render = function () {
+    var items = this.store.filter(this.mode, this.query), html = [], stats = this.store.stats(), i;
+    for (i = 0; i < items.length; i++) {
+        html.push(this.template(items[i]));
+    }
+    this.root.querySelector(".list").innerHTML = html.join("");
+    this.root.querySelector(".count").textContent = stats.active + (stats.active === 1 ? " item" : " items") + " left";
+    this.root.querySelector(".progress").style.width = stats.ratio + "%";
+};
+
+View.prototype.handle = function (event) {
+    var target = event.target, node = target, id;
+    while (node && node !== this.root && !node.getAttribute("data-id")) {
+        node = node.parentNode;
+    }
+    if (!node || node === this.root) {
+        return;
+    }
+    id = parseInt(node.getAttribute("data-id"), 10);
+    if (target.className === "remove") {
+        this.store.remove(id);
+    } else if (target.type === "checkbox") {
+        this.store.toggle(id);
+    }
+};
+
+function request(method, url, body) {
+    return new Promise(function (resolve, reject) {
+        var xhr = new XMLHttpRequest();
+        xhr.open(method, url, true);
+        xhr.setRequestHeader("Content-Type", "application/json");
+        xhr.onload = function () {
+            if (xhr.status >= 200 && xhr.status < 300) {
+                resolve(xhr.responseText ? JSON.parse(xhr.responseText) : null);
+            } else {
+                reject(new Error(method + " " + url + " failed with " + xhr.status));
+            }
+        };
+        xhr.onerror = function () {
+            reject(new Error("Network error"));
+        };
+        xhr.send(body === undefined ? null : JSON.stringify(body));
+    });
+}
+
+function sync(store, url) {
+    var pending = store.items.filter(function (item) {
+        return !item.synced;
+    });
+    return request("POST", url + "/items", pending).then(function (response) {
+        var i;
+        for (i = 0; i < pending.length; i++) {
+            pending[i].synced = true;
+        }
+        store.save();
+        return response;
+    }).then(function (response) {
+        store.emit("sync", response, pending.length);
+    }, function (error) {
+        store.emit("error", error);
+        return request("GET", url + "/status");
+    });
+}
+
+var app = (function (window, document) {
+    var store = new Store("todos", window.localStorage), view, form, retries = 0;
+
+    function start() {
+        view = new View(document.getElementById("app"), store);
+        form = document.forms.add;
+        form.addEventListener("submit", function (event) {
+            var input = form.elements.title, tags = form.elements.tags.value.split(/\s*,\s*/);
+            event.preventDefault();
+            if (input.value) {
+                store.add(input.value, tags.length === 1 && !tags[0] ? [] : tags);
+                input.value = "";
+            }
+        });
+        view.root.addEventListener("click", view.handle.bind(view));
+        view.root.querySelector(".filters").addEventListener("click", function (event) {
+            view.mode = event.target.getAttribute("data-mode") || "all";
+            view.render();
+        });
+        store.on("error", function (error) {
+            if (++retries > 3) {
+                window.console.error(error);
+                return;
+            }
+            setTimeout(function () {
+                sync(store, "/api");
+            }, 1000 * Math.pow(2, retries));
+        });
+        view.render();
+        sync(store, "/api");
+    }
+
+    if (document.readyState === "loading") {
+        document.addEventListener("DOMContentLoaded", start);
+    } else {
+        start();
+    }
+
+    return {
+        store: store,
+        utils: utils,
+        version: "1.4.2"
+    };
+})(window, document);
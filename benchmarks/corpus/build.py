@@ -0,0 +1,43 @@
+"""Regenerate the ESTree JSON files of the benchmark corpus.
+
+Parses every ``*.js`` file next to this script with esprima and writes the
+tree to a ``*.json`` file of the same name, so the benchmarks themselves
+do not depend on a parser.
+
+    pip install esprima
+    python benchmarks/corpus/build.py
+"""
+import json
+from pathlib import Path
+
+import esprima
+
+RENAMED = {"isAsync": "async", "allowAwait": "await"}
+
+
+def to_json(node):
+    # Node.toDict() leaves out null fields, which ESTree keeps
+    if isinstance(node, list):
+        return [to_json(value) for value in node]
+    if not hasattr(node, "__dict__"):
+        return node
+    result = {}
+    for key, value in vars(node).items():
+        if not key.startswith("_"):
+            result[RENAMED.get(key, key)] = to_json(value)
+    if "regex" in result:
+        # Regular expression values are not representable in JSON
+        result["value"] = None
+    return result
+
+
+def main():
+    for source in sorted(Path(__file__).parent.glob("*.js")):
+        tree = esprima.parseScript(source.read_text(), {"loc": True, "range": True})
+        with open(source.with_suffix(".json"), "w") as fp:
+            json.dump(to_json(tree), fp, separators=(",", ":"))
+        print(source.name, "->", source.with_suffix(".json").name)
+
+
+if __name__ == "__main__":
+    main()
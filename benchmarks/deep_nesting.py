@@ -0,0 +1,126 @@
+"""Time jscodegen.generate on deeply nested expressions.
+
+Two corpora: left-leaning ``a + b + c + ...`` BinaryExpression chains and
+promise-style ``p.then(f).then(f)...`` Member/Call chains.  Both nest one
+level per operand, far beyond the default recursion limit at the larger
+sizes, and are generated without raising the limit.  As a baseline, the
+same trees are generated recursively, one handler call per node as before
+the work-list engine; "-" marks depths where that raises RecursionError.
+With --recursion-limit, the recursive runs get that limit and a thread with
+a stack large enough for it.
+
+    python benchmarks/deep_nesting.py [--repeat N] [--recursion-limit N]
+"""
+import argparse
+import gc
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+
+
+def identifier(name):
+    return {"type": "Identifier", "name": name}
+
+
+def binary_chain(depth):
+    expr = identifier("a0")
+    for i in range(1, depth):
+        expr = {"type": "BinaryExpression", "operator": "+",
+                "left": expr, "right": identifier("a%d" % i)}
+    return expr
+
+
+def then_chain(depth):
+    expr = identifier("p")
+    for i in range(depth):
+        member = {"type": "MemberExpression", "computed": False,
+                  "object": expr, "property": identifier("then")}
+        expr = {"type": "CallExpression", "callee": member,
+                "arguments": [identifier("f%d" % i)]}
+    return expr
+
+
+def program(expr):
+    return {"type": "Program", "body": [{"type": "ExpressionStatement", "expression": expr}]}
+
+
+class Recursive(jscodegen.CodeGenerator):
+    """Generates every child inline, and chains one link at a time."""
+    max_inline_depth = sys.maxsize
+
+    def binaryexpression(self, expr, precedence):
+        super().binaryexpression(expr, precedence)
+
+    def logicalexpression(self, expr, precedence):
+        super().logicalexpression(expr, precedence)
+
+    def memberexpression(self, expr, precedence):
+        super().memberexpression(expr, precedence)
+
+    def callexpression(self, expr, precedence):
+        super().callexpression(expr, precedence)
+
+
+def best_time(generate, tree, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        code = generate(tree)
+        best = min(best, time.perf_counter() - start)
+    return best, code
+
+
+def recursive_time(tree, repeat, recursion_limit):
+    """Return the best time of generating tree recursively, or None if it
+    raises RecursionError."""
+    result = []
+
+    def run():
+        try:
+            result.append(best_time(Recursive(2).generate, tree, repeat))
+        except RecursionError:
+            pass
+
+    if recursion_limit is None:
+        run()
+    else:
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(recursion_limit)
+        # A few hundred bytes of C stack per Python call
+        threading.stack_size(min(recursion_limit * 512, 1 << 30))
+        try:
+            thread = threading.Thread(target=run)
+            thread.start()
+            thread.join()
+        finally:
+            threading.stack_size(0)
+            sys.setrecursionlimit(limit)
+    return result[0] if result else (None, None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--recursion-limit", type=int, help="recursion limit of the recursive baseline")
+    args = parser.parse_args()
+
+    print("%-8s %8s %10s %14s %10s %10s" % ("corpus", "depth", "KB", "recursive ms", "ms", "ns/node"))
+    for name, build, nodes_per_level in (("binary", binary_chain, 2), ("then", then_chain, 4)):
+        for depth in (1000, 10000, 100000):
+            tree = program(build(depth))
+            best, code = best_time(jscodegen.generate, tree, args.repeat)
+            recursive, recursive_code = recursive_time(tree, args.repeat, args.recursion_limit)
+            assert recursive_code in (None, code)
+            print("%-8s %8d %10.1f %14s %10.2f %10.1f" % (
+                name, depth, len(code) / 1024, "-" if recursive is None else "%.2f" % (recursive * 1e3),
+                best * 1e3, best * 1e9 / (depth * nodes_per_level)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Measure what a DiskCache saves across runs of a build.
+
+Generates N modules, each the tree in ``benchmarks/corpus/app.json`` with a
+statement of its own, as a build would: without a cache, with an empty
+cache, with a full one, and with --changed percent of the modules changed
+since the last run.  Modules are given as trees and as ESTree JSON, which
+the cache keys on the text of.  Reports the time of each run, the hit
+rate and the time the cache saved by its own account.
+
+With --optimize, constants are folded and names mangled as well.
+
+    python benchmarks/disk_cache.py [--modules N] [--changed PERCENT] [--compact] [--optimize]
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+
+CORPUS = Path(__file__).parent / "corpus"
+
+
+def module(body, i, version=0):
+    # var module = "<i>.<version>";
+    declaration = {"type": "VariableDeclaration", "kind": "var", "declarations": [{
+        "type": "VariableDeclarator", "id": {"type": "Identifier", "name": "module"},
+        "init": {"type": "Literal", "value": "%d.%d" % (i, version)}}]}
+    return {"type": "Program", "body": [declaration] + body}
+
+
+def build_trees(modules, compact, optimize, disk_cache=None):
+    for tree in modules:
+        jscodegen.generate(tree, compact=compact, fold=optimize, mangle=optimize, disk_cache=disk_cache)
+
+
+def build_json(modules, compact, optimize, disk_cache=None):
+    for source in modules:
+        if disk_cache is None:
+            "".join(jscodegen.generate_json_iter(source, compact=compact, fold=optimize, mangle=optimize))
+        else:
+            disk_cache.generate_json(source, compact=compact, fold=optimize, mangle=optimize)
+
+
+def timed(build, *args):
+    start = time.perf_counter()
+    build(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", type=int, default=500)
+    parser.add_argument("--changed", type=float, default=10)
+    parser.add_argument("--compact", action="store_true")
+    parser.add_argument("--optimize", action="store_true")
+    args = parser.parse_args()
+
+    body = json.loads((CORPUS / "app.json").read_text())["body"]
+    modules = [module(body, i) for i in range(args.modules)]
+    step = max(1, round(100 / args.changed)) if args.changed else len(modules) + 1
+    changed = [module(body, i, 1) if i % step == 0 else tree for i, tree in enumerate(modules)]
+
+    print("%-6s %-10s %9s %7s %7s %9s %9s" % ("input", "run", "ms", "hits", "misses", "hit rate", "saved ms"))
+    for kind, build in (("tree", build_trees), ("json", build_json)):
+        if kind == "json":
+            modules = [json.dumps(tree).encode("utf-8") for tree in modules]
+            changed = [json.dumps(tree).encode("utf-8") for tree in changed]
+        print("%-6s %-10s %9.1f" % (kind, "no cache", timed(build, modules, args.compact, args.optimize) * 1e3))
+        with tempfile.TemporaryDirectory() as directory:
+            for name, inputs in (("cold", modules), ("warm", modules), ("changed", changed)):
+                # A new cache per run, as in a new process
+                cache = jscodegen.DiskCache(directory)
+                seconds = timed(build, inputs, args.compact, args.optimize, cache)
+                info = cache.cache_info()
+                print("%-6s %-10s %9.1f %7d %7d %8.0f%% %9.1f" % (
+                    kind, name, seconds * 1e3, info.hits, info.misses, 100 * info.hits / (info.hits + info.misses),
+                    info.time_saved * 1e3))
+
+
+if __name__ == "__main__":
+    main()
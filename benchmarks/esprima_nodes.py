@@ -0,0 +1,77 @@
+"""Compare generating from esprima nodes with converting them to dicts first.
+
+Parses every ``*.js`` file in ``benchmarks/corpus`` with esprima-python
+and times parse -> generate on the nodes directly, after converting them
+to dicts (keeping null fields, as in ``corpus/build.py``) and after a
+JSON round trip of the dicts.  Also reports the peak memory of each.
+
+    pip install esprima
+    python benchmarks/esprima_nodes.py [--repeat N]
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+
+CORPUS = Path(__file__).parent / "corpus"
+
+try:
+    import esprima
+    sys.path.insert(0, str(CORPUS))
+    from build import to_json
+except ImportError:
+    esprima = None
+
+
+def nodes(source):
+    return jscodegen.generate(esprima.parseScript(source))
+
+
+def converted(source):
+    return jscodegen.generate(to_json(esprima.parseScript(source)))
+
+
+def round_trip(source):
+    return jscodegen.generate(json.loads(json.dumps(to_json(esprima.parseScript(source)))))
+
+
+def measure(function, source, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        code = function(source)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    function(source)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return code, best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    if esprima is None:
+        sys.exit("esprima is not installed: pip install esprima")
+
+    print("%-12s %-10s %9s %9s %8s" % ("file", "input", "ms", "peak KB", "relative"))
+    for path in sorted(CORPUS.glob("*.js")):
+        source = path.read_text()
+        expected = None
+        for name, function in (("nodes", nodes), ("dicts", converted), ("json", round_trip)):
+            code, elapsed, peak = measure(function, source, args.repeat)
+            if expected is None:
+                expected, base = code, elapsed
+            assert code == expected
+            print("%-12s %-10s %9.2f %9.1f %7.2fx" % (path.stem, name, elapsed * 1e3, peak / 1024, elapsed / base))
+
+
+if __name__ == "__main__":
+    main()
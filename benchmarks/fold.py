@@ -0,0 +1,116 @@
+"""Measure what constant folding saves on code left over from templates.
+
+Builds N functions as template expansion leaves them, with configuration
+checks such as ``if (false) {...}`` and ``DEBUG && log(...)``, string
+concatenations and ``1 * 60 * 1000`` style arithmetic, and the trees in
+``benchmarks/corpus``.  Reports the size of the code with and without
+folding, in normal and compact output, the time folding takes and the
+time generation takes with and without it.
+
+    python benchmarks/fold.py [--functions N] [--repeat N]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+from jscodegen.fold import Folder
+
+CORPUS = Path(__file__).parent / "corpus"
+
+
+def identifier(name):
+    return {"type": "Identifier", "name": name}
+
+
+def literal(value):
+    return {"type": "Literal", "value": value}
+
+
+def binary(operator, left, right):
+    return {"type": "BinaryExpression", "operator": operator, "left": left, "right": right}
+
+
+def call(name, *arguments):
+    return {"type": "CallExpression", "callee": identifier(name), "arguments": list(arguments)}
+
+
+def statement(expression):
+    return {"type": "ExpressionStatement", "expression": expression}
+
+
+def block(*body):
+    return {"type": "BlockStatement", "body": list(body)}
+
+
+def function(i):
+    # function handler<i>(x) {
+    #   if (false) { log("handler<i>", x); check(x); }
+    #   true && log("enter " + "handler<i>");
+    #   setTimeout(x, 1 * 60 * 1000);
+    #   if ("production" === "development") warn("x") else x.url = "/api/" + "v2" + "/handler<i>";
+    #   return x.size > 64 * 1024 ? "large" : "small";
+    # }
+    name = "handler%d" % i
+    member = {"type": "MemberExpression", "object": identifier("x"), "computed": False}
+    return {"type": "FunctionDeclaration", "id": identifier(name), "params": [identifier("x")], "body": block(
+        {"type": "IfStatement", "test": literal(False), "alternate": None, "consequent": block(
+            statement(call("log", literal(name), identifier("x"))), statement(call("check", identifier("x"))))},
+        statement({"type": "LogicalExpression", "operator": "&&", "left": literal(i % 2 == 0),
+                   "right": call("log", binary("+", literal("enter "), literal(name)))}),
+        statement(call("setTimeout", identifier("x"),
+                       binary("*", binary("*", literal(1), literal(60)), literal(1000)))),
+        {"type": "IfStatement", "test": binary("===", literal("production"), literal("development")),
+         "consequent": statement(call("warn", literal("x"))),
+         "alternate": statement({"type": "AssignmentExpression", "operator": "=",
+                                 "left": dict(member, property=identifier("url")),
+                                 "right": binary("+", binary("+", literal("/api/"), literal("v2")),
+                                                 literal("/" + name))})},
+        {"type": "ReturnStatement", "argument": {
+            "type": "ConditionalExpression",
+            "test": binary(">", dict(member, property=identifier("size")), binary("*", literal(64), literal(1024))),
+            "consequent": literal("large"), "alternate": literal("small")}})}
+
+
+def corpora(functions):
+    yield "template", {"type": "Program", "body": [function(i) for i in range(functions)]}
+    for path in sorted(CORPUS.glob("*.json")):
+        yield path.stem, json.loads(path.read_text())
+
+
+def best_time(run, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--functions", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print("%-10s %10s %10s %10s %10s %7s %7s %9s %9s %9s" % (
+        "corpus", "KB", "folded", "compact", "folded", "folds", "drops", "fold ms", "gen ms", "folded ms"))
+    for name, tree in corpora(args.functions):
+        folder = Folder()
+        folded = folder.fold(tree)
+        sizes = [len(jscodegen.generate(t, compact=compact).encode("utf-8"))
+                 for compact in (False, True) for t in (tree, folded)]
+        fold_time = best_time(lambda: Folder().fold(tree), args.repeat)
+        generate_time = best_time(lambda: jscodegen.generate(tree), args.repeat)
+        folded_time = best_time(lambda: jscodegen.generate(tree, fold=True), args.repeat)
+        print("%-10s %10.1f %10.1f %10.1f %10.1f %7d %7d %9.1f %9.1f %9.1f" % (
+            name, sizes[0] / 1024, sizes[1] / 1024, sizes[2] / 1024, sizes[3] / 1024, folder.folded,
+            folder.dropped, fold_time * 1e3, generate_time * 1e3, folded_time * 1e3))
+
+
+if __name__ == "__main__":
+    main()
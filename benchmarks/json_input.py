@@ -0,0 +1,89 @@
+"""Compare generating from an ESTree JSON file with and without loading it whole.
+
+Writes a Program of many top-level functions to a temporary JSON file and
+generates code from it to /dev/null twice: after json.load, and with
+generate_json_to, which parses one top-level statement at a time from the
+memory-mapped file.  Reports the time and the peak of traced memory of
+each; pages of the mapped file are not traced, as they are page cache
+rather than heap.
+
+    python benchmarks/json_input.py [--statements N] [--repeat N]
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+
+
+def ident(name):
+    return {"type": "Identifier", "name": name}
+
+
+def function(i):
+    body = [{"type": "ExpressionStatement", "expression": {
+        "type": "CallExpression", "callee": {"type": "MemberExpression", "computed": False,
+                                             "object": ident("console"), "property": ident("log")},
+        "arguments": [{"type": "Literal", "value": "step %d of %d" % (j, i)},
+                      {"type": "BinaryExpression", "operator": "*", "left": ident("x"),
+                       "right": {"type": "Literal", "value": j}}]},
+        "loc": {"start": {"line": j, "column": 2}, "end": {"line": j, "column": 30}}} for j in range(20)]
+    return {"type": "FunctionDeclaration", "id": ident("f%d" % i), "params": [ident("x")],
+            "body": {"type": "BlockStatement", "body": body}}
+
+
+def load_and_generate(path, out):
+    with open(path, encoding="utf-8") as fp:
+        tree = json.load(fp)
+    jscodegen.generate_to(tree, out)
+
+
+def stream_and_generate(path, out):
+    jscodegen.generate_json_to(path, out)
+
+
+def measure(run, path, repeat):
+    best = float("inf")
+    with open(os.devnull, "w") as out:
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            run(path, out)
+            best = min(best, time.perf_counter() - start)
+        gc.collect()
+        tracemalloc.start()
+        run(path, out)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--statements", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as fp:
+            json.dump({"type": "Program", "body": [function(i) for i in range(args.statements)]}, fp)
+        print("input: %.1f MB" % (os.path.getsize(path) / 1e6))
+        print("%-10s %10s %12s" % ("input", "ms", "peak MB"))
+        for name, run in (("json.load", load_and_generate), ("streamed", stream_and_generate)):
+            elapsed, peak = measure(run, path, args.repeat)
+            print("%-10s %10.1f %12.1f" % (name, elapsed * 1e3, peak / 1e6))
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Compare generating runs of literals in one piece with one node at a time.
+
+Generates a data module: an array of numbers, an array of strings and an
+array of records, objects with literal values.  Times each with the
+default generator, which joins the code of literal runs, and with a
+subclass that generates every literal on its own, and checks that both
+give the same code.
+
+    python benchmarks/literal_runs.py [--size N] [--repeat N] [--compact]
+"""
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+
+
+class PerNode(jscodegen.CodeGenerator):
+
+    def literal(self, expr, precedence):
+        super().literal(expr, precedence)
+
+
+class CompactPerNode(jscodegen.CompactCodeGenerator):
+
+    def literal(self, expr, precedence):
+        super().literal(expr, precedence)
+
+
+def literal(value):
+    return {"type": "Literal", "value": value, "raw": json.dumps(value)}
+
+
+def array(elements):
+    return {"type": "ArrayExpression", "elements": elements}
+
+
+def declaration(name, init):
+    return {"type": "VariableDeclaration", "kind": "const", "declarations": [
+        {"type": "VariableDeclarator", "id": {"type": "Identifier", "name": name}, "init": init}]}
+
+
+def corpora(size):
+    random.seed(0)
+    numbers = array([literal(random.choice([random.randrange(10 ** 6), random.random(), 0.5]))
+                     for _ in range(size)])
+    strings = array([literal("item-%d" % random.randrange(size)) for _ in range(size)])
+    records = array([{"type": "ObjectExpression", "properties": [
+        {"type": "Property", "kind": "init", "key": {"type": "Identifier", "name": key}, "value": literal(value)}
+        for key, value in (("id", i), ("name", "user %d" % i), ("score", random.random()), ("active", i % 2 == 0))]}
+        for i in range(size // 4)])
+    return {name: {"type": "Program", "body": [declaration(name, init)]}
+            for name, init in (("numbers", numbers), ("strings", strings), ("records", records))}
+
+
+def best_time(generator, tree, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        code = generator.generate(tree)
+        best = min(best, time.perf_counter() - start)
+    return best, code
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200000, help="literals per array")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--compact", action="store_true")
+    args = parser.parse_args()
+
+    if args.compact:
+        bulk, per_node = jscodegen.CompactCodeGenerator(), CompactPerNode()
+    else:
+        bulk, per_node = jscodegen.CodeGenerator(2), PerNode(2)
+    print("%-8s %12s %12s %8s" % ("corpus", "per node ms", "runs ms", "speedup"))
+    for name, tree in corpora(args.size).items():
+        per_node_time, expected = best_time(per_node, tree, args.repeat)
+        bulk_time, code = best_time(bulk, tree, args.repeat)
+        if code != expected:
+            sys.exit("%s: the code differs" % name)
+        print("%-8s %12.1f %12.1f %7.2fx" % (name, per_node_time * 1e3, bulk_time * 1e3, per_node_time / bulk_time))
+
+
+if __name__ == "__main__":
+    main()
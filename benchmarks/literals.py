@@ -0,0 +1,104 @@
+"""Compare literal rendering with the json.dumps path it replaced.
+
+Generates an i18n-style bundle: an object of string literals, many of them
+repeated, with quotes and non-ASCII text, and an array of numbers.  Times
+it with string literals from json.dumps and numbers from str (the previous
+rendering), with the current rendering and with the literal cache, and
+reports the output size of each.
+
+    python benchmarks/literals.py [--strings N] [--repeat N]
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+
+PHRASES = [
+    "OK", "Cancel", "Save changes", "Sign in to continue",
+    'Click "Save" to keep your changes', "Don't show this again",
+    "Überprüfen Sie Ihre Eingabe", "設定を保存しました", "Loading…",
+    "The file could not be uploaded because it is larger than the limit of {limit} MB.",
+]
+
+
+class JsonLiterals(jscodegen.CodeGenerator):
+
+    def generate_literal(self, expr):
+        value = expr['value']
+        if isinstance(value, str):
+            return json.dumps(value)
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if value is None:
+            return "null"
+        return str(value)
+
+
+class CachedLiterals(jscodegen.CodeGenerator):
+    literal_cache_size = 4096
+
+
+def literal(value):
+    return {"type": "Literal", "value": value, "raw": json.dumps(value)}
+
+
+def bundle(count):
+    random.seed(0)
+    properties = []
+    for i in range(count):
+        text = random.choice(PHRASES)
+        if random.random() < 0.5:
+            text = "%s (%d)" % (text, i)
+        properties.append({"type": "Property", "key": {"type": "Identifier", "name": "msg%d" % i},
+                           "value": literal(text), "kind": "init"})
+    numbers = [literal(random.choice([1000000, 0.5, 1e21, 1.0, 2.5e-7, 86400000, 0.25, 3]))
+               for _ in range(count // 4)]
+    return {"type": "Program", "body": [{"type": "ExpressionStatement", "expression": {
+        "type": "ArrayExpression", "elements": [{"type": "ObjectExpression", "properties": properties},
+                                                {"type": "ArrayExpression", "elements": numbers}]}}]}
+
+
+def best_time(function, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--strings", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tree = bundle(args.strings)
+    objects, numbers = tree["body"][0]["expression"]["elements"]
+    strings = [prop["value"] for prop in objects["properties"]]
+    numbers = numbers["elements"]
+    print("%-8s %11s %11s %12s %10s %10s" % (
+        "literals", "ns/string", "ns/number", "generate ms", "KB", "compact KB"))
+    for name, generator_class in (("json", JsonLiterals), ("current", jscodegen.CodeGenerator),
+                                  ("cached", CachedLiterals)):
+        generator = generator_class(2)
+        times = []
+        for literals in (strings, numbers):
+            _, elapsed = best_time(lambda: [generator.generate_literal(node) for node in literals], args.repeat)
+            times.append(elapsed * 1e9 / len(literals))
+        code, elapsed = best_time(lambda: generator_class(2).generate(tree), args.repeat)
+        compact_class = type(name, (generator_class,), {"space": "", "comma": ",", "newline": "", "compact": True})
+        compact = compact_class(0).generate(tree)
+        print("%-8s %11.0f %11.0f %12.2f %10.1f %10.1f" % (
+            name, times[0], times[1], elapsed * 1e3, len(code.encode("utf-8")) / 1024,
+            len(compact.encode("utf-8")) / 1024))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Measure what mangling local names saves, and that it takes linear time.
+
+Builds N functions whose parameters and locals have descriptive names, and
+takes the trees in ``benchmarks/corpus``.  Reports the size of the code
+with and without mangling, in normal and compact output, the number of
+renamed bindings, the characters saved and the time mangling takes, and
+the mangle time per node for the corpus repeated 1, 2, 4 and 8 times.
+
+    python benchmarks/mangle.py [--functions N] [--repeat N]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+from jscodegen.mangle import Mangler
+
+CORPUS = Path(__file__).parent / "corpus"
+
+
+def identifier(name):
+    return {"type": "Identifier", "name": name}
+
+
+def member(name, property_name):
+    return {"type": "MemberExpression", "object": identifier(name), "property": identifier(property_name),
+            "computed": False}
+
+
+def binary(operator, left, right):
+    return {"type": "BinaryExpression", "operator": operator, "left": left, "right": right}
+
+
+def declaration(name, init):
+    return {"type": "VariableDeclaration", "kind": "var",
+            "declarations": [{"type": "VariableDeclarator", "id": identifier(name), "init": init}]}
+
+
+def function(i):
+    # function total<i>(items, discountRate) {
+    #   var subtotal = 0;
+    #   for (var index = 0; index < items.length; index++) subtotal += items[index].price;
+    #   var discount = subtotal * discountRate;
+    #   return format(subtotal - discount);
+    # }
+    item = {"type": "MemberExpression", "object": identifier("items"), "property": identifier("index"),
+            "computed": True}
+    return {"type": "FunctionDeclaration", "id": identifier("total%d" % i),
+            "params": [identifier("items"), identifier("discountRate")],
+            "body": {"type": "BlockStatement", "body": [
+                declaration("subtotal", {"type": "Literal", "value": 0}),
+                {"type": "ForStatement",
+                 "init": {"type": "AssignmentExpression", "operator": "=", "left": identifier("index"),
+                          "right": {"type": "Literal", "value": 0}},
+                 "test": binary("<", identifier("index"), member("items", "length")),
+                 "update": {"type": "UpdateExpression", "operator": "++", "prefix": False,
+                            "argument": identifier("index")},
+                 "body": {"type": "ExpressionStatement", "expression": {
+                     "type": "AssignmentExpression", "operator": "+=", "left": identifier("subtotal"),
+                     "right": {"type": "MemberExpression", "object": item, "property": identifier("price"),
+                               "computed": False}}}},
+                declaration("index", None),
+                declaration("discount", binary("*", identifier("subtotal"), identifier("discountRate"))),
+                {"type": "ReturnStatement", "argument": {
+                    "type": "CallExpression", "callee": identifier("format"),
+                    "arguments": [binary("-", identifier("subtotal"), identifier("discount"))]}}]}}
+
+
+def corpora(functions):
+    yield "functions", {"type": "Program", "body": [function(i) for i in range(functions)]}
+    for path in sorted(CORPUS.glob("*.json")):
+        yield path.stem, json.loads(path.read_text())
+
+
+def count_nodes(tree):
+    count = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, dict):
+            count += 1
+            stack.extend(value for key, value in node.items() if key != "loc")
+    return count
+
+
+def best_time(run, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--functions", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    trees = list(corpora(args.functions))
+    print("%-10s %10s %10s %10s %10s %8s %9s %9s" % (
+        "corpus", "KB", "mangled", "compact", "mangled", "renamed", "saved", "mangle ms"))
+    for name, tree in trees:
+        mangler = Mangler()
+        mangled = mangler.mangle(tree)
+        sizes = [len(jscodegen.generate(t, compact=compact).encode("utf-8"))
+                 for compact in (False, True) for t in (tree, mangled)]
+        mangle_time = best_time(lambda: Mangler().mangle(tree), args.repeat)
+        print("%-10s %10.1f %10.1f %10.1f %10.1f %8d %9d %9.1f" % (
+            name, sizes[0] / 1024, sizes[1] / 1024, sizes[2] / 1024, sizes[3] / 1024, mangler.renamed,
+            mangler.saved, mangle_time * 1e3))
+
+    print()
+    print("%-10s %6s %10s %9s %12s" % ("corpus", "copies", "nodes", "mangle ms", "us per node"))
+    for name, tree in trees:
+        for copies in (1, 2, 4, 8):
+            program = {"type": "Program", "body": tree["body"] * copies}
+            nodes = count_nodes(program)
+            mangle_time = best_time(lambda: Mangler().mangle(program), args.repeat)
+            print("%-10s %6d %10d %9.1f %12.2f" % (name, copies, nodes, mangle_time * 1e3, mangle_time / nodes * 1e6))
+
+
+if __name__ == "__main__":
+    main()
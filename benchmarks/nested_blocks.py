@@ -0,0 +1,56 @@
+"""Time jscodegen.generate on nested BlockStatement corpora.
+
+Every level wraps the next one in an ``if`` block with a few sibling
+statements, so output grows linearly with depth.  With a single shared
+output buffer the time per output byte stays flat as nesting deepens.
+
+    python benchmarks/nested_blocks.py [--width N] [--repeat N]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+
+
+def statement(i):
+    return {"type": "ExpressionStatement", "expression": {
+        "type": "CallExpression",
+        "callee": {"type": "Identifier", "name": "work"},
+        "arguments": [{"type": "Literal", "value": i, "raw": str(i)}]}}
+
+
+def nested_blocks(depth, width):
+    inner = {"type": "BlockStatement", "body": [statement(i) for i in range(width)]}
+    for level in range(depth):
+        body = [statement(i) for i in range(width)]
+        body.append({"type": "IfStatement",
+                     "test": {"type": "Identifier", "name": "c%d" % level},
+                     "consequent": inner, "alternate": None})
+        inner = {"type": "BlockStatement", "body": body}
+    return {"type": "Program", "body": [inner]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    sys.setrecursionlimit(100000)
+
+    print("%6s %10s %10s %10s" % ("depth", "KB", "ms", "ns/byte"))
+    for depth in (10, 25, 50, 100, 200, 400):
+        tree = nested_blocks(depth, args.width)
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            code = jscodegen.generate(tree)
+            best = min(best, time.perf_counter() - start)
+        print("%6d %10.1f %10.2f %10.1f" % (depth, len(code) / 1024, best * 1e3, best * 1e9 / len(code)))
+
+
+if __name__ == "__main__":
+    main()
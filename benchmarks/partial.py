@@ -0,0 +1,57 @@
+"""Show that partial generation costs what its output does, not the tree.
+
+For the tree in ``benchmarks/corpus/app.json`` repeated 1 to N times,
+reports the time to generate all of it, its first --bytes bytes and first
+--lines lines with ``generate_prefix``, and its last statement with
+``generate_subtree``.
+
+    python benchmarks/partial.py [--copies N] [--bytes N] [--lines N] [--repeat N]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+
+CORPUS = Path(__file__).parent / "corpus"
+
+
+def best_time(run, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--copies", type=int, default=64)
+    parser.add_argument("--bytes", type=int, default=4096)
+    parser.add_argument("--lines", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    body = json.loads((CORPUS / "app.json").read_text())["body"]
+    print("%6s %10s %9s %9s %9s %9s" % ("copies", "KB", "full ms", "bytes ms", "lines ms", "path ms"))
+    copies = 1
+    while copies <= args.copies:
+        tree = {"type": "Program", "body": body * copies}
+        size = len(jscodegen.generate(tree).encode("utf-8"))
+        path = ("body", len(tree["body"]) - 1)
+        times = [best_time(run, args.repeat) for run in (
+            lambda: jscodegen.generate(tree),
+            lambda: jscodegen.generate_prefix(tree, max_bytes=args.bytes),
+            lambda: jscodegen.generate_prefix(tree, max_lines=args.lines),
+            lambda: jscodegen.generate_subtree(tree, path))]
+        print("%6d %10.1f %9.2f %9.2f %9.2f %9.2f" % ((copies, size / 1024) + tuple(t * 1e3 for t in times)))
+        copies *= 4
+
+
+if __name__ == "__main__":
+    main()
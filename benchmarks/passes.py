@@ -0,0 +1,122 @@
+"""Compare passes run fused into code generation with one walk per pass.
+
+For 0 to --passes passes over the tree in ``benchmarks/corpus/app.json``
+repeated --copies times, reports the time to run each pass in a walk of
+its own and then generate the code, and to generate it with all of them
+passed as ``passes``.  The passes count identifiers, collect strings, count
+calls and rename a global, in turn.
+
+    python benchmarks/passes.py [--passes N] [--copies N] [--repeat N]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+from jscodegen.fold import CHILD_FIELDS
+from jscodegen.nodes import fields
+
+CORPUS = Path(__file__).parent / "corpus"
+
+
+class Identifiers(jscodegen.Pass):
+
+    def __init__(self):
+        self.names = {}
+
+    def identifier(self, node):
+        self.names[node["name"]] = self.names.get(node["name"], 0) + 1
+
+
+class Strings(jscodegen.Pass):
+
+    def __init__(self):
+        self.strings = set()
+
+    def literal(self, node):
+        if node["value"].__class__ is str:
+            self.strings.add(node["value"])
+
+
+class Calls(jscodegen.Pass):
+
+    def __init__(self):
+        self.calls = 0
+
+    def callexpression(self, node):
+        self.calls += 1
+
+
+class Rename(jscodegen.Pass):
+
+    def identifier(self, node):
+        if node["name"] == "console":
+            return dict(node, name="logger")
+
+
+PASSES = [Identifiers, Strings, Calls, Rename]
+
+
+def walk(node, pipeline):
+    """Run pipeline over the tree in a walk of its own and return the tree
+    it makes, with the nodes above those it replaced copied."""
+    node = pipeline.visit(node)
+    data = fields(node)
+    changed = {}
+    for name in CHILD_FIELDS.get(data["type"], ()):
+        value = data.get(name)
+        if value.__class__ is list:
+            result = [walk(item, pipeline) if item.__class__ is dict else item for item in value]
+            if any(new is not old for new, old in zip(result, value)):
+                changed[name] = result
+        elif value.__class__ is dict:
+            result = walk(value, pipeline)
+            if result is not value:
+                changed[name] = result
+    if not changed:
+        return node
+    return dict(data, **changed)
+
+
+def separate(tree, passes):
+    for p in passes:
+        tree = walk(tree, jscodegen.Pipeline(p))
+    return jscodegen.generate(tree)
+
+
+def fused(tree, passes):
+    return jscodegen.generate(tree, passes=passes)
+
+
+def best_time(run, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--passes", type=int, default=8)
+    parser.add_argument("--copies", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    body = json.loads((CORPUS / "app.json").read_text())["body"]
+    tree = {"type": "Program", "body": body * args.copies}
+    print("%6s %12s %9s %7s" % ("passes", "separate ms", "fused ms", "ratio"))
+    for n in range(args.passes + 1):
+        kinds = [PASSES[i % len(PASSES)] for i in range(n)]
+        assert separate(tree, [kind() for kind in kinds]) == fused(tree, [kind() for kind in kinds])
+        times = [best_time(lambda: run(tree, [kind() for kind in kinds]), args.repeat) for run in (separate, fused)]
+        print("%6d %12.2f %9.2f %7.2f" % (n, times[0] * 1e3, times[1] * 1e3, times[0] / times[1]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Compare slotted nodes with dicts for memory per node and generation speed.
+
+Builds every corpus of benchmarks/suite.py as dicts, converts it with
+jscodegen.to_slotted, and reports the traced memory per node of both
+trees and the time to generate code from each.
+
+    python benchmarks/slotted.py [--repeat N] [corpus ...]
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+from suite import corpora, count_nodes
+
+
+def traced(build):
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size
+
+
+def best_time(tree, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        jscodegen.generate(tree)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpora", nargs="*", help="corpora to run, all by default")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print("%-8s %9s %10s %10s %10s %10s %8s" % (
+        "corpus", "nodes", "dict B/n", "slots B/n", "dict ms", "slots ms", "speed"))
+    for name, build in corpora():
+        if args.corpora and name not in args.corpora:
+            continue
+        tree, dict_size = traced(build)
+        nodes = count_nodes(tree)
+        slotted, slotted_size = traced(lambda: jscodegen.to_slotted(tree))
+        if jscodegen.generate(tree) != jscodegen.generate(slotted):
+            sys.exit("%s: the code differs" % name)
+        dict_time = best_time(tree, args.repeat)
+        slotted_time = best_time(slotted, args.repeat)
+        print("%-8s %9d %10.1f %10.1f %10.1f %10.1f %7.2fx" % (
+            name, nodes, dict_size / nodes, slotted_size / nodes, dict_time * 1e3, slotted_time * 1e3,
+            dict_time / slotted_time))
+
+
+if __name__ == "__main__":
+    main()
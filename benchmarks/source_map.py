@@ -0,0 +1,58 @@
+"""Measure the cost of generating a source map on the benchmark corpus.
+
+Times jscodegen.generate against jscodegen.generate_with_source_map on
+every ESTree JSON file in ``benchmarks/corpus`` (which carry ``loc`` and
+``range``), in the default and the compact format.  Exits with status 1
+if the overhead exceeds MAX_OVERHEAD, the bound documented in README.md.
+
+    python benchmarks/source_map.py [--repeat N]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+
+CORPUS = Path(__file__).parent / "corpus"
+MAX_OVERHEAD = 3.0
+
+
+def best_time(function, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    worst = 0
+    print("%-12s %-8s %8s %8s %9s %9s %8s" % ("file", "format", "KB", "map KB", "plain ms", "mapped ms", "overhead"))
+    for path in sorted(CORPUS.glob("*.json")):
+        with open(path) as fp:
+            tree = json.load(fp)
+        for compact in (False, True):
+            code, plain = best_time(lambda: jscodegen.generate(tree, compact=compact), args.repeat)
+            (_, source_map), mapped = best_time(
+                lambda: jscodegen.generate_with_source_map(tree, compact=compact), args.repeat)
+            overhead = mapped / plain
+            worst = max(worst, overhead)
+            print("%-12s %-8s %8.1f %8.1f %9.2f %9.2f %7.2fx" % (
+                path.stem, "compact" if compact else "pretty", len(code) / 1024,
+                len(json.dumps(source_map)) / 1024, plain * 1e3, mapped * 1e3, overhead))
+    if worst > MAX_OVERHEAD:
+        print("overhead %.2fx exceeds the bound of %.1fx" % (worst, MAX_OVERHEAD))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""Benchmark jscodegen.generate on synthetic and realistic corpora.
+
+Synthetic corpora stress one construct each: deep BinaryExpression chains,
+wide ArrayExpression and ObjectExpression literals, long string literals,
+deeply nested BlockStatements and large SwitchStatements.  The realistic
+corpus is every ESTree JSON file in ``benchmarks/corpus``.
+
+Reports nodes/s, bytes/s and the peak memory of generating each corpus.
+With --save the results are stored as the baseline; otherwise they are
+compared against a stored baseline, and the run exits with status 1 if any
+corpus got slower or uses more memory by more than --threshold.  Timings
+are only comparable on the machine the baseline was saved on.
+
+    python benchmarks/suite.py [--repeat N] [--min-time S] [--save] [--threshold F] [--profile] [corpus ...]
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+
+CORPUS = Path(__file__).parent / "corpus"
+BASELINE = Path(__file__).parent / "baseline.json"
+
+
+def identifier(name):
+    return {"type": "Identifier", "name": name}
+
+
+def literal(value):
+    return {"type": "Literal", "value": value, "raw": json.dumps(value)}
+
+
+def statement(expression):
+    return {"type": "ExpressionStatement", "expression": expression}
+
+
+def program(*body):
+    return {"type": "Program", "body": list(body)}
+
+
+def binary_chain(depth=20000):
+    expr = identifier("a0")
+    for i in range(1, depth):
+        expr = {"type": "BinaryExpression", "operator": "+" if i % 2 else "*",
+                "left": expr, "right": identifier("a%d" % i)}
+    return program(statement(expr))
+
+
+def wide_array(width=100000):
+    elements = [literal(i) if i % 2 else identifier("a%d" % i) for i in range(width)]
+    return program(statement({"type": "ArrayExpression", "elements": elements}))
+
+
+def wide_object(width=50000):
+    properties = [{"type": "Property", "key": identifier("k%d" % i), "value": literal(i), "kind": "init"}
+                  for i in range(width)]
+    return program(statement({"type": "AssignmentExpression", "operator": "=", "left": identifier("o"),
+                              "right": {"type": "ObjectExpression", "properties": properties}}))
+
+
+def long_strings(count=1000, length=10000):
+    text = ('plain text, "quoted", \\backslash\\, tab\t, newline\n, unicode é中 ' * length)[:length]
+    return program(*[statement(literal(text[i:] + text[:i])) for i in range(count)])
+
+
+def nested_blocks(depth=2000, width=5):
+    inner = {"type": "BlockStatement", "body": [statement(identifier("x"))]}
+    for level in range(depth):
+        body = [statement({"type": "CallExpression", "callee": identifier("work"), "arguments": [literal(i)]})
+                for i in range(width)]
+        body.append({"type": "IfStatement", "test": identifier("c%d" % level), "consequent": inner, "alternate": None})
+        inner = {"type": "BlockStatement", "body": body}
+    return program(inner)
+
+
+def large_switch(cases=5000):
+    return program({"type": "SwitchStatement", "discriminant": identifier("x"), "cases": [
+        {"type": "SwitchCase", "test": literal(i), "consequent": [
+            statement({"type": "AssignmentExpression", "operator": "=", "left": identifier("y"), "right": literal(i)}),
+            statement({"type": "CallExpression", "callee": identifier("f"), "arguments": [identifier("y")]}),
+            {"type": "BreakStatement", "label": None}]}
+        for i in range(cases)]})
+
+
+SYNTHETIC = {
+    "binary": binary_chain,
+    "array": wide_array,
+    "object": wide_object,
+    "strings": long_strings,
+    "blocks": nested_blocks,
+    "switch": large_switch,
+}
+
+
+def corpora():
+    for name, build in SYNTHETIC.items():
+        yield name, build
+    for path in sorted(CORPUS.glob("*.json")):
+        yield path.stem, lambda path=path: json.loads(path.read_text())
+
+
+def count_nodes(tree):
+    count = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            count += "type" in node
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return count
+
+
+def measure(tree, repeat, min_time):
+    # The best of several runs, for at least min_time seconds, since
+    # timings on a busy machine only err on the slow side
+    best = float("inf")
+    runs = 0
+    total = 0
+    while runs < repeat or total < min_time:
+        gc.collect()
+        start = time.perf_counter()
+        code = jscodegen.generate(tree)
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+        runs += 1
+    tracemalloc.start()
+    jscodegen.generate(tree)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return len(code.encode("utf-8")), best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpora", nargs="*", help="corpora to run, all by default")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds to time each corpus for at least")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="store the results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="relative slowdown or memory growth that counts as a regression")
+    parser.add_argument("--profile", action="store_true", help="also print the time per node type")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+    results = {}
+    regressions = []
+    print("%-8s %9s %9s %9s %10s %8s %9s  %s" % (
+        "corpus", "nodes", "KB", "ms", "knodes/s", "MB/s", "peak KB", "vs baseline"))
+    for name, build in corpora():
+        if args.corpora and name not in args.corpora:
+            continue
+        tree = build()
+        nodes = count_nodes(tree)
+        size, elapsed, peak = measure(tree, args.repeat, args.min_time)
+        result = results[name] = {"nodes_per_sec": nodes / elapsed, "bytes_per_sec": size / elapsed, "peak": peak}
+        comparison = ""
+        if name in baseline and not args.save:
+            speed = result["nodes_per_sec"] / baseline[name]["nodes_per_sec"] - 1
+            memory = result["peak"] / baseline[name]["peak"] - 1
+            comparison = "speed %+.1f%%, memory %+.1f%%" % (speed * 100, memory * 100)
+            if speed < -args.threshold or memory > args.threshold:
+                regressions.append(name)
+                comparison += "  REGRESSION"
+        print("%-8s %9d %9.1f %9.2f %10.1f %8.2f %9.1f  %s" % (
+            name, nodes, size / 1024, elapsed * 1e3, nodes / elapsed / 1e3, size / elapsed / 1e6, peak / 1024,
+            comparison))
+        if args.profile:
+            profiler = jscodegen.Profiler()
+            jscodegen.generate(tree, profiler=profiler)
+            print(profiler.format_report() + "\n")
+    if args.save:
+        baseline.update(results)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print("baseline saved to", args.baseline)
+    elif not baseline:
+        print("no baseline at %s, run with --save to store one" % args.baseline)
+    if regressions:
+        print("regressions:", ", ".join(regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
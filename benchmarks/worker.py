@@ -0,0 +1,62 @@
+"""Compare a process per module with one `python -m jscodegen serve` worker.
+
+Generates code for N small modules, first by starting a Python process
+per module that imports jscodegen and generates it, as a build step would,
+then by sending all of them to one worker as pipelined JSON-lines
+requests.  Reports the modules per second of both and the worker's own
+per-request times.
+
+    python benchmarks/worker.py [--modules N]
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+SCRIPT = "import sys, json, jscodegen; sys.stdout.write(jscodegen.generate(json.load(sys.stdin)))"
+
+
+def module(i):
+    return {"type": "Program", "body": [
+        {"type": "FunctionDeclaration", "id": {"type": "Identifier", "name": "f%d" % i},
+         "params": [{"type": "Identifier", "name": "x"}], "body": {"type": "BlockStatement", "body": [
+             {"type": "ReturnStatement", "argument": {
+                 "type": "BinaryExpression", "operator": "*", "left": {"type": "Identifier", "name": "x"},
+                 "right": {"type": "Literal", "value": i}}}]}}]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", type=int, default=50)
+    args = parser.parse_args()
+    modules = [module(i) for i in range(args.modules)]
+
+    start = time.perf_counter()
+    spawned = [subprocess.run([sys.executable, "-c", SCRIPT], input=json.dumps(tree).encode(), cwd=str(ROOT),
+                              stdout=subprocess.PIPE, check=True).stdout.decode() for tree in modules]
+    spawn_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    worker = subprocess.Popen([sys.executable, "-m", "jscodegen", "serve"], cwd=str(ROOT),
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    requests = b"".join(json.dumps({"id": i, "ast": tree}).encode() + b"\n" for i, tree in enumerate(modules))
+    output = worker.communicate(requests)[0]
+    worker_time = time.perf_counter() - start
+    responses = [json.loads(line) for line in output.splitlines()]
+    if [response["code"] for response in responses] != spawned:
+        sys.exit("the code differs")
+
+    generate_times = sorted(response["generate_time"] for response in responses)
+    print("%-18s %10s %12s" % ("mode", "total ms", "modules/s"))
+    print("%-18s %10.1f %12.1f" % ("process per module", spawn_time * 1e3, args.modules / spawn_time))
+    print("%-18s %10.1f %12.1f" % ("worker", worker_time * 1e3, args.modules / worker_time))
+    print("worker generate_time per request: median %.3f ms, max %.3f ms" % (
+        generate_times[len(generate_times) // 2] * 1e3, generate_times[-1] * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,26 @@
-import json
+import copy
+import io
+from functools import lru_cache
+from time import perf_counter
 from enum import IntEnum
-from jscodegen.syntax import Syntax, Statements
+from jscodegen.syntax import Syntax, Statements, Expressions
+from jscodegen.emitter import Emitter, Schedule
+from jscodegen.nodes import fields
+from jscodegen.literals import string_literal, number_literal
+from jscodegen.sourcemap import SourceMap, MappingEmitter
+from jscodegen.cache import SubtreeCache
+from jscodegen.profiler import Profiler
+from jscodegen.incremental import IncrementalGenerator
+from jscodegen.batch import generate_many, GenerationError
+from jscodegen.jsonstream import iter_statements
+from jscodegen.slotted import to_slotted
+from jscodegen.aio import generate_async
+from jscodegen.fold import fold_constants, fold_statements
+from jscodegen.mangle import Mangler, mangle_names
+from jscodegen.compress import CompressedWriter, CompressionInfo
+from jscodegen.partial import generate_prefix, generate_subtree
+from jscodegen.diskcache import DiskCache, DiskCacheInfo
+from jscodegen.passes import Pass, Pipeline, pipeline
 
 class Precedence(IntEnum):
     Sequence = 0
@@ -56,381 +76,1317 @@ BinaryPrecedence = {
     '/': Precedence.Multiplicative
 }
 
+ChainHandlers = {
+    'BinaryExpression': ('binaryexpression',),
+    'LogicalExpression': ('logicalexpression', 'binaryexpression'),
+    'MemberExpression': ('memberexpression', 'generate_access_chain'),
+    'CallExpression': ('callexpression', 'generate_access_chain'),
+}
+
+AccessChain = ('MemberExpression', 'CallExpression')
+
+# Runs of literal elements and properties of these node types are generated
+# in one piece, unless a subclass overrides how they are generated.
+LiteralRunHandlers = {
+    'ArrayExpression': ('arrayexpression', 'literal', 'generate_literal'),
+    'ObjectExpression': ('objectexpression', 'property', 'generate_property_key', 'literal', 'generate_literal',
+                         'identifier', 'generate_identifier'),
+}
+
+# Characters of output collected before generate_iter yields a chunk.
+BUFFER_SIZE = 64 * 1024
+# Emitter parts collected before they are joined towards the next chunk.
+FLUSH_PARTS = 256
+
+
+# Where the first character of a node's code comes from: the child whose
+# code starts the node's code, the precedence that child is generated with
+# and the precedence below which the node itself is parenthesized.
+LeadingChild = {
+    'ExpressionStatement': ('expression', Precedence.Sequence, None),
+    'AssignmentExpression': ('left', Precedence.Call, Precedence.Assignment),
+    'ConditionalExpression': ('test', Precedence.LogicalOR, None),
+    'MemberExpression': ('object', Precedence.Call, Precedence.Member),
+    'CallExpression': ('callee', Precedence.Call, None),
+}
+
+LeadingCharacter = {
+    'ArrayExpression': '[',
+    'ObjectExpression': '{',
+    'ObjectPattern': '{',
+    'SpreadElement': '.',
+    'BlockStatement': '{',
+    'EmptyStatement': ';',
+}
+
+# Statements that end with the statement in this field, so their code ends
+# like the code of that statement.
+TrailingStatement = {
+    'ForStatement': 'body',
+    'ForInStatement': 'body',
+    'WhileStatement': 'body',
+    'WithStatement': 'body',
+    'LabeledStatement': 'body',
+}
+
+# Children that handlers look at, or write without generating them, before
+# their own code is generated.  With passes, they are visited along with
+# their parent, so that both see what the passes return.
+VisitedChildren = {
+    'FunctionDeclaration': ('id', 'params'),
+    'FunctionExpression': ('id', 'params'),
+    'ArrowFunctionExpression': ('id', 'params'),
+    'LabeledStatement': ('label',),
+    'BreakStatement': ('label',),
+    'ContinueStatement': ('label',),
+    'Property': ('key', 'value'),
+    'MemberExpression': ('object', 'property'),
+    'ForInStatement': ('left',),
+}
+
+
+def is_word_character(char):
+    return char.isalnum() or char in "_$\\"
+
 
 class CodeGenerator:
     space = " "
-
-    def __init__(self, indent):
-        self.indentation = 0
+    comma = ", "
+    newline = "\n"
+    # Compact output leaves out all optional whitespace and semicolons.
+    compact = False
+    # Nodes nested deeper than this below the node the engine dispatched are
+    # deferred to the work-list instead of being generated inline, which
+    # bounds the Python stack depth.
+    max_inline_depth = 64
+    # Set to keep the code of this many string literals, for trees that
+    # repeat long strings.
+    literal_cache_size = 0
+
+    def __init__(self, indent, cache=None, profiler=None, passes=None):
         self.indent = indent
+        self.cache = cache
+        self.profiler = profiler
+        self.passes = pipeline(passes)
+        # What the passes returned for the nodes visited so far in a call,
+        # by the id of the node and of the result
+        self.visited = {}
+        self.string_literal = string_literal
+        if self.literal_cache_size:
+            self.string_literal = lru_cache(self.literal_cache_size)(string_literal)
+        self.budget = self.max_inline_depth
+        self.out = Schedule(Emitter(), self.space, self.newline)
+        self.handlers = {}
+        self.expression_types = set(Expressions)
+        for syntax in Syntax:
+            self.handlers[syntax.value] = getattr(self, syntax.value.lower())
+        # Chains of these node types are generated iteratively by a single
+        # handler, unless a subclass overrides how they are generated or
+        # passes need to see every link.
+        self.chain_types = set()
+        for node_type, names in ChainHandlers.items():
+            if self.passes is None and all(getattr(type(self), name) is getattr(CodeGenerator, name) for name in names):
+                self.chain_types.add(node_type)
+        self.literal_runs = set()
+        for node_type, names in LiteralRunHandlers.items():
+            if all(getattr(type(self), name) is getattr(CodeGenerator, name) for name in names):
+                self.literal_runs.add(node_type)
+        self.literal_run_types = self.literal_runs
+        # Generators that are free for a call: this one, and copies of it for
+        # calls while it is busy
+        self.idle = [self]
+        # Binary operators with the whitespace around them.  In compact
+        # output, operators that could merge with the start of their right
+        # operand map to None and are separated as needed.
+        self.operators = {}
+        for operator in BinaryPrecedence:
+            if operator.isalpha():
+                self.operators[operator] = " " + operator + " "
+            elif self.compact and operator[-1] in "+-/<":
+                self.operators[operator] = None
+            else:
+                self.operators[operator] = self.space + operator + self.space
 
     def program(self, stmt):
-        result = []
         for b in stmt['body']:
-            result += self.generate_statement(b)
-        return "".join(result)
+            self.generate_statement(b)
 
     def expressionstatement(self, stmt):
-        result = self.generate_expression(stmt['expression'], Precedence.Sequence)
-        return result + ";\n"
+        self.generate_expression(stmt['expression'], Precedence.Sequence)
+        self.out.write(";")
+        self.out.newline()
 
     def forstatement(self, stmt):
-        result = "for ("
+        out = self.out
+        out.write("for" + self.space + "(")
         if stmt['init']:
-            result += self.generate_expression(stmt['init'], Precedence.Sequence)
-        result += ";"
+            self.generate_expression(stmt['init'], Precedence.Sequence)
+        out.write(";")
 
         if stmt['test']:
-            result += self.space + self.generate_expression(stmt['test'], Precedence.Sequence)
-        result += ";"
+            out.write(self.space)
+            self.generate_expression(stmt['test'], Precedence.Sequence)
+        out.write(";")
 
         if stmt['update']:
-            result += self.space + self.generate_expression(stmt['update'], Precedence.Sequence)
-        result += ")"
+            out.write(self.space)
+            self.generate_expression(stmt['update'], Precedence.Sequence)
+        out.write(")" + self.space)
 
-        result += self.space + self.generate_statement(stmt["body"])
-        return result
+        self.generate_statement(stmt["body"])
 
     def forinstatement(self, stmt):
-        if stmt['left']['type'] == "VariableDeclaration":
-            left = stmt['left']['kind'] + " " + self.generate_statement(stmt['left']['declarations'][0])
+        out = self.out
+        out.write("for" + self.space + "(")
+        left = fields(stmt['left'])
+        if left['type'] == "VariableDeclaration":
+            out.write(left['kind'] + " ")
+            self.generate_statement(left['declarations'][0])
         else:
-            left = self.generate_expression(stmt['left'], Precedence.Call)
+            self.generate_expression(stmt['left'], Precedence.Call)
+        out.write(" in ")
+        self.generate_expression(stmt['right'], Precedence.Sequence)
+        out.write(")" + self.space)
 
-        result = "for" + self.space + "(%s in %s)" % (left, self.generate_expression(stmt['right'], Precedence.Sequence))
-
-        result += self.space + self.generate_statement(stmt["body"])
-        return result
+        self.generate_statement(stmt["body"])
 
     def dowhilestatement(self, stmt):
-        result = "do" + self.space + self.generate_statement(stmt['body'])
-        result = result[:-1]
-        result += " while (%s);" % self.generate_expression(stmt['test'], Precedence.Sequence)
-        return result
+        out = self.out
+        out.write("do" + self.separator(stmt['body']))
+        self.generate_statement(stmt['body'])
+        out.drop_newline()
+        out.write(self.space + "while" + self.space + "(")
+        self.generate_expression(stmt['test'], Precedence.Sequence)
+        out.write(");")
 
     def switchstatement(self, stmt):
+        out = self.out
+        out.write("switch" + self.space + "(")
+        self.generate_expression(stmt['discriminant'], Precedence.Sequence)
+        out.write(")" + self.space + "{")
+        out.newline()
+        out.indent(self.indent)
         cases = stmt['cases']
-        fragments = []
-
-        result =  "switch" + self.space + "(%s)" % self.generate_expression(stmt['discriminant'], Precedence.Sequence)
-        result += self.space + "{\n"
-        self.indentation += self.indent
         for case in cases:
-            fragments.append(self.generate_statement(case))
-        self.indentation -= self.indent
-
-        return result + "".join(fragments) + "}"
+            self.generate_statement(case)
+        out.dedent(self.indent)
+        if self.compact and cases and fields(cases[-1])['consequent']:
+            self.drop_semicolon(fields(cases[-1])['consequent'][-1])
+        out.write("}")
 
     def switchcase(self, stmt):
-        result = self.indentation * self.space
+        out = self.out
+        out.write_indent()
         if stmt['test']:
-            result += "case %s:\n" % self.generate_expression(stmt['test'], Precedence.Sequence)
+            out.write("case" + self.separator(stmt['test']))
+            self.generate_expression(stmt['test'], Precedence.Sequence)
+            out.write(":")
         else:
-            result += "default:\n"
+            out.write("default:")
+        out.newline()
 
-        self.indentation += self.indent
+        out.indent(self.indent)
         for consequent in stmt['consequent']:
-            result += self.indentation * self.space
-            result += self.generate_statement(consequent) + "\n"
-        self.indentation -= self.indent
-        return result
+            out.write_indent()
+            self.generate_statement(consequent)
+            out.newline()
+        out.dedent(self.indent)
 
     def assignmentexpression(self, expr, precedence):
-        left = self.generate_expression(expr['left'], Precedence.Call)
-        right = self.generate_expression(expr['right'], Precedence.Assignment)
-        return self.parenthesize(left + self.space + expr['operator'] + self.space + right, Precedence.Assignment, precedence)
+        out = self.out
+        parenthesize = Precedence.Assignment < precedence
+        if parenthesize:
+            out.write("(")
+        self.generate_expression(expr['left'], Precedence.Call)
+        out.write(self.space + expr['operator'] + self.space)
+        self.generate_expression(expr['right'], Precedence.Assignment)
+        if parenthesize:
+            out.write(")")
 
     def sequenceexpression(self, expr, precedence):
-        result = [self.generate_expression(e, Precedence.Assignment) for e in expr['expressions']]
-        return self.parenthesize(", ".join(result), Precedence.Sequence, precedence)
+        out = self.out
+        parenthesize = Precedence.Sequence < precedence
+        if parenthesize:
+            out.write("(")
+        for i, e in enumerate(expr['expressions']):
+            if i:
+                out.write(self.comma)
+            self.generate_expression(e, Precedence.Assignment)
+        if parenthesize:
+            out.write(")")
 
     def thisexpression(self, expr, precedence):
-        return "this"
+        self.out.write("this")
 
     def emptystatement(self, stmt):
-        return ";"
+        self.out.write(";")
 
     def binaryexpression(self, expr, precedence):
-        operator = expr['operator']
-        current_precedence = BinaryPrecedence[operator]
-        result = [
-            self.generate_expression(expr['left'], current_precedence),
-            self.space,
-            operator,
-            self.space,
-            self.generate_expression(expr['right'], current_precedence)
-        ]
-        return self.parenthesize("".join(result), current_precedence, precedence)
+        # Walk the left spine of the chain iteratively, so a + b + c + ...
+        # does not nest one handler call per operand.
+        # The spine is a flat list of (node, precedence, parenthesize)
+        # triples rather than a list of tuples, which would make the garbage
+        # collector scan every link of very long chains.
+        out = self.out
+        operators = self.operators
+        node_type = expr['type']
+        spine = []
+        node = expr
+        while True:
+            current_precedence = BinaryPrecedence[node['operator']]
+            spine += node, current_precedence, current_precedence < precedence
+            precedence = current_precedence
+            node = node['left']
+            if node.__class__ is not dict:
+                node = fields(node)
+            if node['type'] != node_type or node_type not in self.chain_types:
+                break
+        for parenthesize in spine[2::3]:
+            if parenthesize:
+                out.write("(")
+        self.generate_expression(node, precedence)
+        for i in range(len(spine) - 3, -1, -3):
+            node = spine[i]
+            operator = operators[node['operator']]
+            if operator is None:
+                operator = node['operator']
+                if self.leading_character(node['right'], spine[i + 1]) in (operator[-1], operator == '<' and '!'):
+                    operator += " "
+            out.write(operator)
+            self.generate_expression(node['right'], spine[i + 1])
+            if spine[i + 2]:
+                out.write(")")
 
     def logicalexpression(self, expr, precedence):
-        return self.binaryexpression(expr, precedence)
+        self.binaryexpression(expr, precedence)
 
     def unaryexpression(self, expr, precedence):
+        out = self.out
         operator = expr['operator']
-        result = operator + (" " if len(operator) > 2 else "") + self.generate_expression(expr['argument'], Precedence.Unary)
-        return self.parenthesize(result, Precedence.Unary, precedence)
+        parenthesize = Precedence.Unary < precedence
+        if parenthesize:
+            out.write("(")
+        if operator.isalpha():
+            out.write(operator + self.separator(expr['argument'], Precedence.Unary))
+        elif operator in "+-" and self.leading_character(expr['argument'], Precedence.Unary) == operator:
+            out.write(operator + " ")
+        else:
+            out.write(operator)
+        self.generate_expression(expr['argument'], Precedence.Unary)
+        if parenthesize:
+            out.write(")")
 
     def updateexpression(self, expr, precedence):
+        out = self.out
         operator = expr['operator']
         if expr["prefix"]:
-            return self.parenthesize(operator + self.generate_expression(expr['argument'], Precedence.Unary), Precedence.Unary, precedence)
+            parenthesize = Precedence.Unary < precedence
+            if parenthesize:
+                out.write("(")
+            out.write(operator)
+            self.generate_expression(expr['argument'], Precedence.Unary)
         else:
-            return self.parenthesize(self.generate_expression(expr['argument'], Precedence.Postfix) + operator, Precedence.Postfix, precedence)
+            parenthesize = Precedence.Postfix < precedence
+            if parenthesize:
+                out.write("(")
+            self.generate_expression(expr['argument'], Precedence.Postfix)
+            out.write(operator)
+        if parenthesize:
+            out.write(")")
 
     def newexpression(self, expr, precedence):
-        result = 'new '
-        result += self.generate_expression(expr['callee'], Precedence.New)
-        result += "("
-        result += ", ".join([self.generate_expression(x, Precedence.Assignment) for x in expr['arguments']])
-        return result + ")"
+        out = self.out
+        out.write('new' + self.separator(expr['callee'], Precedence.New))
+        self.generate_expression(expr['callee'], Precedence.New)
+        out.write("(")
+        for i, x in enumerate(expr['arguments']):
+            if i:
+                out.write(self.comma)
+            self.generate_expression(x, Precedence.Assignment)
+        out.write(")")
 
     def conditionalexpression(self, expr, precedence):
-        result = self.generate_expression(expr['test'], Precedence.LogicalOR)
-        result += self.space + '?' + self.space
-        result += self.generate_expression(expr['consequent'], Precedence.Assignment)
-        result += self.space + ':' + self.space
-        result += self.generate_expression(expr['alternate'], Precedence.Assignment)
-        return result
+        out = self.out
+        self.generate_expression(expr['test'], Precedence.LogicalOR)
+        out.write(self.space + '?' + self.space)
+        self.generate_expression(expr['consequent'], Precedence.Assignment)
+        out.write(self.space + ':' + self.space)
+        self.generate_expression(expr['alternate'], Precedence.Assignment)
 
     def continuestatement(self, stmt):
         if stmt['label']:
-            return "continue %s;" % stmt['label']['name']
-        return "continue;"
+            self.out.write("continue %s;" % fields(stmt['label'])['name'])
+        else:
+            self.out.write("continue;")
 
     def breakstatement(self, stmt):
         if stmt['label']:
-            return "break %s;" % stmt['label']
+            self.out.write("break %s;" % fields(stmt['label'])['name'])
         else:
-            return "break;"
+            self.out.write("break;")
 
     def returnstatement(self, stmt):
+        out = self.out
         if not stmt['argument']:
-            return "return;\n"
-
-        return "return %s;\n" % self.generate_expression(stmt['argument'], Precedence.Sequence)
-
+            out.write("return;")
+        else:
+            out.write("return" + self.separator(stmt['argument']))
+            self.generate_expression(stmt['argument'], Precedence.Sequence)
+            out.write(";")
+        out.newline()
 
     def ifstatement(self, stmt):
-        result = "if" + self.space + "(%s)" % self.generate_expression(stmt['test'], Precedence.Sequence) + self.space
-        result += self.generate_statement(stmt['consequent'])
+        out = self.out
+        out.write("if" + self.space + "(")
+        self.generate_expression(stmt['test'], Precedence.Sequence)
+        out.write(")" + self.space)
+        self.generate_statement(stmt['consequent'])
         if 'alternate' in stmt and stmt['alternate']:
-            result = result[:-1]
-            result += self.space + "else" + self.space
-            result += self.generate_statement(stmt['alternate'])
-        return result
+            out.drop_newline()
+            out.write(self.space + "else" + self.separator(stmt['alternate']))
+            self.generate_statement(stmt['alternate'])
 
     def whilestatement(self, stmt):
-        result = "while" + self.space + "(%s)" % self.generate_expression(stmt['test'], Precedence.Sequence) + self.space
-        result += self.generate_statement(stmt['body'])
-        return result
+        out = self.out
+        out.write("while" + self.space + "(")
+        self.generate_expression(stmt['test'], Precedence.Sequence)
+        out.write(")" + self.space)
+        self.generate_statement(stmt['body'])
 
     def arrayexpression(self, expr, precedence):
+        out = self.out
         elements = expr['elements']
         if not len(elements):
-            return "[]"
-        elements = [self.generate_expression(e, Precedence.Assignment) for e in elements]
-        return "[%s]" % (","+self.space).join(elements)
+            out.write("[]")
+            return
+        out.write("[")
+        if 'ArrayExpression' in self.literal_run_types:
+            self.generate_elements(elements)
+        else:
+            for i, e in enumerate(elements):
+                if i:
+                    out.write(self.comma)
+                self.generate_expression(e, Precedence.Assignment)
+        out.write("]")
+
+    def generate_elements(self, elements):
+        # Data arrays hold long runs of literals, whose code is joined
+        # without dispatching each of them
+        out = self.out
+        comma = self.comma
+        generate_literal = self.generate_literal
+        run = []
+        for i, e in enumerate(elements):
+            node = e if e.__class__ is dict else fields(e)
+            if node['type'] == 'Literal':
+                if i and not run:
+                    run.append("")
+                run.append(generate_literal(node))
+                continue
+            if run:
+                out.write(comma.join(run))
+                run = []
+            if i:
+                out.write(comma)
+            self.generate_expression(e, Precedence.Assignment)
+        if run:
+            out.write(comma.join(run))
 
     def objectpattern(self, expr, precedence):
+        out = self.out
         properties = expr['properties']
         if not len(properties):
-            return "{}"
-        properties = [self.generate_expression(e, Precedence.Assignment) for e in properties]
-        return "{%s}" % (","+self.space).join(properties)
+            out.write("{}")
+            return
+        out.write("{")
+        for i, e in enumerate(properties):
+            if i:
+                out.write(self.comma)
+            self.generate_expression(e, Precedence.Assignment)
+        out.write("}")
 
     def property(self, expr, precedence):
-        key = self.generate_property_key(expr['key'], False) + ":" + self.space
-        value = self.generate_expression(expr['value'], Precedence.Sequence)
-        if expr['key']['type'] == expr['value']['type'] == 'Identifier' and expr['key']['name'] == expr['value']['name']:
-            return value
-        else:
-            return key + value
+        key = fields(expr['key'])
+        value = fields(expr['value'])
+        if key['type'] == value['type'] == 'Identifier' and key['name'] == value['name']:
+            self.generate_expression(expr['value'], Precedence.Sequence)
+            return
+        self.generate_property_key(expr['key'], False)
+        self.out.write(":" + self.space)
+        self.generate_expression(expr['value'], Precedence.Sequence)
 
     def spreadelement(self, expr, precedence):
-        return "...%s" % self.generate_expression(expr['argument'], Precedence.Assignment)
+        self.out.write("...")
+        self.generate_expression(expr['argument'], Precedence.Assignment)
 
     def objectexpression(self, expr, precedence):
+        out = self.out
         properties = expr['properties']
         if not len(properties):
-            return "{}"
-        result = ["{"]
-        self.indentation += self.indent
-        fragments = [self.generate_expression(p, Precedence.Sequence) for p in properties]
-        for i, fragment in enumerate(fragments):
-            fragments[i] = '{}{}'.format(self.indentation * self.space, fragment)
-        result.append("%s" % ",\n".join(fragments))
-        self.indentation -= self.indent
-        result.append('%s}' % (self.indentation * self.space))
-        return '\n'.join(result)
-
-    def memberexpression(self, expr, precedence):
-        result = [self.generate_expression(expr['object'], Precedence.Call) ]
-        if expr['computed']:
-            result += ["[", self.generate_expression(expr['property'], Precedence.Sequence), "]"]
+            out.write("{}")
+            return
+        out.write("{")
+        out.indent(self.indent)
+        if 'ObjectExpression' in self.literal_run_types:
+            self.generate_properties(properties)
         else:
-            result += [
-                "{}.".format('\n{}'.format(self.indentation * self.space) if expr['property']['name'] == 'then' else ''),
-                self.generate_expression(expr['property'], Precedence.Sequence)
-            ]
+            for i, p in enumerate(properties):
+                if i:
+                    out.write(",")
+                out.newline()
+                out.write_indent()
+                self.generate_expression(p, Precedence.Sequence)
+        out.dedent(self.indent)
+        out.newline()
+        out.write_indent()
+        out.write("}")
+
+    def generate_properties(self, properties):
+        # As generate_elements, for properties with a literal value and an
+        # identifier or literal key
+        out = self.out
+        line = self.newline + out.indentation * self.space
+        separator = "," + line
+        colon = ":" + self.space
+        generate_literal = self.generate_literal
+        run = []
+        for i, p in enumerate(properties):
+            node = p if p.__class__ is dict else fields(p)
+            if node['type'] == 'Property':
+                key = node['key']
+                if key.__class__ is not dict:
+                    key = fields(key)
+                value = node['value']
+                if value.__class__ is not dict:
+                    value = fields(value)
+                if value['type'] == 'Literal':
+                    if key['type'] == 'Identifier':
+                        code = str(key['name']) + colon + generate_literal(value)
+                    elif key['type'] == 'Literal':
+                        code = generate_literal(key) + colon + generate_literal(value)
+                    else:
+                        code = None
+                    if code is not None:
+                        if i and not run:
+                            run.append("")
+                        elif not i:
+                            out.write(line)
+                        run.append(code)
+                        continue
+            if run:
+                out.write(separator.join(run))
+                run = []
+            if i:
+                out.write(",")
+            out.newline()
+            out.write_indent()
+            self.generate_expression(p, Precedence.Sequence)
+        if run:
+            out.write(separator.join(run))
 
-        return self.parenthesize("".join(result), Precedence.Member, precedence)
+    def memberexpression(self, expr, precedence):
+        self.generate_access_chain(expr, precedence)
 
     def callexpression(self, expr, precedence):
-        result = [self.generate_expression(expr['callee'], Precedence.Call), '(' ]
-        args = []
-        for arg in expr['arguments']:
-            args.append(self.generate_expression(arg, Precedence.Assignment))
-
-        result.append(", ".join(args))
-        if result and result[-1] and result[-1][-1] == '\n':
-                result[-1] = result[-1][:-1]
-        result.append(')')
-        return "".join(result)
+        self.generate_access_chain(expr, precedence)
 
     def throwstatement(self, stmt):
-        return "throw %s;\n" % self.generate_expression(stmt['argument'], Precedence.Sequence)
+        out = self.out
+        out.write("throw" + self.separator(stmt['argument']))
+        self.generate_expression(stmt['argument'], Precedence.Sequence)
+        out.write(";")
+        out.newline()
 
     def withstatement(self, stmt):
-        result = "with" + self.space + "(%s)" % self.generate_expression(stmt['object'], Precedence.Sequence)
-        result += self.generate_statement(stmt['body'])
-        return result
+        out = self.out
+        out.write("with" + self.space + "(")
+        self.generate_expression(stmt['object'], Precedence.Sequence)
+        out.write(")")
+        self.generate_statement(stmt['body'])
 
     def identifier(self, expr, precedence):
-        return self.generate_identifier(expr)
+        self.out.write(self.generate_identifier(expr))
 
     def literal(self, expr, precedence):
-        if 'regex' in expr:
-            return '/{}/{}'.format(expr['regex']['pattern'], expr['regex']['flags'])
-        if 'value' not in expr:
-            expr['value'] = None
-        value = expr['value']
-        if isinstance(value, str):
-            return "%s" % json.dumps(value)
-        if isinstance(value, bool):
-            return "true" if value else "false"
-        if value == None:
-            return "null"
-        return str(value)
+        self.out.write(self.generate_literal(expr))
 
     def functiondeclaration(self, stmt):
-        return "function %s%s" % (self.generate_identifier(stmt['id']), self.generate_function_body(stmt))
+        self.out.write("function " + self.generate_identifier(stmt['id']))
+        self.generate_function_body(stmt)
 
     def variabledeclaration(self, stmt):
-        kind = stmt["kind"]
-        declarations = []
-        for declaration in stmt['declarations']:
-            declarations.append(self.generate_statement(declaration))
-        result = kind + " " + ", ".join(declarations)
-        if result[-1] == '\n':
-            result = result[:-1]
-        return result + ";\n"
+        out = self.out
+        out.write(stmt["kind"] + " ")
+        for i, declaration in enumerate(stmt['declarations']):
+            if i:
+                out.write(self.comma)
+            self.generate_statement(declaration)
+        out.drop_newline()
+        out.write(";")
+        out.newline()
 
     def variabledeclarator(self, stmt):
-        result = self.generate_expression(stmt['id'], Precedence.Assignment)
+        self.generate_expression(stmt['id'], Precedence.Assignment)
         if stmt['init']:
-            result += " = " + self.generate_expression(stmt['init'], Precedence.Assignment)
-        return result
+            self.out.write(self.space + "=" + self.space)
+            self.generate_expression(stmt['init'], Precedence.Assignment)
 
     def functionexpression(self, expr, precedence):
-        result = ['function']
         if 'id' in expr and expr['id']:
-            result.append(self.generate_identifier(expr['id']))
-
-        result.append(self.generate_function_body(expr))
-        return "".join(result)
+            self.out.write("function " + self.generate_identifier(expr['id']))
+        else:
+            self.out.write("function")
+        self.generate_function_body(expr)
 
     def arrowfunctionexpression(self, expr, precedence):
-        result = []
         if 'id' in expr and expr['id']:
-            result.append(self.generate_identifier(expr['id']))
-
-        result.append(self.generate_arrow_function_body(expr))
-        return "".join(result)
+            self.out.write(self.generate_identifier(expr['id']))
+        self.generate_arrow_function_body(expr)
 
     def blockstatement(self, stmt):
-        result = ["{\n"]
-        body = stmt['body']
-        self.indentation += self.indent
-        for bstmt in body:
-            result.append('{}{}'.format(self.indentation * self.space, self.generate_statement(bstmt)))
-        self.indentation -= self.indent
-        if result and result[-1] and result[-1][-1] == '\n':
-            result[-1] = result[-1][:-1]
-        result.append("\n%s}" % (self.indentation * self.space))
-        result = "".join(result)
-        if self.indentation == 0:
-            result += "\n"
-        return result
+        out = self.out
+        toplevel = out.indentation == 0
+        out.write("{")
+        out.newline()
+        out.indent(self.indent)
+        for bstmt in stmt['body']:
+            out.write_indent()
+            self.generate_statement(bstmt)
+        out.dedent(self.indent)
+        if self.compact and stmt['body']:
+            self.drop_semicolon(stmt['body'][-1])
+        out.drop_newline()
+        out.newline()
+        out.write_indent()
+        out.write("}")
+        if toplevel:
+            out.newline()
 
     def trystatement(self, stmt):
-        result = "try" + self.space
-        result += self.generate_statement(stmt['block'])
-        result = result[:-1]
-        result += "\n".join([self.generate_statement(s) for s in stmt['handlers']])
-        return result
+        out = self.out
+        out.write("try" + self.space)
+        self.generate_statement(stmt['block'])
+        out.drop_newline()
+        # Older ESTree has a list of handlers, current ESTree (and esprima)
+        # a single handler and a finalizer
+        handlers = stmt.get('handlers')
+        if handlers is None:
+            handlers = [stmt['handler']] if stmt.get('handler') else []
+        for i, handler in enumerate(handlers):
+            if i:
+                out.newline()
+            self.generate_statement(handler)
+        if stmt.get('finalizer'):
+            out.drop_newline()
+            out.write(self.space + "finally" + self.space)
+            self.generate_statement(stmt['finalizer'])
 
     def catchclause(self, stmt):
-        result = self.space + "catch" + self.space + "(%s)" % self.generate_expression(stmt['param'], Precedence.Sequence)
-        result += self.generate_statement(stmt['body'])
-        return result
+        out = self.out
+        out.write(self.space + "catch" + self.space + "(")
+        self.generate_expression(stmt['param'], Precedence.Sequence)
+        out.write(")")
+        self.generate_statement(stmt['body'])
 
     def labeledstatement(self, stmt):
-        return "%s: %s" % (stmt['label']['name'], self.generate_statement(stmt['body']))
+        self.out.write(fields(stmt['label'])['name'] + ":" + self.space)
+        self.generate_statement(stmt['body'])
 
     def debuggerstatement(self, stmt):
-        return "debugger;"
-
-    def parenthesize(self, text, current, should):
-        if current < should:
-            return '(' + text + ')'
-        return text
+        self.out.write("debugger;")
 
     def is_statement(self, node):
-        return Syntax(node["type"]) in Statements
+        return Syntax(fields(node)["type"]) in Statements
+
+    def leading_character(self, node, precedence=Precedence.Sequence):
+        """Return the first character of the code for node.
+
+        Where that depends on more than the node types, return a word
+        character, which is always safe to separate with a space.
+        """
+        while True:
+            if self.passes is not None:
+                node = self.peek(node)
+            node = fields(node)
+            node_type = node['type']
+            if node_type in LeadingChild:
+                field, child_precedence, own_precedence = LeadingChild[node_type]
+                child = node[field]
+            elif node_type in ('BinaryExpression', 'LogicalExpression'):
+                child = node['left']
+                child_precedence = own_precedence = BinaryPrecedence[node['operator']]
+            elif node_type == 'SequenceExpression':
+                child = node['expressions'][0]
+                child_precedence, own_precedence = Precedence.Assignment, Precedence.Sequence
+            elif node_type == 'UpdateExpression' and not node['prefix']:
+                child = node['argument']
+                child_precedence = own_precedence = Precedence.Postfix
+            elif node_type in ('UnaryExpression', 'UpdateExpression'):
+                return "(" if Precedence.Unary < precedence else node['operator'][0]
+            elif node_type in LeadingCharacter:
+                return LeadingCharacter[node_type]
+            elif node_type == 'Literal':
+                return self.generate_literal(node)[:1] or "a"
+            elif node_type == 'ArrowFunctionExpression' and not node.get('id'):
+                return "("
+            else:
+                return "a"
+            if own_precedence is not None and own_precedence < precedence:
+                return "("
+            node, precedence = child, child_precedence
+
+    def separator(self, node, precedence=Precedence.Sequence):
+        """Return the whitespace between a keyword and the code for node."""
+        if self.compact and not is_word_character(self.leading_character(node, precedence)):
+            return ""
+        return " "
+
+    def drop_semicolon(self, stmt):
+        """Drop the semicolon that ends stmt, the last one before a "}"."""
+        while True:
+            if self.passes is not None:
+                stmt = self.peek(stmt)
+            stmt = fields(stmt)
+            if stmt['type'] in TrailingStatement:
+                stmt = stmt[TrailingStatement[stmt['type']]]
+            elif stmt['type'] == 'IfStatement':
+                stmt = stmt.get('alternate') or stmt['consequent']
+            else:
+                break
+        if stmt['type'] != 'EmptyStatement':
+            self.out.drop(";")
 
     def generate_property_key(self, expr, computed):
         if computed:
-            return "[%s]" % self.generate_expression(expr, Precedence.Sequence)
-        return self.generate_expression(expr, Precedence.Sequence)
+            self.out.write("[")
+            self.generate_expression(expr, Precedence.Sequence)
+            self.out.write("]")
+        else:
+            self.generate_expression(expr, Precedence.Sequence)
 
     def generate_function_params(self, node):
         params = []
         for param in node['params']:
             params.append(self.generate_identifier(param))
-        return '(' + ", ".join(params) + ')'
+        self.out.write('(' + self.comma.join(params) + ')')
 
     def generate_function_body(self, node):
-        result = [self.generate_function_params(node), self.space, self.generate_statement(node["body"])]
-        return "".join(result)
+        self.generate_function_params(node)
+        self.out.write(self.space)
+        self.generate_statement(node["body"])
 
     def generate_arrow_function_body(self, node):
-        result = [self.generate_function_params(node), self.space, '=>', self.space, self.generate_statement(node["body"])]
-        return "".join(result)
+        self.generate_function_params(node)
+        self.out.write(self.space + '=>' + self.space)
+        self.generate_statement(node["body"])
+
+    def generate_access_chain(self, expr, precedence):
+        # Member accesses and calls nest through their object and callee.
+        # Walk that spine iteratively, so p.then(f).then(g)... does not nest
+        # one handler call per link.  As in binaryexpression, the spine is a
+        # flat list, of (node, parenthesize) pairs.
+        out = self.out
+        spine = []
+        node = expr
+        while True:
+            if node['type'] == 'CallExpression':
+                spine += node, False
+                node = node['callee']
+            else:
+                spine += node, Precedence.Member < precedence
+                node = node['object']
+            if node.__class__ is not dict:
+                node = fields(node)
+            precedence = Precedence.Call
+            node_type = node['type']
+            if node_type not in AccessChain or node_type not in self.chain_types:
+                break
+        for parenthesize in spine[1::2]:
+            if parenthesize:
+                out.write("(")
+        self.generate_expression(node, Precedence.Call)
+        if node['type'] == 'Literal' and spine[-2]['type'] == 'MemberExpression' and self.generate_literal(node).isdigit():
+            # 1.toString() would read the dot as a decimal point
+            last = spine[-2]
+            if not last['computed'] and (self.compact or fields(last['property'])['name'] != 'then'):
+                out.write(" ")
+        for i in range(len(spine) - 2, -1, -2):
+            node = spine[i]
+            parenthesize = spine[i + 1]
+            if node['type'] == 'CallExpression':
+                out.write("(")
+                for i, arg in enumerate(node['arguments']):
+                    if i:
+                        out.write(self.comma)
+                    self.generate_expression(arg, Precedence.Assignment)
+                out.drop_newline()
+                out.write(")")
+            elif node['computed']:
+                out.write("[")
+                self.generate_expression(node['property'], Precedence.Sequence)
+                out.write("]")
+            else:
+                prop = node['property']
+                if prop.__class__ is not dict:
+                    prop = fields(prop)
+                if prop['name'] == 'then':
+                    out.newline()
+                    out.write_indent()
+                out.write(".")
+                self.generate_expression(node['property'], Precedence.Sequence)
+            if parenthesize:
+                out.write(")")
+
+    def register(self, node_type):
+        """Resolve and cache the handler for a node type missing from the table."""
+        handler = getattr(self, node_type.lower())
+        self.handlers[node_type] = handler
+        if node_type.lower().endswith('expression'):
+            self.expression_types.add(node_type)
+        return handler
 
     def generate_expression(self, expr, precedence):
+        budget = self.budget
+        if not budget:
+            self.out.defer((expr, precedence, self.out.indentation))
+            return
+        if expr.__class__ is not dict:
+            expr = fields(expr)
         node_type = expr["type"]
-        attr = getattr(self, node_type.lower())
-        return attr(expr, precedence)
+        try:
+            handler = self.handlers[node_type]
+        except KeyError:
+            handler = self.register(node_type)
+        self.budget = budget - 1
+        result = handler(expr, precedence)
+        self.budget = budget
+        if result is not None:
+            self.out.write(result)
 
     def generate_statement(self, stmt):
+        budget = self.budget
+        if not budget:
+            self.out.defer((stmt, None, self.out.indentation))
+            return
+        if stmt.__class__ is not dict:
+            stmt = fields(stmt)
         node_type = stmt["type"]
-        if node_type.lower().endswith('expression'):
-            return self.generate_expression(stmt, Precedence.Sequence)
-        attr = getattr(self, node_type.lower())
-        # print(attr)
-        return attr(stmt)
+        try:
+            handler = self.handlers[node_type]
+        except KeyError:
+            handler = self.register(node_type)
+        self.budget = budget - 1
+        if node_type in self.expression_types:
+            result = handler(stmt, Precedence.Sequence)
+        else:
+            result = handler(stmt)
+        self.budget = budget
+        if result is not None:
+            self.out.write(result)
 
     def generate_identifier(self, node):
+        if node.__class__ is not dict:
+            node = fields(node)
         return str(node["name"])
 
-    def generate(self, node):
-        if self.is_statement(node):
-            return self.generate_statement(node)
+    def generate_literal(self, expr):
+        if 'regex' in expr:
+            regex = fields(expr['regex'])
+            return '/{}/{}'.format(regex['pattern'], regex['flags'])
+        value = expr.get('value')
+        if isinstance(value, str):
+            return self.string_literal(value)
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if value == None:
+            return "null"
+        if value.__class__ is int or value.__class__ is float:
+            return number_literal(value, self.compact)
+        return str(value)
+
+    @staticmethod
+    def mapping(generate, mark, expression):
+        """Wrap generate so that it marks where the code of each node starts."""
+        if expression:
+            def generate_mapped(expr, precedence):
+                mark(fields(expr))
+                generate(expr, precedence)
         else:
-            print("Unknown", node["type"])
-        pass
+            def generate_mapped(stmt):
+                mark(fields(stmt))
+                generate(stmt)
+        return generate_mapped
+
+    def caching(self, generate, expression):
+        """Wrap generate so that it reuses the code cached for subtrees.
+
+        Code is cached only if no part of it was deferred, as then it is
+        complete in the frame once generate returns.
+        """
+        cache = self.cache
+        types = cache.types
+        out = self.out
+        frame = out.frame
+        marks = out.marks
+        style = (type(self), self.indent)
+
+        def generate_cached(node, precedence=None):
+            if fields(node)['type'] not in types or not self.budget:
+                if expression:
+                    generate(node, precedence)
+                else:
+                    generate(node)
+                return
+            key = (cache.key(node), precedence, out.indentation, style)
+            code = cache.get(key)
+            if code is not None:
+                frame.append(code)
+                return
+            start = len(frame)
+            deferred = len(marks)
+            if expression:
+                generate(node, precedence)
+            else:
+                generate(node)
+            if len(marks) == deferred:
+                cache.put(key, node, "".join(frame[start:]))
+        return generate_cached
+
+    def profiling(self, generate_expression, generate_statement):
+        """Wrap both generate functions so that they record every node in
+        the profiler.
+
+        The output of a node is counted from the frame in segments between
+        its inline children, so every part is counted once.
+        """
+        record = self.profiler.record
+        frame = self.out.frame
+        # Per node being generated: time spent in its children, start of its
+        # uncounted output in the frame and characters counted so far
+        active = []
+
+        def count(start):
+            return sum([len(part) for part in frame[start:] if part.__class__ is str])
+
+        def profile(generate, node, precedence):
+            if not self.budget:
+                # Only deferred, it is recorded when generated
+                if precedence is None:
+                    generate(node)
+                else:
+                    generate(node, precedence)
+                return
+            if active:
+                parent = active[-1]
+                parent[2] += count(parent[1])
+            entry = [0.0, len(frame), 0]
+            active.append(entry)
+            start = perf_counter()
+            if precedence is None:
+                generate(node)
+            else:
+                generate(node, precedence)
+            elapsed = perf_counter() - start
+            active.pop()
+            if active:
+                parent = active[-1]
+                parent[0] += elapsed
+                parent[1] = len(frame)
+            record(fields(node)['type'], elapsed, elapsed - entry[0], entry[2] + count(entry[1]))
+
+        def generate_expression_profiled(expr, precedence):
+            profile(generate_expression, expr, precedence)
+
+        def generate_statement_profiled(stmt):
+            profile(generate_statement, stmt, None)
+
+        return generate_expression_profiled, generate_statement_profiled
+
+    def peek(self, node):
+        """Return the node the passes make of node, visiting it the first
+        time it is seen in a call."""
+        if fields(node)['type'] not in self.passes.callbacks:
+            # Nothing to run, however often it is seen
+            return node
+        visited = self.visited
+        result = visited.get(id(node))
+        if result is None:
+            result = self.passes.visit(node)
+            visited[id(node)] = visited[id(result)] = result
+        return result
 
+    def replace_children(self, node, data, names):
+        """Return node with the children in the fields names replaced by
+        what the passes make of them, copied if any is."""
+        changed = {}
+        for name in names:
+            child = data.get(name)
+            if not child:
+                continue
+            if child.__class__ is list:
+                result = [self.peek(item) for item in child]
+                if any(new is not old for new, old in zip(result, child)):
+                    changed[name] = result
+            else:
+                result = self.peek(child)
+                if result is not child:
+                    changed[name] = result
+        if not changed:
+            return node
+        copy = dict(data.items())
+        copy['type'] = data['type']
+        copy.update(changed)
+        return copy
+
+    def visiting(self, generate_expression, generate_statement):
+        """Wrap both generate functions so that the passes see every node
+        before it is generated, and the node they return is generated.
+
+        Results are kept for the rest of the call, so a node that a handler
+        looks at before generating it is visited once.  The children a
+        handler looks at first are visited along with it.
+        """
+        callbacks = self.passes.callbacks
+        visit = self.passes.visit
+        visited = self.visited
+        replace_children = self.replace_children
+
+        def prepare(node):
+            # As peek, inline
+            data = node if node.__class__ is dict else fields(node)
+            node_type = data['type']
+            if node_type in callbacks:
+                result = visited.get(id(node))
+                if result is None:
+                    result = visit(node)
+                    visited[id(node)] = visited[id(result)] = result
+                if result is not node:
+                    node = result
+                    data = fields(node)
+                    node_type = data['type']
+            names = VisitedChildren.get(node_type)
+            if names is None:
+                return node
+            return replace_children(node, data, names)
+
+        def generate_expression_visited(expr, precedence):
+            if not self.budget:
+                # Only deferred, it is visited when generated
+                generate_expression(expr, precedence)
+            else:
+                generate_expression(prepare(expr), precedence)
+
+        def generate_statement_visited(stmt):
+            if not self.budget:
+                generate_statement(stmt)
+            else:
+                generate_statement(prepare(stmt))
+
+        return generate_expression_visited, generate_statement_visited
+
+    def defer_statement(self, stmt):
+        self.out.defer((stmt, None, self.out.indentation))
 
-def generate(node, indent=2):
-    g = CodeGenerator(indent)
+    def generate(self, node):
+        if not self.is_statement(node):
+            print("Unknown", node["type"])
+            return None
+        return "".join(self.generate_iter(node, None))
+
+    def generate_iter(self, node, buffer_size=BUFFER_SIZE, source_map=None, steps=None):
+        """Generate code for node as an iterator of string chunks.
+
+        Chunks are about buffer_size characters long; with a buffer_size of
+        None the whole output is yielded as a single chunk.  Mappings for
+        nodes with a ``loc`` or ``range`` are added to source_map, a
+        :class:`SourceMap`, if one is given.  The generator's cache is not
+        used while mapping.  With steps, an empty chunk is also yielded
+        after every steps items of the work-list, where the consumer may
+        pause.
+
+        The tree is only read.  Calls made while the generator is busy with
+        another, from other threads or interleaved iterators, run on a copy
+        of it, so one generator can serve any number at once.
+        """
+        if not self.is_statement(node):
+            print("Unknown", node["type"])
+            return
+        yield from self.generate_node_iter(node, buffer_size, source_map, steps)
+
+    def generate_node_iter(self, node, buffer_size=BUFFER_SIZE, source_map=None, steps=None, indentation=0,
+                           precedence=None):
+        """As :meth:`generate_iter`, for a node of any type, generated as if
+        nested indentation spaces deep.  With a precedence, node is generated
+        as an expression at that precedence, otherwise as a statement.
+        """
+        idle = self.idle
+        try:
+            run = idle.pop()
+        except IndexError:
+            run = self.clone()
+        try:
+            yield from run.run_work_list(node, buffer_size, source_map, steps, indentation, precedence)
+        finally:
+            idle.append(run)
+
+    def clone(self):
+        """Return a copy of the generator with the state of a call of its own."""
+        run = copy.copy(self)
+        run.__dict__.pop("generate_statement", None)
+        run.__dict__.pop("generate_expression", None)
+        run.idle = None
+        run.handlers = {node_type: getattr(run, handler.__name__) if getattr(handler, "__self__", None) is self
+                        else handler for node_type, handler in self.handlers.items()}
+        run.expression_types = set(self.expression_types)
+        return run
+
+    def run_work_list(self, node, buffer_size, source_map, steps, indentation=0, precedence=None):
+        # Work-list engine: handlers generate their children inline up to
+        # max_inline_depth and defer deeper ones into the frame.  Once the
+        # dispatched handler returns, the frame is split at the deferred
+        # items into joined string segments that go onto an explicit stack in
+        # reverse, so nesting depth is bounded by memory rather than by the
+        # Python stack.
+        emitter = Emitter() if source_map is None else MappingEmitter(source_map)
+        out = self.out = Schedule(emitter, self.space, self.newline)
+        frame = out.frame
+        marks = out.marks
+        parts = emitter.parts
+        append = emitter.write
+        extend = parts.extend if source_map is None else emitter.extend
+        stack = [(node, precedence, indentation)]
+        pop = stack.pop
+        push = stack.append
+        join = "".join
+        generate_statement = self.generate_statement
+        generate_expression = self.generate_expression
+        if buffer_size is not None:
+            # Handlers defer every statement, so output reaches the emitter
+            # one statement at a time and can be passed on in chunks.
+            self.generate_statement = self.defer_statement
+            flush_parts = FLUSH_PARTS
+        else:
+            flush_parts = float("inf")
+        self.literal_run_types = self.literal_runs
+        if source_map is not None or self.profiler is not None or self.passes is not None:
+            # Literals need their own marks, timings and visits
+            self.literal_run_types = ()
+        if source_map is not None:
+            # Every node is put into the frame in front of its code, and the
+            # emitter maps the position it reaches there.
+            self.generate_expression = self.mapping(generate_expression, frame.append, True)
+            self.generate_statement = self.mapping(self.generate_statement, frame.append, False)
+        elif self.cache is not None and self.passes is None:
+            generate_expression = self.generate_expression = self.caching(generate_expression, True)
+            generate_statement = self.caching(generate_statement, False)
+            if buffer_size is None:
+                self.generate_statement = generate_statement
+        if self.profiler is not None:
+            generate_expression, generate_statement = self.profiling(generate_expression, generate_statement)
+            self.generate_expression = generate_expression
+            if buffer_size is None:
+                self.generate_statement = generate_statement
+        if self.passes is not None:
+            # Outermost, so that the other wrappers get the nodes to generate
+            self.visited = {}
+            generate_expression, generate_statement = self.visiting(generate_expression, generate_statement)
+            self.generate_expression, statement = self.visiting(self.generate_expression, self.generate_statement)
+            if buffer_size is None:
+                self.generate_statement = statement
+        chunks = []
+        size = 0
+        countdown = steps
+        self.budget = self.max_inline_depth
+        try:
+            while stack:
+                item = pop()
+                kind = item.__class__
+                if kind is str or kind is dict:
+                    append(item)
+                    continue
+                if kind is not tuple:
+                    item()
+                    continue
+                node, precedence, out.indentation = item
+                if precedence is None:
+                    generate_statement(node)
+                else:
+                    generate_expression(node, precedence)
+                if marks:
+                    if source_map is None:
+                        end = len(frame)
+                        for index in reversed(marks):
+                            if index + 1 < end:
+                                push(join(frame[index + 1:end]))
+                            push(frame[index])
+                            end = index
+                        if end:
+                            append(join(frame[:end]))
+                    else:
+                        # Joined segments would hide line breaks from the
+                        # emitter, so push the parts one by one.
+                        extend(frame[:marks[0]])
+                        stack.extend(reversed(frame[marks[0]:]))
+                    del marks[:]
+                else:
+                    extend(frame)
+                del frame[:]
+                if len(parts) > flush_parts:
+                    text = emitter.take()
+                    chunks.append(text)
+                    size += len(text)
+                    if size >= buffer_size:
+                        yield join(chunks)
+                        del chunks[:]
+                        size = 0
+                if countdown is not None:
+                    countdown -= 1
+                    if not countdown:
+                        countdown = steps
+                        yield ""
+        finally:
+            self.__dict__.pop("generate_statement", None)
+            self.__dict__.pop("generate_expression", None)
+            self.visited = {}
+        chunks.append(emitter.getvalue())
+        yield join(chunks)
+
+    def generate_to(self, node, fp, buffer_size=BUFFER_SIZE, encoding="utf-8", source_map=None):
+        """Generate code for node and write it to the file-like object fp.
+
+        Output is written whenever about buffer_size characters are ready.
+        Binary files get the code encoded with encoding.
+        """
+        write_chunks(self.generate_iter(node, buffer_size, source_map), fp, encoding)
+
+
+def write_chunks(chunks, fp, encoding="utf-8"):
+    """Write chunks of code to fp, encoded with encoding if it is a binary file."""
+    binary = not isinstance(fp, io.TextIOBase) and (
+        isinstance(fp, (io.RawIOBase, io.BufferedIOBase)) or "b" in getattr(fp, "mode", ""))
+    write = fp.write
+    for chunk in chunks:
+        if chunk:
+            write(chunk.encode(encoding) if binary else chunk)
+
+
+class CompactCodeGenerator(CodeGenerator):
+    """Generates the smallest code: no indentation, line breaks or optional
+    spaces, and no semicolon before a closing brace."""
+    space = ""
+    comma = ","
+    newline = ""
+    compact = True
+
+    def __init__(self, indent=0, cache=None, profiler=None, passes=None):
+        super().__init__(0, cache, profiler, passes)
+
+
+def optimize(node, fold=False, mangle=False, kept=()):
+    """Return node with constants folded and local names mangled, as asked.
+
+    No name is mangled to one in kept.
+    """
+    if fold:
+        node = fold_constants(node)
+    if mangle:
+        node = mangle_names(node, kept)
+    return node
+
+
+def generate(node, indent=2, compact=False, cache=None, profiler=None, fold=False, mangle=False, disk_cache=None,
+             passes=None):
+    if disk_cache is not None:
+        if passes is not None:
+            raise ValueError("the output of passes cannot be cached on disk")
+        return disk_cache.generate(node, indent, compact, cache, profiler, fold, mangle)
+    node = optimize(node, fold, mangle)
+    g = CompactCodeGenerator(0, cache, profiler, passes) if compact else CodeGenerator(indent, cache, profiler, passes)
     return g.generate(node)
+
+
+def generate_iter(node, indent=2, buffer_size=BUFFER_SIZE, compact=False, source_map=None, cache=None,
+                  profiler=None, fold=False, mangle=False, passes=None):
+    node = optimize(node, fold, mangle)
+    g = CompactCodeGenerator(0, cache, profiler, passes) if compact else CodeGenerator(indent, cache, profiler, passes)
+    return g.generate_iter(node, buffer_size, source_map)
+
+
+def generate_to(node, fp, indent=2, buffer_size=BUFFER_SIZE, encoding="utf-8", compact=False, source_map=None,
+                cache=None, profiler=None, fold=False, mangle=False, passes=None):
+    node = optimize(node, fold, mangle)
+    g = CompactCodeGenerator(0, cache, profiler, passes) if compact else CodeGenerator(indent, cache, profiler, passes)
+    g.generate_to(node, fp, buffer_size, encoding, source_map)
+
+
+def generate_compressed_to(node, fp, format="gzip", level=6, flush=None, indent=2, buffer_size=BUFFER_SIZE,
+                           compact=False, source_map=None, cache=None, profiler=None, fold=False, mangle=False,
+                           passes=None):
+    """Generate code for node and write it, UTF-8 encoded and compressed,
+    to the binary file object fp.
+
+    Every chunk of about buffer_size characters is compressed as soon as it
+    is generated, so neither the code nor its encoding is held whole.
+    format, level and flush are those of :class:`CompressedWriter`.  Returns
+    a ``CompressionInfo(raw_size, compressed_size)`` in bytes.
+    """
+    with CompressedWriter(fp, format, level, flush) as writer:
+        generate_to(node, writer, indent, buffer_size, "utf-8", compact, source_map, cache, profiler, fold, mangle,
+                    passes)
+    return writer.info()
+
+
+def json_statements(source, fold=False):
+    """Yield the top-level statements of the ESTree JSON source, folded as
+    in the whole Program if fold is set."""
+    statements = iter_statements(source)
+    return fold_statements(statements) if fold else statements
+
+
+def generate_json_iter(source, indent=2, buffer_size=BUFFER_SIZE, compact=False, cache=None, profiler=None,
+                       fold=False, mangle=False):
+    """Generate code for the Program in the ESTree JSON source, a path or bytes.
+
+    Top-level statements are parsed, folded and generated one at a time,
+    so memory use follows the largest of them rather than the whole tree.
+    To mangle them as :func:`generate` mangles the whole program, the names
+    it keeps are collected first, which parses the source twice.
+    """
+    g = CompactCodeGenerator(0, cache, profiler) if compact else CodeGenerator(indent, cache, profiler)
+    kept = set()
+    if mangle:
+        for stmt in json_statements(source, fold):
+            kept |= Mangler().kept_names(stmt)
+    chunks = []
+    size = 0
+    for stmt in json_statements(source, fold):
+        stmt = optimize(stmt, mangle=mangle, kept=kept)
+        for chunk in g.generate_iter({"type": "Program", "body": [stmt]}, buffer_size):
+            chunks.append(chunk)
+            size += len(chunk)
+        # Not to hold on to it while the next one is parsed
+        del stmt
+        if buffer_size is not None and size >= buffer_size:
+            yield "".join(chunks)
+            chunks = []
+            size = 0
+    yield "".join(chunks)
+
+
+def generate_json_to(source, fp, indent=2, buffer_size=BUFFER_SIZE, encoding="utf-8", compact=False, cache=None,
+                     profiler=None, fold=False, mangle=False, disk_cache=None):
+    if disk_cache is not None:
+        write_chunks([disk_cache.generate_json(source, indent, compact, cache, profiler, fold, mangle)], fp, encoding)
+        return
+    write_chunks(generate_json_iter(source, indent, buffer_size, compact, cache, profiler, fold, mangle), fp,
+                 encoding)
+
+
+def generate_with_source_map(node, indent=2, compact=False, file=None, source=None, source_content=None,
+                             disk_cache=None):
+    """Generate code for node and return it with its Source Map v3 as a dict."""
+    if disk_cache is not None:
+        return disk_cache.generate_with_source_map(node, indent, compact, file, source, source_content)
+    source_map = SourceMap(file, source, source_content)
+    code = "".join(generate_iter(node, indent, None, compact, source_map))
+    return code, source_map.to_dict()
@@ -0,0 +1,28 @@
+"""Command line entry points.
+
+    python -m jscodegen serve [--socket PATH]
+"""
+import argparse
+
+from jscodegen.worker import serve_socket, serve_stdio
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m jscodegen")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="generate code for ESTree JSON-lines requests until end of input")
+    serve.add_argument("--socket", help="listen on this Unix socket instead of reading stdin")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        try:
+            if args.socket:
+                serve_socket(args.socket)
+            else:
+                serve_stdio()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+from functools import partial
+from time import perf_counter
+
+# Seconds of generation between pauses for the event loop
+TIME_BUDGET = 0.005
+
+
+async def generate_async(node, indent=2, compact=False, cache=None, profiler=None, time_budget=TIME_BUDGET,
+                         node_budget=None, executor=None):
+    """Generate code for node without blocking the event loop for long.
+
+    The code is the same as from :func:`jscodegen.generate`.  Generation
+    pauses for the event loop whenever it ran for time_budget seconds or,
+    if node_budget is given, after every node_budget items of its
+    work-list: statements and nodes deferred for depth.  A single item is
+    not interrupted, so a statement with a huge literal still runs in one
+    go.  With an executor, generation runs there instead; in a process
+    pool, the cache and profiler are only updated in the worker's copies.
+    """
+    # Here rather than at the top, since asyncio takes longer to import
+    # than all of jscodegen
+    import asyncio
+    from jscodegen import CodeGenerator, CompactCodeGenerator, generate, BUFFER_SIZE
+    if executor is not None:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, partial(generate, node, indent, compact, cache, profiler))
+    g = CompactCodeGenerator(0, cache, profiler) if compact else CodeGenerator(indent, cache, profiler)
+    if not g.is_statement(node):
+        raise ValueError("cannot generate %s nodes on their own" % node["type"])
+    chunks = []
+    steps = node_budget or 1
+    deadline = perf_counter() + time_budget
+    for chunk in g.generate_iter(node, BUFFER_SIZE, None, steps):
+        if chunk:
+            chunks.append(chunk)
+        elif node_budget or perf_counter() >= deadline:
+            await asyncio.sleep(0)
+            deadline = perf_counter() + time_budget
+    return "".join(chunks)
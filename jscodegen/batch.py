@@ -0,0 +1,150 @@
+import json
+import os
+import pickle
+from collections import deque
+from itertools import islice
+
+# concurrent.futures and traceback are imported where they are used: with
+# multiprocessing, they would take most of the time of importing jscodegen.
+
+# Chunks submitted per worker before the oldest one is waited for, which
+# bounds how much of a long input is pickled ahead of the workers.
+CHUNKS_IN_FLIGHT = 2
+MAX_CHUNK_SIZE = 64
+
+
+class GenerationError(Exception):
+    """Generating one item of a batch failed.
+
+    ``index`` is the position of the item in the input, ``error`` the
+    exception raised for it and ``traceback`` its formatted traceback from
+    the worker process.
+    """
+
+    def __init__(self, index, error, traceback=""):
+        super().__init__(index, error, traceback)
+        self.index = index
+        self.error = error
+        self.traceback = traceback
+
+    def __str__(self):
+        return "item %d: %s: %s" % (self.index, type(self.error).__name__, self.error)
+
+
+def generate_chunk(chunk, indent, compact):
+    """Generate a list of (index, node) pairs in a worker process."""
+    from jscodegen import CodeGenerator, CompactCodeGenerator
+    generator = CompactCodeGenerator() if compact else CodeGenerator(indent)
+    results = []
+    for index, node in chunk:
+        try:
+            if isinstance(node, (str, bytes)):
+                node = json.loads(node)
+            results.append((index, generator.generate(node), None))
+        except Exception as error:
+            import traceback
+            try:
+                pickle.dumps(error)
+            except Exception:
+                error = RuntimeError(repr(error))
+            results.append((index, None, GenerationError(index, error, traceback.format_exc())))
+    return results
+
+
+def default_chunk_size(nodes, workers):
+    try:
+        count = len(nodes)
+    except TypeError:
+        return 16
+    return max(1, min(MAX_CHUNK_SIZE, count // (workers * 4)))
+
+
+def chunked(items, size):
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_pool(executor, chunks, workers, ordered, indent, compact):
+    from concurrent.futures import FIRST_COMPLETED, wait
+    limit = workers * CHUNKS_IN_FLIGHT
+    if ordered:
+        pending = deque()
+        try:
+            for chunk in chunks:
+                pending.append(executor.submit(generate_chunk, chunk, indent, compact))
+                if len(pending) >= limit:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+    else:
+        pending = set()
+        try:
+            for chunk in chunks:
+                pending.add(executor.submit(generate_chunk, chunk, indent, compact))
+                if len(pending) >= limit:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def generate_many(nodes, workers=None, chunk_size=None, ordered=True, return_exceptions=False,
+                  executor=None, indent=2, compact=False):
+    """Generate code for many ASTs in a pool of worker processes.
+
+    Yields an ``(index, code)`` pair per item of nodes, in input order or,
+    if ordered is false, as the items complete.  Items are sent to the
+    workers in chunks of chunk_size.  An item may also be ESTree JSON as
+    str or bytes, which is parsed in the worker and pickles much faster
+    than the tree.
+
+    An item that fails raises a :class:`GenerationError` when its result
+    is reached; with return_exceptions, the error is yielded in place of
+    the code instead.  workers defaults to the number of CPUs; with one
+    worker and no executor, items are generated in this process.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = default_chunk_size(nodes, workers)
+    chunks = chunked(enumerate(nodes), chunk_size)
+    if executor is None and workers == 1:
+        results = (generate_chunk(chunk, indent, compact) for chunk in chunks)
+        for result in iter_results(results, return_exceptions):
+            yield result
+        return
+    own_executor = executor is None
+    if own_executor:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(workers)
+    try:
+        results = run_pool(executor, chunks, workers, ordered, indent, compact)
+        for result in iter_results(results, return_exceptions):
+            yield result
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+
+def iter_results(results, return_exceptions):
+    for chunk_results in results:
+        for index, code, error in chunk_results:
+            if error is None:
+                yield index, code
+            elif return_exceptions:
+                yield index, error
+            else:
+                raise error
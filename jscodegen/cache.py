@@ -0,0 +1,86 @@
+import marshal
+import pickle
+from collections import OrderedDict, namedtuple
+from hashlib import blake2b
+from threading import Lock
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+# Node types whose code is worth caching: the functions and literals that
+# templates share.  Caching small nodes costs more than generating them.
+CACHED_TYPES = frozenset([
+    'FunctionDeclaration',
+    'FunctionExpression',
+    'ArrowFunctionExpression',
+    'ObjectExpression',
+    'ArrayExpression',
+])
+
+
+def fingerprint(node):
+    """Return a digest of the structure of node.
+
+    marshal is lossless and several times faster than json, so different
+    trees never share a digest.  Version 2 has no back-references, which
+    later versions write depending on reference counts, so equal trees get
+    the same digest unless their keys are in a different order.  Node
+    objects other than dicts are pickled instead.
+    """
+    try:
+        data = marshal.dumps(node, 2)
+    except ValueError:
+        data = pickle.dumps(node, 4)
+    return blake2b(data, digest_size=16).digest()
+
+
+class SubtreeCache:
+    """Least recently used cache of the code generated for subtrees.
+
+    Subtrees are keyed on node identity, or on their structure if
+    structural is true, together with the indentation and precedence they
+    are generated at.  Only nodes of the given types are cached.  A cache
+    may be shared between generators, runs and threads; identity keys
+    assume that cached nodes are not modified afterwards.
+    """
+
+    def __init__(self, maxsize=1024, structural=False, types=CACHED_TYPES):
+        self.maxsize = maxsize
+        self.structural = structural
+        self.types = frozenset(types)
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = Lock()
+
+    def key(self, node):
+        return fingerprint(node) if self.structural else id(node)
+
+    def get(self, key):
+        """Return the code cached under key, or None."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, node, code):
+        entries = self.entries
+        with self.lock:
+            # Entries keep their node alive, so its id is not reused while
+            # an identity key refers to it.
+            entries[key] = (node, code)
+            entries.move_to_end(key)
+            if len(entries) > self.maxsize:
+                entries.popitem(last=False)
+
+    def cache_info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self.entries))
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,63 @@
+import io
+import zlib
+from collections import namedtuple
+
+CompressionInfo = namedtuple("CompressionInfo", ["raw_size", "compressed_size"])
+
+# The zlib window bits for each format: gzip and zlib wrap deflate in their
+# header and checksum, deflate is the bare stream
+FORMATS = {"gzip": 16 + zlib.MAX_WBITS, "zlib": zlib.MAX_WBITS, "deflate": -zlib.MAX_WBITS}
+
+FLUSH_MODES = {None: zlib.Z_NO_FLUSH, "sync": zlib.Z_SYNC_FLUSH, "full": zlib.Z_FULL_FLUSH}
+
+
+class CompressedWriter(io.RawIOBase):
+    """A binary file object that compresses what is written to it and
+    writes the compressed data to the binary file object fp as it goes.
+
+    format is ``"gzip"``, ``"zlib"`` or ``"deflate"`` and level the zlib
+    compression level, from 0 to 9.  By default the compressor keeps what
+    it has not yet written out until it is closed.  With flush ``"sync"``
+    it flushes after every write, so a reader of fp can decompress all that
+    was written so far, and with ``"full"`` the reader may also start
+    there; both make the output somewhat larger.  Closing the writer ends
+    the stream but leaves fp open.
+    """
+
+    def __init__(self, fp, format="gzip", level=6, flush=None):
+        super().__init__()
+        if format not in FORMATS:
+            raise ValueError("unknown format %r" % (format,))
+        if flush not in FLUSH_MODES:
+            raise ValueError("unknown flush mode %r" % (flush,))
+        self.fp = fp
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, FORMATS[format])
+        self.flush_mode = FLUSH_MODES[flush]
+        self.raw_size = 0
+        self.compressed_size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        if self.closed:
+            raise ValueError("write to closed file")
+        size = len(data)
+        self.raw_size += size
+        compressed = self.compressor.compress(data)
+        if self.flush_mode:
+            compressed += self.compressor.flush(self.flush_mode)
+        if compressed:
+            self.compressed_size += len(compressed)
+            self.fp.write(compressed)
+        return size
+
+    def close(self):
+        if not self.closed:
+            compressed = self.compressor.flush(zlib.Z_FINISH)
+            self.compressed_size += len(compressed)
+            self.fp.write(compressed)
+        super().close()
+
+    def info(self):
+        return CompressionInfo(self.raw_size, self.compressed_size)
@@ -0,0 +1,254 @@
+import json
+import os
+import sys
+import tempfile
+from collections import namedtuple
+from functools import lru_cache
+from hashlib import blake2b
+from pathlib import Path
+from threading import Lock
+from time import perf_counter, time
+
+from jscodegen.cache import fingerprint
+from jscodegen.jsonstream import json_buffer
+
+DiskCacheInfo = namedtuple("DiskCacheInfo", ["hits", "misses", "time_saved", "maxsize", "currsize"])
+
+# Bytes the files of a cache may take by default
+MAX_SIZE = 256 * 1024 * 1024
+
+# Eviction removes entries until the cache is down to this part of its
+# maximum size, so that it does not run again on the next put
+EVICT_TO = 0.8
+
+# Seconds after which a temporary file is taken to be left over from a
+# process that died while writing it
+TEMPORARY_AGE = 3600
+
+TEMPORARY_PREFIX = ".tmp-"
+
+
+@lru_cache(maxsize=None)
+def library_version():
+    """Return a digest of the source of the package and the Python version.
+
+    Keys include it, so entries generated by another version of the code,
+    released or not, are never used.
+    """
+    digest = blake2b(("%d.%d" % sys.version_info[:2]).encode("ascii"), digest_size=16)
+    for path in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """Cache of generated code and source maps in a directory, for reuse
+    between runs and processes.
+
+    Entries are keyed on a digest of the structure of the tree, the options
+    the output depends on and :func:`library_version`.  Each entry is a
+    file that is written to a temporary file and renamed into place, so
+    processes sharing the directory see whole entries or none, and need no
+    locks.  When the files take more than maxsize bytes, the least recently
+    used are removed; a process only looks at the size again once what it
+    wrote itself would exceed maxsize, so processes that write at once may
+    go over it for a while.  hits, misses and time_saved, the generation time
+    that hits saved less the time they took, count the calls made through
+    this object only.
+    """
+
+    def __init__(self, directory, maxsize=MAX_SIZE):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.time_saved = 0.0
+        # What the files take, as far as this object knows; None until it
+        # first adds an entry
+        self.size = None
+        self.lock = Lock()
+
+    def key(self, node, *options):
+        return self.content_key(fingerprint(node), options)
+
+    @staticmethod
+    def content_key(content, options):
+        digest = blake2b(content, digest_size=16)
+        digest.update(repr((library_version(),) + options).encode("utf-8"))
+        return digest.hexdigest()
+
+    def path(self, key):
+        return self.directory / key[:2] / key
+
+    def get(self, key):
+        """Return the code, source map and generation time cached under
+        key, or None."""
+        path = self.path(key)
+        try:
+            with open(path, "rb") as fp:
+                header = json.loads(fp.readline().decode("utf-8"))
+                data = fp.read(header["code"])
+                source_map = json.loads(fp.read().decode("utf-8")) if header["map"] else None
+        except (OSError, ValueError, KeyError):
+            return None
+        if len(data) != header["code"]:
+            return None
+        try:
+            # Recently used entries are evicted last
+            os.utime(path)
+        except OSError:
+            pass
+        return data.decode("utf-8"), source_map, header["time"]
+
+    def put(self, key, code, source_map=None, generate_time=0.0):
+        """Cache code, and its source map if there is one, under key.
+
+        Entries that cannot be written are left out.
+        """
+        data = code.encode("utf-8")
+        header = {"code": len(data), "map": source_map is not None, "time": generate_time}
+        path = self.path(key)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            fd, temporary = tempfile.mkstemp(prefix=TEMPORARY_PREFIX, dir=str(path.parent))
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                fp.write(json.dumps(header).encode("utf-8") + b"\n")
+                fp.write(data)
+                if source_map is not None:
+                    fp.write(json.dumps(source_map).encode("utf-8"))
+                size = fp.tell()
+            os.replace(temporary, str(path))
+        except OSError:
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+            return
+        with self.lock:
+            if self.size is None:
+                self.size = sum(entry[1] for entry in self.entries())
+            else:
+                self.size += size
+            if self.size > self.maxsize:
+                self.evict()
+
+    def entries(self):
+        """Return the (mtime, size, path) of every file, removing temporary
+        files that were left behind."""
+        entries = []
+        now = time()
+        for directory in self.directory.iterdir():
+            if not directory.is_dir():
+                continue
+            for entry in os.scandir(str(directory)):
+                try:
+                    stat = entry.stat()
+                    if entry.name.startswith(TEMPORARY_PREFIX):
+                        if now - stat.st_mtime > TEMPORARY_AGE:
+                            os.remove(entry.path)
+                            continue
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self):
+        entries = self.entries()
+        entries.sort()
+        size = sum(entry[1] for entry in entries)
+        limit = self.maxsize * EVICT_TO
+        for mtime, entry_size, path in entries:
+            if size <= limit:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # Removed by another process, or in use
+                pass
+            size -= entry_size
+        self.size = size
+
+    def lookup(self, key, start):
+        entry = self.get(key)
+        with self.lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.time_saved += entry[2] - (perf_counter() - start)
+        return entry
+
+    def generate(self, node, indent=2, compact=False, cache=None, profiler=None, fold=False, mangle=False):
+        """As :func:`jscodegen.generate`, with the code cached.
+
+        Hits do not reach the subtree cache or the profiler.  The digest of
+        a tree takes about as long as generating plain code from it, so for
+        trees loaded from JSON, :meth:`generate_json` saves far more.
+        """
+        from jscodegen import generate
+        start = perf_counter()
+        key = self.key(node, "code", 0 if compact else indent, compact, fold, mangle)
+        entry = self.lookup(key, start)
+        if entry is not None:
+            return entry[0]
+        start = perf_counter()
+        code = generate(node, indent, compact, cache, profiler, fold, mangle)
+        if code is not None:
+            self.put(key, code, None, perf_counter() - start)
+        return code
+
+    def generate_json(self, source, indent=2, compact=False, cache=None, profiler=None, fold=False, mangle=False):
+        """Return the code of :func:`jscodegen.generate_json_iter`, cached.
+
+        The key is a digest of the JSON text of source, a path or bytes,
+        which takes a fraction of the time the digest of a tree does, and
+        hits do not parse it at all.
+        """
+        from jscodegen import generate_json_iter
+        start = perf_counter()
+        with json_buffer(source) as data:
+            key = self.content_key(blake2b(data, digest_size=16).digest(),
+                                   ("json", 0 if compact else indent, compact, fold, mangle))
+            entry = self.lookup(key, start)
+            if entry is not None:
+                return entry[0]
+            start = perf_counter()
+            code = "".join(generate_json_iter(data, indent, None, compact, cache, profiler, fold, mangle))
+        self.put(key, code, None, perf_counter() - start)
+        return code
+
+    def generate_with_source_map(self, node, indent=2, compact=False, file=None, source=None, source_content=None):
+        """As :func:`jscodegen.generate_with_source_map`, with the code and
+        the source map cached."""
+        from jscodegen import generate_with_source_map
+        start = perf_counter()
+        key = self.key(node, "map", 0 if compact else indent, compact, file, source, source_content)
+        entry = self.lookup(key, start)
+        if entry is not None:
+            return entry[0], entry[1]
+        start = perf_counter()
+        code, source_map = generate_with_source_map(node, indent, compact, file, source, source_content)
+        self.put(key, code, source_map, perf_counter() - start)
+        return code, source_map
+
+    def cache_info(self):
+        size = sum(entry[1] for entry in self.entries())
+        return DiskCacheInfo(self.hits, self.misses, self.time_saved, self.maxsize, size)
+
+    def clear(self):
+        """Remove every entry and reset the counts."""
+        with self.lock:
+            for mtime, size, path in self.entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+            self.time_saved = 0.0
@@ -0,0 +1,95 @@
+from functools import partial
+
+
+def ignore():
+    pass
+
+
+class Emitter:
+    """Output buffer shared by all handlers of one generation run.
+
+    Line breaks are separate parts, so a parent can take back the trailing
+    line break of a child with :meth:`drop` instead of slicing strings.
+    """
+
+    def __init__(self):
+        self.parts = []
+        self.write = self.parts.append
+
+    def drop(self, char):
+        """Remove char from the end of the output if it is there."""
+        parts = self.parts
+        if parts:
+            last = parts[-1]
+            if last == char:
+                parts.pop()
+            elif last[-1:] == char:
+                parts[-1] = last[:-1]
+
+    def take(self):
+        """Remove and return the output so far, except for the last part.
+
+        The last part stays buffered because a later :meth:`drop` may still
+        shorten it.
+        """
+        parts = self.parts
+        text = "".join(parts[:-1])
+        del parts[:-1]
+        return text
+
+    def getvalue(self):
+        return "".join(self.parts)
+
+
+class Schedule:
+    """Handler-side view of an :class:`Emitter` used by the work-list engine.
+
+    Handlers append to ``frame`` instead of the emitter.  The engine moves
+    the frame to the emitter once the handler it dispatched returns, so
+    writes interleave correctly with child nodes that were *deferred* onto
+    the work-list rather than generated inline.  Deferred nodes and
+    operations that need the emitter are recorded in ``marks``.
+
+    Indentation is tracked here, at scheduling time, so indent strings are
+    plain writes.
+    """
+
+    def __init__(self, emitter, space=" ", newline="\n"):
+        self.emitter = emitter
+        self.frame = []
+        self.marks = []
+        self.space = space
+        self.indentation = 0
+        self.write = self.frame.append
+        if newline:
+            self.newline = partial(self.frame.append, newline)
+            self.drop_newline = partial(self.drop, newline)
+        else:
+            self.newline = self.drop_newline = ignore
+
+    def defer(self, item):
+        self.marks.append(len(self.frame))
+        self.frame.append(item)
+
+    def drop(self, char):
+        frame = self.frame
+        if not frame:
+            self.emitter.drop(char)
+            return
+        last = frame[-1]
+        if last.__class__ is not str:
+            self.defer(partial(self.emitter.drop, char))
+        elif last == char:
+            frame.pop()
+        elif last[-1:] == char:
+            frame[-1] = last[:-1]
+
+    def indent(self, amount):
+        self.indentation += amount
+
+    def dedent(self, amount):
+        self.indentation -= amount
+
+    def write_indent(self):
+        if self.indentation:
+            self.frame.append(self.indentation * self.space)
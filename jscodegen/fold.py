@@ -0,0 +1,478 @@
+import math
+
+from jscodegen.literals import number_literal, string_literal
+from jscodegen.nodes import fields, has_fields
+from jscodegen.slotted import FIELDS
+
+# Statements removed by folding, which are left out of statement lists
+DROP = object()
+UNKNOWN = object()
+
+# JavaScript numbers are doubles, so larger integers may not be what they
+# seem once converted
+MAX_SAFE_INTEGER = 2 ** 53
+
+EMPTY = {"type": "EmptyStatement"}
+
+SCALARS = (str, int, float, bool)
+EXPRESSION_TYPES = ("BinaryExpression", "LogicalExpression", "UnaryExpression")
+BRANCH_TYPES = ("IfStatement", "ConditionalExpression")
+FOLDED_TYPES = EXPRESSION_TYPES + BRANCH_TYPES
+
+# The field whose code the code of a node starts with
+LEADING_FIELDS = {
+    "CallExpression": "callee",
+    "MemberExpression": "object",
+    "BinaryExpression": "left",
+    "LogicalExpression": "left",
+    "ConditionalExpression": "test",
+    "AssignmentExpression": "left",
+    "SequenceExpression": "expressions",
+    "TaggedTemplateExpression": "tag",
+}
+
+# Expressions that a statement cannot start with, as it would be read as a
+# declaration or a block
+DECLARATION_STARTS = ("FunctionExpression", "ClassExpression", "ObjectExpression")
+
+# The fields that may hold nodes, for the node types known to have no others
+CHILD_FIELDS = {node_type: tuple(name for name in names if name not in (
+    "operator", "name", "raw", "regex", "computed", "kind", "method", "shorthand", "prefix", "generator", "async",
+    "sourceType", "directive", "each")) for node_type, names in FIELDS.items()}
+# The value of a literal is a scalar, or the compiled pattern of a regex
+CHILD_FIELDS["Literal"] = ()
+
+
+def js_type(value):
+    if value is None:
+        return "null"
+    if value.__class__ is bool:
+        return "boolean"
+    if value.__class__ is str:
+        return "string"
+    return "number"
+
+
+def truthy(value):
+    if value.__class__ is float:
+        return value == value and value != 0
+    return bool(value)
+
+
+def to_int32(value):
+    value = int(value) & 0xFFFFFFFF
+    return value - 0x100000000 if value & 0x80000000 else value
+
+
+def to_string(value):
+    if value is None:
+        return "null"
+    if value.__class__ is bool:
+        return "true" if value else "false"
+    if value.__class__ is str:
+        return value
+    if value == 0:
+        return "0"
+    return number_literal(value)
+
+
+def size(value):
+    """Return the length of the code for a constant, in compact output."""
+    if value.__class__ is str:
+        return len(string_literal(value))
+    if value is None or value is True:
+        return 4
+    if value is False:
+        return 5
+    if value < 0 or value == 0 and math.copysign(1, value) < 0:
+        return 1 + len(number_literal(-value, True))
+    return len(number_literal(value, True))
+
+
+def binary(operator, left, right):
+    """Return the value of a binary operation on constants, or UNKNOWN."""
+    left_type = js_type(left)
+    right_type = js_type(right)
+    if operator == "+" and (left_type == "string" or right_type == "string"):
+        return to_string(left) + to_string(right)
+    if operator in ("===", "!=="):
+        equal = left_type == right_type and left == right
+        return equal if operator == "===" else not equal
+    if operator in ("==", "!="):
+        # Operands of different types are converted first
+        if left_type != right_type:
+            return UNKNOWN
+        return (left == right) == (operator == "==")
+    if operator in ("<", ">", "<=", ">=") and left_type == right_type == "string":
+        # Strings compare by UTF-16 code units, which only agrees with code
+        # points below the surrogates
+        if max(left + right, default="\0") >= "\ud800":
+            return UNKNOWN
+    elif left_type != "number" or right_type != "number":
+        return UNKNOWN
+    if operator == "+":
+        return float(left) + right
+    if operator == "-":
+        return float(left) - right
+    if operator == "*":
+        return float(left) * right
+    if operator == "/":
+        return float(left) / right if right else UNKNOWN
+    if operator == "%":
+        return math.fmod(left, right) if right else UNKNOWN
+    if operator == "<":
+        return left < right
+    if operator == ">":
+        return left > right
+    if operator == "<=":
+        return left <= right
+    if operator == ">=":
+        return left >= right
+    if not math.isfinite(left) or not math.isfinite(right):
+        return UNKNOWN
+    if operator == "&":
+        return to_int32(left) & to_int32(right)
+    if operator == "|":
+        return to_int32(left) | to_int32(right)
+    if operator == "^":
+        return to_int32(left) ^ to_int32(right)
+    if operator == "<<":
+        return to_int32(to_int32(left) << (int(right) & 31))
+    if operator == ">>":
+        return to_int32(left) >> (int(right) & 31)
+    if operator == ">>>":
+        return (int(left) & 0xFFFFFFFF) >> (int(right) & 31)
+    return UNKNOWN
+
+
+def unary(operator, value):
+    """Return the value of a unary operation on a constant, or UNKNOWN."""
+    if operator == "!":
+        return not truthy(value)
+    if operator == "typeof":
+        return "object" if value is None else js_type(value)
+    if js_type(value) != "number":
+        return UNKNOWN
+    if operator == "-":
+        return -float(value) if value == 0 else -value
+    if operator == "+":
+        return value
+    if operator == "~" and math.isfinite(value):
+        return ~to_int32(value)
+    return UNKNOWN
+
+
+def normalize(value):
+    """Return numbers as ints where they are whole, as JSON trees have them."""
+    if value.__class__ is float and value.is_integer() and abs(value) < MAX_SAFE_INTEGER and \
+            math.copysign(1, value) > 0:
+        return int(value)
+    return value
+
+
+def constant_node(value):
+    """Return a node for a constant, negative numbers as parsers write them."""
+    if value.__class__ in (int, float) and value.__class__ is not bool and \
+            (value < 0 or value == 0 and math.copysign(1, value) < 0):
+        return {"type": "UnaryExpression", "operator": "-", "prefix": True,
+                "argument": {"type": "Literal", "value": normalize(-value)}}
+    return {"type": "Literal", "value": normalize(value)}
+
+
+def hoisted_names(node):
+    """Return the names a statement declares with var or function, outside
+    nested functions, or None if it declares patterns."""
+    names = []
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node.__class__ is list:
+            stack.extend(reversed(node))
+            continue
+        if node.__class__ in (str, int, float, bool) or node is None or not has_fields(node):
+            continue
+        data = fields(node)
+        node_type = data.get("type")
+        if node_type is None:
+            continue
+        if node_type == "FunctionDeclaration":
+            names.append(fields(data["id"])["name"])
+            continue
+        if node_type in ("FunctionExpression", "ArrowFunctionExpression"):
+            continue
+        if node_type == "VariableDeclaration" and data["kind"] == "var":
+            for declarator in data["declarations"]:
+                target = fields(fields(declarator)["id"])
+                if target["type"] != "Identifier":
+                    return None
+                names.append(target["name"])
+        stack.extend(value for key, value in reversed(list(data.items()))
+                     if key not in ("loc", "range") and value.__class__ not in (str, int, float, bool))
+    return names
+
+
+class Folder:
+    """Folds constant expressions and drops branches that cannot run.
+
+    Folding works bottom-up on a copy of the parts of the tree that change;
+    the input is not modified, and unchanged subtrees are shared with the
+    result.  Constant expressions are replaced by their value where that
+    is no longer, as in compact output, and otherwise only used to decide
+    branches, so ``1 / 3`` stays as it is but ``if (1 / 3)`` is folded.
+    """
+
+    def __init__(self):
+        # Values of constant expressions by node id, with the node, to keep
+        # its id from being reused, and the length of its code
+        self.constants = {}
+        self.folded = 0
+        self.dropped = 0
+
+    def constant(self, node):
+        entry = self.constants.get(id(node))
+        if entry is not None:
+            return entry[1], entry[2]
+        data = fields(node)
+        if data["type"] == "UnaryExpression" and data["operator"] == "-":
+            # Negative numbers, as folding and parsers write them
+            value, argument_size = self.constant(data["argument"])
+            if value is UNKNOWN or js_type(value) != "number":
+                return UNKNOWN, 0
+            return unary("-", value), 1 + argument_size
+        if data["type"] != "Literal" or data.get("regex") or data.get("bigint"):
+            return UNKNOWN, 0
+        value = data.get("value")
+        if value.__class__ not in (str, int, float, bool) and value is not None:
+            return UNKNOWN, 0
+        if value.__class__ is int and abs(value) >= MAX_SAFE_INTEGER:
+            return UNKNOWN, 0
+        return value, size(value)
+
+    def fold(self, tree):
+        """Return the folded tree."""
+        # Each node, its fields and the names and values of the fields that
+        # hold nodes, parents before children.  Nodes without any are only
+        # listed if they may fold themselves.  Flat lists keep the number of
+        # objects the garbage collector has to track down.
+        order = []
+        stack = [tree]
+        is_node = self.is_node
+        while stack:
+            node = stack.pop()
+            data = node if node.__class__ is dict else fields(node)
+            slots = None
+            names = CHILD_FIELDS.get(data["type"])
+            if names is None:
+                names = [key for key, value in data.items() if key != "loc" and (
+                    value.__class__ is list or value.__class__ not in SCALARS and is_node(value))]
+            for key in names:
+                value = data.get(key)
+                if value is None:
+                    continue
+                if value.__class__ is list:
+                    before = len(stack)
+                    stack.extend(item for item in value if item is not None and is_node(item))
+                    if len(stack) == before:
+                        continue
+                elif value.__class__ in SCALARS or not is_node(value):
+                    continue
+                else:
+                    stack.append(value)
+                if slots is None:
+                    slots = [key, value]
+                else:
+                    slots += (key, value)
+            if slots is not None or data["type"] in FOLDED_TYPES:
+                order += (node, data, slots)
+        # What each node changed to, for those that did
+        results = {}
+        simplify = self.simplify
+        for i in range(len(order) - 3, -1, -3):
+            node = order[i]
+            new = simplify(node, order[i + 1], order[i + 2], results)
+            if new is not node:
+                results[id(node)] = new
+        result = results.get(id(tree), tree)
+        self.constants.clear()
+        return EMPTY if result is DROP else result
+
+    @staticmethod
+    def is_node(value):
+        if value.__class__ is dict:
+            return "type" in value
+        if value is None or value.__class__ in SCALARS or not has_fields(value):
+            return False
+        return "type" in fields(value)
+
+    def simplify(self, node, data, slots, results):
+        changed = None
+        for i in range(0, len(slots) if slots else 0, 2):
+            key = slots[i]
+            value = slots[i + 1]
+            if value.__class__ is list:
+                if any(id(item) in results for item in value):
+                    items = [results.get(id(item), item) for item in value]
+                    changed = changed or {}
+                    changed[key] = self.statements(items)
+            else:
+                new = results.get(id(value))
+                if new is not None:
+                    changed = changed or {}
+                    changed[key] = EMPTY if new is DROP else new
+        node_type = data["type"]
+        if changed:
+            copy = dict(data.items())
+            copy["type"] = node_type
+            for key, new in changed.items():
+                old = data[key]
+                if (key == "callee" and node_type == "CallExpression" or key == "tag" or
+                        key == "argument" and data.get("operator") == "delete") and fields(old)["type"] in (
+                        "LogicalExpression", "ConditionalExpression") and fields(new)["type"] in (
+                        "MemberExpression", "Identifier"):
+                    # Calls and delete bind to what was a plain value before
+                    new = {"type": "SequenceExpression", "expressions": [{"type": "Literal", "value": 0}, new]}
+                elif key == "expression" and node_type == "ExpressionStatement" and \
+                        leading_type(new) in DECLARATION_STARTS and leading_type(old) not in DECLARATION_STARTS:
+                    # Not to start the statement with function or {
+                    new = {"type": "SequenceExpression", "expressions": [{"type": "Literal", "value": 0}, new]}
+                elif key == "body" and node_type == "ArrowFunctionExpression" and \
+                        leading_type(new) == "ObjectExpression" and leading_type(old) != "ObjectExpression":
+                    # Not to have the object read as the block of the function
+                    new = old
+                elif key == "consequent" and node_type == "IfStatement" and data.get("alternate") and \
+                        fields(new)["type"] != "BlockStatement":
+                    # Not to take over the else of this statement
+                    new = {"type": "BlockStatement", "body": [new]}
+                copy[key] = new
+            node = copy
+            data = node
+        if node_type in EXPRESSION_TYPES:
+            return self.expression(node, data)
+        if node_type in BRANCH_TYPES:
+            return self.branch(node, data)
+        return node
+
+    @staticmethod
+    def statements(items):
+        """Leave dropped statements out of a list, unless that would make a
+        later string statement part of a directive prologue."""
+        if DROP not in items:
+            return items
+        result = []
+        for i, item in enumerate(items):
+            if item is not DROP:
+                result.append(item)
+                continue
+            following = next((later for later in items[i + 1:] if later is not DROP), None)
+            if following is not None and all(is_directive(stmt) for stmt in result) and is_directive(following):
+                result.append(EMPTY)
+        return result
+
+    def expression(self, node, data):
+        node_type = data["type"]
+        if node_type == "UnaryExpression":
+            value, old_size = self.constant(data["argument"])
+            if value is UNKNOWN or data["operator"] == "-" and fields(data["argument"])["type"] == "Literal":
+                return node
+            old_size += len(data["operator"])
+            result = unary(data["operator"], value)
+        elif node_type == "LogicalExpression":
+            value, _ = self.constant(data["left"])
+            if value is UNKNOWN:
+                return node
+            operator = data["operator"]
+            if operator == "??":
+                take_left = value is not None
+            else:
+                take_left = truthy(value) == (operator == "||")
+            self.folded += 1
+            return data["left"] if take_left else data["right"]
+        else:
+            left, left_size = self.constant(data["left"])
+            right, right_size = self.constant(data["right"])
+            if left is UNKNOWN or right is UNKNOWN:
+                return node
+            old_size = left_size + len(data["operator"]) + right_size
+            result = binary(data["operator"], left, right)
+        if result is UNKNOWN or result.__class__ is float and not math.isfinite(result):
+            return node
+        new_size = size(result)
+        if new_size > old_size:
+            self.constants[id(node)] = (node, result, old_size)
+            return node
+        self.folded += 1
+        return constant_node(result)
+
+    def branch(self, node, data):
+        value, _ = self.constant(data["test"])
+        if value is UNKNOWN:
+            return node
+        self.dropped += 1
+        taken, dropped = ("consequent", "alternate") if truthy(value) else ("alternate", "consequent")
+        if data["type"] == "ConditionalExpression":
+            return data[taken]
+        chosen = data.get(taken)
+        names = hoisted_names(data.get(dropped)) if data.get(dropped) else []
+        if names is None:
+            # Declarations of patterns are kept as they are
+            self.dropped -= 1
+            return node
+        if names:
+            declaration = {"type": "VariableDeclaration", "kind": "var", "declarations": [
+                {"type": "VariableDeclarator", "id": {"type": "Identifier", "name": name}, "init": None}
+                for name in dict.fromkeys(names)]}
+            if chosen is None:
+                return declaration
+            return {"type": "BlockStatement", "body": [chosen, declaration]}
+        return DROP if chosen is None else chosen
+
+
+def leading_type(node):
+    """Return the type of the node that the code of node starts with."""
+    while True:
+        data = fields(node)
+        field = LEADING_FIELDS.get(data["type"])
+        if field is None and data["type"] == "UpdateExpression" and not data["prefix"]:
+            field = "argument"
+        if field is None:
+            return data["type"]
+        node = data[field][0] if field == "expressions" else data[field]
+
+
+def is_directive(stmt):
+    data = fields(stmt)
+    if data["type"] != "ExpressionStatement":
+        return False
+    expression = fields(data["expression"])
+    return expression["type"] == "Literal" and expression.get("value").__class__ is str
+
+
+def fold_constants(tree):
+    """Return tree with constant expressions folded and dead branches removed.
+
+    The tree is not modified; the result shares its unchanged subtrees.
+    """
+    return Folder().fold(tree)
+
+
+def fold_statements(statements):
+    """Fold the statements of a Program body one at a time, as
+    :func:`fold_constants` folds them in the Program: those that fold away
+    are left out, unless that would make a later string statement part of
+    a directive prologue."""
+    folder = Folder()
+    # Whether the statements so far are all directives, and whether one was
+    # dropped after them
+    prologue = True
+    dropped = False
+    for stmt in statements:
+        stmt = folder.fold(stmt)
+        if stmt is EMPTY:
+            dropped = prologue
+            continue
+        if dropped and is_directive(stmt):
+            yield EMPTY
+            prologue = False
+        dropped = False
+        prologue = prologue and is_directive(stmt)
+        yield stmt
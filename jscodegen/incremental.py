@@ -0,0 +1,81 @@
+from collections import namedtuple
+from difflib import SequenceMatcher
+
+from jscodegen.cache import fingerprint
+from jscodegen.nodes import fields
+
+# Byte range [old_start, old_end) of the previous output that was replaced
+# by [new_start, new_end) of the new one, in UTF-8.
+Edit = namedtuple("Edit", ["old_start", "old_end", "new_start", "new_end"])
+
+
+class IncrementalGenerator:
+    """Regenerates a Program, reusing the code of unchanged statements.
+
+    The code of each top-level statement is kept between calls to
+    :meth:`update`.  A statement is unchanged if it is the same node as
+    before, and also has the same value in its version field if version is
+    given; with structural, if it has the same structure.  Identity and
+    version stamps assume that statements are replaced or restamped, not
+    modified in place.
+    """
+
+    def __init__(self, indent=2, compact=False, version=None, structural=False):
+        from jscodegen import CodeGenerator, CompactCodeGenerator
+        self.generator = CompactCodeGenerator() if compact else CodeGenerator(indent)
+        self.version = version
+        self.structural = structural
+        # (key, statement, code, UTF-8 length) per top-level statement
+        self.entries = []
+        self.rendered = 0
+
+    def key(self, stmt):
+        if self.structural:
+            return fingerprint(stmt)
+        if self.version is not None:
+            return id(stmt), fields(stmt).get(self.version)
+        return id(stmt)
+
+    def render(self, key, stmt):
+        code = "".join(self.generator.generate_iter({"type": "Program", "body": [stmt]}, None))
+        self.rendered += 1
+        return key, stmt, code, len(code.encode("utf-8"))
+
+    def update(self, program):
+        """Generate code for program and return it with a list of edits.
+
+        The edits are the byte ranges that differ from the output of the
+        previous call, in order.
+        """
+        old = self.entries
+        body = fields(program)['body']
+        keys = [self.key(stmt) for stmt in body]
+        reusable = {entry[0]: entry for entry in old}
+        matcher = SequenceMatcher(None, [entry[0] for entry in old], keys, autojunk=False)
+        entries = []
+        edits = []
+        self.rendered = 0
+        old_offset = new_offset = 0
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                for entry in old[i1:i2]:
+                    entries.append(entry)
+                    old_offset += entry[3]
+                    new_offset += entry[3]
+                continue
+            removed = old[i1:i2]
+            added = []
+            for key, stmt in zip(keys[j1:j2], body[j1:j2]):
+                entry = reusable.get(key)
+                if entry is None:
+                    entry = self.render(key, stmt)
+                added.append(entry)
+            entries.extend(added)
+            old_end = old_offset + sum(entry[3] for entry in removed)
+            new_end = new_offset + sum(entry[3] for entry in added)
+            # Statements may be rendered again to the same code
+            if "".join(entry[2] for entry in removed) != "".join(entry[2] for entry in added):
+                edits.append(Edit(old_offset, old_end, new_offset, new_end))
+            old_offset, new_offset = old_end, new_end
+        self.entries = entries
+        return "".join(entry[2] for entry in entries), edits
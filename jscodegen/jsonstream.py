@@ -0,0 +1,118 @@
+import codecs
+import json
+import mmap
+import os
+import re
+from contextlib import contextmanager
+
+# Bytes of input decoded at a time, at least; values that do not fit are
+# decoded in windows of twice the size until they do.
+CHUNK_SIZE = 1024 * 1024
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+@contextmanager
+def json_buffer(source):
+    """Yield the bytes of source, a path that is memory-mapped or a bytes-like object."""
+    if not isinstance(source, (str, os.PathLike)):
+        yield source
+        return
+    with open(source, "rb") as fp:
+        if not os.fstat(fp.fileno()).st_size:
+            yield b""
+            return
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield data
+
+
+class JSONReader:
+    """Reads JSON values one at a time from a window of UTF-8 bytes.
+
+    Only the text between the last value read and the end of the window
+    is held, so reading the elements of an array one by one takes memory
+    for the largest of them rather than for the array.
+    """
+
+    def __init__(self, data, chunk_size=CHUNK_SIZE):
+        self.data = data
+        self.chunk_size = chunk_size
+        self.offset = 0
+        self.utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.raw_decode = json.JSONDecoder().raw_decode
+
+    def more(self):
+        """Decode more of the input, and return whether there was any."""
+        if self.offset >= len(self.data):
+            return False
+        rest = self.text[self.pos:]
+        size = max(self.chunk_size, len(rest))
+        chunk = self.data[self.offset:self.offset + size]
+        self.offset += len(chunk)
+        self.text = rest + self.utf8.decode(chunk, self.offset >= len(self.data))
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            self.pos = WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text) or not self.more():
+                return self.text[self.pos:self.pos + 1]
+
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError("Expecting one of %r" % chars, self.text, self.pos)
+        self.pos += 1
+        return char
+
+    def value(self):
+        while True:
+            self.peek()
+            try:
+                value, end = self.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                # Values cut off at the end of the window are incomplete
+                if self.more():
+                    continue
+                raise
+            # A number at the end of the window may go on after it
+            if end == len(self.text) and self.more():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_statements(source, chunk_size=CHUNK_SIZE):
+    """Yield the statements of the ESTree Program in source one at a time.
+
+    source is the path of a JSON file, which is memory-mapped, or a
+    bytes-like object.  Members of the Program other than its body are read
+    and dropped.
+    """
+    with json_buffer(source) as data:
+        reader = JSONReader(data, chunk_size)
+        reader.expect("{")
+        if reader.peek() == "}":
+            return
+        while True:
+            key = reader.value()
+            reader.expect(":")
+            if key == "body":
+                reader.expect("[")
+                if reader.peek() == "]":
+                    reader.pos += 1
+                else:
+                    while True:
+                        yield reader.value()
+                        if reader.expect(",]") == "]":
+                            break
+            else:
+                value = reader.value()
+                if key == "type" and value != "Program":
+                    raise ValueError("expected a Program, not %r" % (value,))
+            if reader.expect(",}") == "}":
+                return
+
@@ -0,0 +1,86 @@
+from json.encoder import encode_basestring_ascii as escape
+
+
+def string_literal(value):
+    """Return value as a JavaScript string literal.
+
+    The literal is ASCII, as from json.dumps, and in the quotes that need
+    fewer escapes, double quotes if it is a tie.
+    """
+    if '"' not in value or value.count('"') <= value.count("'"):
+        return escape(value)
+    # JSON escapes double quotes only, and every one of them, so \\" is
+    # always an escaped quote
+    return "'" + escape(value)[1:-1].replace('\\"', '"').replace("'", "\\'") + "'"
+
+
+def decimal_digits(value):
+    """Return the shortest digits of a positive finite number and the
+    position of the decimal point relative to them."""
+    if value.__class__ is int:
+        digits = str(value)
+        point = len(digits)
+    else:
+        # repr gives the shortest digits that read back as the same float
+        mantissa, _, exponent = repr(value).partition("e")
+        integer, _, fraction = mantissa.partition(".")
+        digits = (integer + fraction).lstrip("0")
+        leading_zeros = len(integer) + len(fraction) - len(digits)
+        point = len(integer) - leading_zeros + int(exponent or 0)
+    return digits.rstrip("0"), point
+
+
+def number_literal(value, shortest=False):
+    """Return a number as JavaScript.
+
+    By default the number is written as Number.prototype.toString does;
+    with shortest, in the fewest characters, such as ``1e6`` and ``.5``.
+    """
+    # Fast paths: str and repr agree with JavaScript for integers below
+    # 1e21 and for floats without an exponent, but for a trailing .0
+    if value.__class__ is int:
+        if 0 <= value < 1e21 and (not shortest or value % 1000):
+            return str(value)
+    elif 0 < value < 1e16:
+        text = repr(value)
+        if "e" not in text:
+            if text[-2:] == ".0":
+                text = text[:-2]
+                if not shortest or text[-3:] != "000":
+                    return text
+            elif not shortest or text[0] != "0":
+                return text
+            elif text[2:4] != "00":
+                return text[1:]
+    elif not shortest and (0 < value < 1e-6 or 1e21 <= value < float("inf")):
+        # Both write these with an exponent, which has no leading zeros
+        # and an explicit sign in JavaScript
+        mantissa, _, exponent = repr(value).partition("e")
+        return mantissa + "e" + exponent[0] + exponent[1:].lstrip("0")
+    if value != value:
+        return "NaN"
+    if value < 0 or value == 0 and str(value)[0] == "-":
+        return "-" + number_literal(-value, shortest)
+    if value == float("inf"):
+        return "Infinity"
+    if not value:
+        return "0"
+    digits, point = decimal_digits(value)
+    length = len(digits)
+    if shortest:
+        if point <= 0:
+            decimal = "." + "0" * -point + digits
+        elif point < length:
+            decimal = digits[:point] + "." + digits[point:]
+        else:
+            decimal = digits + "0" * (point - length)
+        scientific = digits + "e" + str(point - length)
+        return scientific if len(scientific) < len(decimal) else decimal
+    if length <= point <= 21:
+        return digits + "0" * (point - length)
+    if 0 < point <= 21:
+        return digits[:point] + "." + digits[point:]
+    if -6 < point <= 0:
+        return "0." + "0" * -point + digits
+    exponent = point - 1
+    return digits[0] + ("." + digits[1:] if length > 1 else "") + "e" + ("+" if exponent > 0 else "-") + str(abs(exponent))
@@ -0,0 +1,390 @@
+from itertools import count, product
+
+from jscodegen.fold import CHILD_FIELDS
+from jscodegen.nodes import fields, has_fields
+
+FIRST_CHARACTERS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_$"
+CHARACTERS = FIRST_CHARACTERS + "0123456789"
+
+# Names a binding may not have, or that mean something without one
+RESERVED = frozenset((
+    "await", "break", "case", "catch", "class", "const", "continue", "debugger", "default", "delete", "do",
+    "else", "enum", "export", "extends", "false", "finally", "for", "function", "if", "implements", "import",
+    "in", "instanceof", "interface", "let", "new", "null", "package", "private", "protected", "public",
+    "return", "static", "super", "switch", "this", "throw", "true", "try", "typeof", "var", "void", "while",
+    "with", "yield", "arguments", "eval", "undefined", "NaN", "Infinity"))
+
+FUNCTION_TYPES = ("FunctionDeclaration", "FunctionExpression", "ArrowFunctionExpression")
+
+# How the identifiers below a node are used
+REFERENCE = 0
+VAR = 1
+LEXICAL = 2
+KEY = 3
+# A block that shares the scope of its function or catch clause
+SHARED = 4
+
+# Events of the first pass, replayed to resolve references
+ENTER = 0
+EXIT = 1
+USE = 2
+WITH = 3
+EVAL = 4
+
+
+def short_names():
+    """Yield identifiers from the shortest up."""
+    for length in count(1):
+        for first in FIRST_CHARACTERS:
+            for rest in product(CHARACTERS, repeat=length - 1):
+                yield first + "".join(rest)
+
+
+class Binding:
+    __slots__ = ("name", "frozen", "uses")
+
+    def __init__(self, name):
+        self.name = name
+        self.frozen = False
+        # Where the name is used, as (id of the parent, field, index)
+        self.uses = []
+
+
+class Scope:
+    __slots__ = ("parent", "function", "bindings", "dynamic", "next")
+
+    def __init__(self, parent, function=False):
+        self.parent = parent
+        # The scope var declarations go to
+        self.function = self if function or parent is None else parent.function
+        self.bindings = {}
+        # Set when eval may reach the bindings by name
+        self.dynamic = False
+        # The index of the first name the scopes below may take
+        self.next = 0
+
+    def declare(self, name, frozen=False):
+        binding = self.bindings.get(name)
+        if binding is None:
+            binding = self.bindings[name] = Binding(name)
+        if frozen:
+            binding.frozen = True
+        return binding
+
+
+def is_lexical(stmt):
+    data = fields(stmt)
+    return data["type"] == "FunctionDeclaration" or data["type"] == "VariableDeclaration" and data["kind"] != "var"
+
+
+class Mangler:
+    """Renames the local variables and parameters of functions to the
+    shortest names that are free.
+
+    Bindings of the global scope, of scopes a direct ``eval`` can see, the
+    names used in ``with`` statements and the names of functions keep their
+    names, as do names used in node types the mangler does not know.
+    Names are picked so that no renamed binding shadows another one or
+    takes the name of one that is kept, which needs one pass over the tree
+    to find the bindings and one over the uses of names.  The tree is not
+    modified; the result shares the subtrees without renamed identifiers.
+    """
+
+    def __init__(self):
+        self.renamed = 0
+        # Characters saved in identifiers, before shorthand properties
+        # are written out
+        self.saved = 0
+
+    def mangle(self, tree, kept=()):
+        """Return the tree with local names shortened, and none renamed to
+        one of the names in kept."""
+        order, events, scopes, opaque = self.scan(tree)
+        self.resolve(events, scopes, opaque)
+        self.kept.update(kept)
+        renames = self.assign(scopes)
+        return self.rewrite(tree, order, renames)
+
+    def kept_names(self, tree):
+        """Return the names that mangling tree keeps and that no binding is
+        renamed to.
+
+        Those of a program are those of its statements together, so a
+        program can be mangled one statement at a time, with the same
+        result, by passing them as kept.
+        """
+        order, events, scopes, opaque = self.scan(tree)
+        self.resolve(events, scopes, opaque)
+        return self.kept
+
+    def scan(self, tree):
+        """Find the scopes and bindings of tree, and where names are used.
+
+        Returns the nodes with children, parents first, the events that
+        resolve replays, the scopes and the names used where the mangler
+        cannot tell what they refer to.
+        """
+        root = Scope(None)
+        scopes = [root]
+        events = [(ENTER, root)]
+        # Names used where the mangler cannot tell what they refer to
+        opaque = set()
+        # Each node with its fields and the names of the fields that hold
+        # nodes, parents before children
+        order = []
+        stack = [(tree, None, None, -1, root, REFERENCE)]
+        while stack:
+            node, parent, key, index, scope, role = stack.pop()
+            if node is None:
+                # The start or end of a scope or a with statement
+                events.append(scope)
+                continue
+            data = fields(node)
+            node_type = data["type"]
+            if node_type == "Identifier":
+                if role != KEY:
+                    name = data["name"]
+                    target = None
+                    if role == VAR:
+                        target = scope.function.declare(name)
+                    elif role == LEXICAL:
+                        scope.declare(name)
+                    events.append((USE, name, (id(parent), key, index), target))
+                continue
+            names = CHILD_FIELDS.get(node_type)
+            if names is None:
+                self.collect_names(node, opaque)
+                continue
+            # The fields in the order they are evaluated, with how they use
+            # names and in which scope, and the events between them
+            if node_type in FUNCTION_TYPES:
+                inner = Scope(scope, True)
+                scopes.append(inner)
+                identifier = data.get("id")
+                if identifier is not None:
+                    name = fields(identifier)["name"]
+                    if node_type == "FunctionDeclaration":
+                        # Functions in blocks are also visible in the
+                        # function, as in sloppy mode
+                        scope.declare(name, True)
+                        scope.function.declare(name, True)
+                    else:
+                        inner.declare(name, True)
+                body_role = SHARED if fields(data["body"])["type"] == "BlockStatement" else REFERENCE
+                children = ((ENTER, inner), ("params", LEXICAL, inner), ("body", body_role, inner), (EXIT, inner))
+            elif node_type == "BlockStatement":
+                children = (("body", REFERENCE, scope),)
+                if role != SHARED and any(is_lexical(stmt) for stmt in data["body"]):
+                    inner = Scope(scope)
+                    scopes.append(inner)
+                    children = ((ENTER, inner), ("body", REFERENCE, inner), (EXIT, inner))
+            elif node_type == "SwitchStatement":
+                inner = scope
+                if any(is_lexical(stmt) for case in data["cases"] for stmt in fields(case)["consequent"]):
+                    inner = Scope(scope)
+                    scopes.append(inner)
+                children = (("discriminant", REFERENCE, scope), (ENTER, inner), ("cases", REFERENCE, inner),
+                            (EXIT, inner))
+            elif node_type == "ForStatement" or node_type == "ForInStatement":
+                inner = scope
+                declaration = data["init" if node_type == "ForStatement" else "left"]
+                if declaration is not None and is_lexical(declaration):
+                    inner = Scope(scope)
+                    scopes.append(inner)
+                children = ((ENTER, inner),) + tuple((name, REFERENCE, inner) for name in names) + ((EXIT, inner),)
+            elif node_type == "CatchClause":
+                inner = Scope(scope)
+                scopes.append(inner)
+                # The body shares the scope of the parameter
+                children = ((ENTER, inner), ("param", LEXICAL, inner), ("body", SHARED, inner), (EXIT, inner))
+            elif node_type == "WithStatement":
+                children = (("object", REFERENCE, scope), (WITH, 1), ("body", REFERENCE, scope), (WITH, -1))
+            elif node_type == "VariableDeclaration":
+                children = (("declarations", VAR if data["kind"] == "var" else LEXICAL, scope),)
+            elif node_type == "VariableDeclarator":
+                children = (("id", role, scope), ("init", REFERENCE, scope))
+            elif node_type == "ObjectPattern":
+                children = (("properties", role, scope),)
+            elif node_type == "Property":
+                children = (("key", REFERENCE if data.get("computed") else KEY, scope), ("value", role, scope))
+            elif node_type == "MemberExpression":
+                children = (("object", REFERENCE, scope),
+                            ("property", REFERENCE if data.get("computed") else KEY, scope))
+            elif node_type in ("LabeledStatement", "BreakStatement", "ContinueStatement"):
+                children = (("label", KEY, scope), ("body", REFERENCE, scope))
+            else:
+                if node_type == "CallExpression":
+                    callee = fields(data["callee"])
+                    if callee["type"] == "Identifier" and callee["name"] == "eval":
+                        events.append((EVAL,))
+                children = tuple((name, REFERENCE, scope) for name in names)
+            slots = []
+            for child in reversed(children):
+                if child[0].__class__ is int:
+                    if child[0] != ENTER and child[0] != EXIT or child[1] is not scope:
+                        stack.append((None, None, None, -1, child, None))
+                    continue
+                name, child_role, child_scope = child
+                value = data.get(name)
+                if value is None or value.__class__ in (str, int, float, bool):
+                    continue
+                if value.__class__ is not list and not has_fields(value):
+                    continue
+                slots.append(name)
+                if value.__class__ is list:
+                    for i in range(len(value) - 1, -1, -1):
+                        item = value[i]
+                        if item is not None:
+                            stack.append((item, node, name, i, child_scope, child_role))
+                else:
+                    stack.append((value, node, name, -1, child_scope, child_role))
+            if slots:
+                order.append((node, data, slots))
+        events.append((EXIT, root))
+        return order, events, scopes, opaque
+
+    @staticmethod
+    def collect_names(node, names):
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.__class__ is list:
+                stack.extend(node)
+                continue
+            if node is None or node.__class__ in (str, int, float, bool) or not has_fields(node):
+                continue
+            data = fields(node)
+            if data.get("type") == "Identifier":
+                names.add(data["name"])
+                continue
+            stack.extend(value for key, value in data.items() if key != "loc")
+
+    def resolve(self, events, scopes, opaque):
+        """Find the binding of every use of a name, and which bindings keep
+        their names."""
+        bindings = {}
+        chain = []
+        in_with = 0
+        # Names that renamed bindings may not take
+        self.kept = set(opaque)
+        kept = self.kept
+        for event in events:
+            kind = event[0]
+            if kind == USE:
+                name = event[1]
+                visible = bindings.get(name)
+                if not visible:
+                    kept.add(name)
+                    continue
+                binding = visible[-1]
+                target = event[3]
+                if target is not None and target is not binding:
+                    # A var declaration that assigns to a catch parameter
+                    target.frozen = binding.frozen = True
+                if in_with:
+                    binding.frozen = True
+                binding.uses.append(event[2])
+            elif kind == ENTER:
+                scope = event[1]
+                chain.append(scope)
+                for name, binding in scope.bindings.items():
+                    visible = bindings.get(name)
+                    if visible is None:
+                        bindings[name] = [binding]
+                    else:
+                        visible.append(binding)
+            elif kind == EXIT:
+                chain.pop()
+                for name in event[1].bindings:
+                    bindings[name].pop()
+            elif kind == WITH:
+                in_with += event[1]
+            else:
+                for scope in reversed(chain):
+                    if scope.dynamic:
+                        break
+                    scope.dynamic = True
+        scopes[0].dynamic = True
+        for scope in scopes:
+            for binding in scope.bindings.values():
+                if scope.dynamic or binding.name in opaque:
+                    binding.frozen = True
+                if binding.frozen:
+                    kept.add(binding.name)
+
+    def assign(self, scopes):
+        """Return the new name for each use of a renamed binding."""
+        names = []
+        candidates = short_names()
+        kept = self.kept
+        renames = {}
+        for scope in scopes:
+            first = 0 if scope.parent is None else scope.parent.next
+            bindings = sorted((binding for binding in scope.bindings.values() if not binding.frozen),
+                              key=lambda binding: -len(binding.uses))
+            for i, binding in enumerate(bindings, first):
+                while len(names) <= i:
+                    name = next(candidates)
+                    if name not in kept and name not in RESERVED:
+                        names.append(name)
+                name = names[i]
+                if name != binding.name:
+                    self.renamed += 1
+                    self.saved += (len(binding.name) - len(name)) * len(binding.uses)
+                    for use in binding.uses:
+                        renames[use] = name
+            scope.next = first + len(bindings)
+        return renames
+
+    @staticmethod
+    def rewrite(tree, order, renames):
+        if not renames:
+            return tree
+        results = {}
+        for i in range(len(order) - 1, -1, -1):
+            node, data, slots = order[i]
+            changed = None
+            node_id = id(node)
+            for key in slots:
+                value = data[key]
+                if value.__class__ is list:
+                    items = None
+                    for index, item in enumerate(value):
+                        new = renames.get((node_id, key, index))
+                        if new is not None:
+                            new = dict(fields(item).items(), type="Identifier", name=new)
+                        else:
+                            new = results.get(id(item))
+                        if new is not None:
+                            if items is None:
+                                items = list(value)
+                            items[index] = new
+                    if items is not None:
+                        changed = changed or {}
+                        changed[key] = items
+                    continue
+                new = renames.get((node_id, key, -1))
+                if new is not None:
+                    new = dict(fields(value).items(), type="Identifier", name=new)
+                else:
+                    new = results.get(id(value))
+                if new is not None:
+                    changed = changed or {}
+                    changed[key] = new
+            if changed:
+                copy = dict(data.items())
+                copy["type"] = data["type"]
+                copy.update(changed)
+                if data["type"] == "Property" and "value" in changed and data.get("shorthand"):
+                    copy["shorthand"] = False
+                results[node_id] = copy
+        return results.get(id(tree), tree)
+
+
+def mangle_names(tree, kept=()):
+    """Return tree with the local variables and parameters of functions
+    renamed to short names, none of them in kept.
+
+    The tree is not modified; the result shares its unchanged subtrees.
+    """
+    return Mangler().mangle(tree, kept)
@@ -0,0 +1,74 @@
+class Node:
+    """Base of slotted nodes, which are read like the dicts they replace.
+
+    Subclasses list their fields in ``_fields`` and ``__slots__``.  Only the
+    fields a node has are set, so ``in`` and ``get`` work as on a dict.
+    """
+    __slots__ = ()
+    _fields = ()
+
+    # Subscripts go straight to the slot descriptors, without a Python call
+    __getitem__ = object.__getattribute__
+    __setitem__ = object.__setattr__
+
+    def __contains__(self, key):
+        return hasattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def items(self):
+        return [(name, getattr(self, name)) for name in self._fields if hasattr(self, name)]
+
+    def __reduce__(self):
+        return make_node, (type(self).__name__, self._fields, "type" in type(self).__dict__, self.items())
+
+    def __repr__(self):
+        return "%s(%s)" % (type(self).__name__, ", ".join("%s=%r" % item for item in self.items()))
+
+
+# Slotted classes by name, field names and whether they are of a node type
+NODE_CLASSES = {}
+
+
+def node_class(name, names, typed=True):
+    """Return the slotted class with the given field names.
+
+    Classes of node types have a ``type`` of their name; others, such as
+    source locations, have none.
+    """
+    key = (name, names, typed)
+    cls = NODE_CLASSES.get(key)
+    if cls is None:
+        namespace = {"__slots__": names, "_fields": names}
+        if typed:
+            namespace["type"] = name
+        cls = NODE_CLASSES[key] = type(name, (Node,), namespace)
+    return cls
+
+
+def make_node(name, names, typed, items):
+    node = object.__new__(node_class(name, names, typed))
+    for key, value in items:
+        node[key] = value
+    return node
+
+
+def fields(node):
+    """Return the fields of an ESTree node as a mapping.
+
+    Dicts and slotted :class:`Node` objects are used as they are.  Other
+    node objects, such as those esprima-python parses to, are read through
+    their attribute dict, which holds the same fields, so trees need no
+    conversion.
+    """
+    if node.__class__ is dict or isinstance(node, (dict, Node)):
+        return node
+    return node.__dict__
+
+
+def has_fields(value):
+    """Return whether :func:`fields` can read value, as it can nodes, but
+    not scalars or other objects such as the compiled pattern esprima-python
+    puts in the value of a regex literal."""
+    return value.__class__ is dict or isinstance(value, (dict, Node)) or hasattr(value, "__dict__")
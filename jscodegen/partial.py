@@ -0,0 +1,181 @@
+from jscodegen.nodes import fields
+
+# Fields whose nodes the generator indents one level deeper than the node
+INDENTED_FIELDS = frozenset([
+    ("BlockStatement", "body"),
+    ("SwitchStatement", "cases"),
+    ("SwitchCase", "consequent"),
+    ("ObjectExpression", "properties"),
+])
+
+# Fields whose nodes start a line of their own, after the indentation
+LINE_FIELDS = frozenset([
+    ("Program", "body"),
+    ("BlockStatement", "body"),
+    ("SwitchCase", "consequent"),
+    ("ObjectExpression", "properties"),
+])
+
+# Fields whose last node is the last before a "}"
+CLOSED_FIELDS = frozenset([
+    ("BlockStatement", "body"),
+    ("SwitchStatement", "cases"),
+])
+
+# Fields whose node comes last in the code of the node that holds them, so
+# that a line break after it stays if one after the holder does
+ENDING_FIELDS = frozenset([
+    ("IfStatement", "alternate"),
+    ("TryStatement", "finalizer"),
+    ("CatchClause", "body"),
+])
+
+# Node types generated as statements, besides those named *Statement and
+# *Declaration
+STATEMENT_TYPES = frozenset(["Program", "SwitchCase", "CatchClause", "VariableDeclarator"])
+
+# Characters generated between checks of the budget
+CHUNK_SIZE = 1024
+
+
+def generate_prefix(node, max_bytes=None, max_lines=None, indent=2, compact=False, cache=None, profiler=None):
+    """Generate the start of the code for node, up to max_bytes bytes of
+    UTF-8 or max_lines lines, whichever is less.
+
+    Returns ``(code, truncated)``: code is a prefix of what
+    :func:`jscodegen.generate` returns, cut at a character boundary, with
+    the line break of its last line if it is a whole line, and truncated
+    tells whether any code was left out.  Generation stops once the budget
+    is used up, so its cost follows the length of the prefix; only a single
+    statement, such as one with a huge literal, is generated in one go.
+    """
+    from jscodegen import CodeGenerator, CompactCodeGenerator
+    g = CompactCodeGenerator(0, cache, profiler) if compact else CodeGenerator(indent, cache, profiler)
+    if not g.is_statement(node):
+        raise ValueError("cannot generate %s nodes on their own" % node["type"])
+    stream = iter_chunks(g, node)
+    chunks = []
+    size = lines = 0
+    for chunk in stream:
+        chunks.append(chunk)
+        if max_bytes is not None:
+            size += len(chunk.encode("utf-8"))
+        if max_lines is not None:
+            lines += chunk.count("\n")
+        if max_bytes is not None and size >= max_bytes or max_lines is not None and lines >= max_lines:
+            break
+    else:
+        return "".join(chunks), False
+    code = "".join(chunks)
+    length = len(code)
+    if max_lines is not None and lines >= max_lines:
+        end = -1
+        for _ in range(max_lines):
+            end = code.index("\n", end + 1)
+        code = code[:end + 1]
+    if max_bytes is not None:
+        code = code.encode("utf-8")[:max_bytes].decode("utf-8", "ignore")
+    # Code that fills the budget exactly is only cut if more follows
+    truncated = len(code) < length or any(stream)
+    stream.close()
+    return code, truncated
+
+
+def iter_chunks(g, node):
+    if fields(node)["type"] == "Program":
+        # One statement at a time, so long programs are not scheduled whole
+        for stmt in fields(node)["body"]:
+            yield from g.generate_iter({"type": "Program", "body": [stmt]}, CHUNK_SIZE)
+    else:
+        yield from g.generate_iter(node, CHUNK_SIZE)
+
+
+def generate_subtree(root, path, indent=2, compact=False, cache=None, profiler=None):
+    """Generate code for the node at path in root, as it is written in the
+    code for root.
+
+    path is a sequence of field names and list indices that leads from root
+    to the node, such as ``("body", 0, "body", "body", 2)`` for the third
+    statement of a function declared first in a Program.  Lines are
+    indented as deep as they are in the code for root, and statements and
+    properties that start a line start with its indentation.  Expressions
+    are generated without the parentheses their parent may need, and
+    without the line break after them where the parent goes on on the same
+    line, as after the body of ``do ... while``.  Only the nodes on the path
+    and the node's subtree are visited.
+    """
+    from jscodegen import CodeGenerator, CompactCodeGenerator, Precedence, TrailingStatement
+    g = CompactCodeGenerator(0, cache, profiler) if compact else CodeGenerator(indent, cache, profiler)
+    node = root
+    depth = 0
+    field = None
+    # Whether the code of node comes last before a "}", where compact code
+    # leaves out the semicolon
+    last = False
+    # Whether a line break that ends the code of node is kept, rather than
+    # dropped by a parent that goes on on the same line
+    line_break = True
+    for step in path:
+        if step.__class__ is int:
+            last = last and step == len(node) - 1
+            node = node[step]
+            continue
+        data = fields(node)
+        node_type = data["type"]
+        field = (node_type, step)
+        if field in INDENTED_FIELDS:
+            depth += 1
+        if field in LINE_FIELDS or field in INDENTED_FIELDS:
+            line_break = True
+        elif not ends_code(data, step, TrailingStatement):
+            line_break = False
+        if field in CLOSED_FIELDS:
+            last = True
+        elif node_type == "IfStatement":
+            last = last and step == ("alternate" if data.get("alternate") else "consequent")
+        else:
+            last = last and (node_type == "SwitchCase" and step == "consequent"
+                             or TrailingStatement.get(node_type) == step)
+        node = data[step]
+    indentation = depth * g.indent
+    node_type = fields(node)["type"]
+    if node_type in STATEMENT_TYPES or node_type.endswith(("Statement", "Declaration")):
+        precedence = None
+    else:
+        precedence = Precedence.Sequence
+    code = "".join(g.generate_node_iter(node, None, None, None, indentation, precedence))
+    if field in LINE_FIELDS:
+        code = indentation * g.space + code
+    if not line_break and g.newline and code.endswith(g.newline):
+        code = code[:-len(g.newline)]
+    if g.compact and last and code.endswith(";") and ends_with_semicolon(node, TrailingStatement):
+        code = code[:-1]
+    return code
+
+
+def ends_code(data, step, trailing):
+    # Whether the child at step comes last in the code of the node data, so
+    # that a line break after it is the one after the node
+    node_type = data["type"]
+    if (node_type, step) in ENDING_FIELDS or trailing.get(node_type) == step:
+        return True
+    if node_type == "IfStatement" and step == "consequent":
+        return not data.get("alternate")
+    if node_type == "TryStatement" and step in ("handler", "handlers"):
+        return not data.get("finalizer")
+    return False
+
+
+def ends_with_semicolon(stmt, trailing):
+    # As CodeGenerator.drop_semicolon, whether the semicolon is dropped
+    while True:
+        stmt = fields(stmt)
+        node_type = stmt["type"]
+        if node_type in trailing:
+            stmt = stmt[trailing[node_type]]
+        elif node_type == "IfStatement":
+            stmt = stmt.get("alternate") or stmt["consequent"]
+        elif node_type == "SwitchCase" and stmt["consequent"]:
+            stmt = stmt["consequent"][-1]
+        else:
+            return node_type != "EmptyStatement"
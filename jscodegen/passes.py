@@ -0,0 +1,77 @@
+from jscodegen.nodes import fields
+from jscodegen.syntax import Syntax
+
+
+class Pass:
+    """Base class of passes that run while code is generated, in the one
+    walk over the tree that generation makes.
+
+    Subclasses define methods named after the node types they handle, in
+    lower case as the handlers of CodeGenerator are.  Each is called with a
+    node of its type before the code of the node is generated, so with
+    parents before their children, and returns None to keep the node or a
+    node to generate in its place.  The tree itself is not changed.
+    """
+
+    def callbacks(self):
+        """Return the methods of the pass by the node type they handle."""
+        callbacks = {}
+        for syntax in Syntax:
+            method = getattr(self, syntax.value.lower(), None)
+            if method is not None:
+                callbacks[syntax.value] = method
+        return callbacks
+
+
+class Pipeline:
+    """Passes run fused: the callbacks of all of them, in the order they
+    were added, for each node as the generator reaches it.
+
+    Each callback gets what the one before it returned.  When a callback
+    returns a node of another type, the callbacks of that type run on it
+    instead of the rest, from the first; passes that keep turning nodes
+    into each other's types do not end.
+    """
+
+    def __init__(self, *passes):
+        self.callbacks = {}
+        for p in passes:
+            self.add(p)
+
+    def add(self, p):
+        """Add the callbacks of the pass p."""
+        for node_type, callback in p.callbacks().items():
+            self.register(node_type, callback)
+
+    def register(self, node_type, callback):
+        """Call callback for every node of node_type, after those already
+        registered for it."""
+        self.callbacks.setdefault(node_type, []).append(callback)
+
+    def visit(self, node):
+        """Run the callbacks on node and return the node to generate."""
+        node_type = fields(node)["type"]
+        callbacks = self.callbacks.get(node_type)
+        while callbacks:
+            for callback in callbacks:
+                result = callback(node)
+                if result is not None:
+                    node = result
+                    result_type = fields(node)["type"]
+                    if result_type != node_type:
+                        node_type = result_type
+                        callbacks = self.callbacks.get(node_type)
+                        break
+            else:
+                break
+        return node
+
+
+def pipeline(passes):
+    """Return passes, a Pipeline or passes to fuse into one, as a Pipeline,
+    or None if there are no callbacks to run."""
+    if passes is not None and not isinstance(passes, Pipeline):
+        passes = Pipeline(*passes)
+    if passes is None or not passes.callbacks:
+        return None
+    return passes
@@ -0,0 +1,52 @@
+from collections import namedtuple
+from threading import Lock
+
+NodeProfile = namedtuple("NodeProfile", ["count", "total_time", "self_time", "chars"])
+
+
+class Profiler:
+    """Statistics per node type over the generation runs it is passed to.
+
+    For each type it counts the nodes, the time spent generating them with
+    and without their children, and the characters they wrote themselves;
+    a line break that a parent takes back from a child may count for
+    either.  Children that were deferred to the work-list count as
+    top-level nodes, not towards their parent.  callback, if given, is
+    called with the same values for every node as it is done.  Runs in
+    several threads may share a profiler.
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.stats = {}
+        self.lock = Lock()
+
+    def record(self, node_type, total_time, self_time, size):
+        with self.lock:
+            stats = self.stats.get(node_type)
+            if stats is None:
+                stats = self.stats[node_type] = [0, 0.0, 0.0, 0]
+            stats[0] += 1
+            stats[1] += total_time
+            stats[2] += self_time
+            stats[3] += size
+        if self.callback is not None:
+            self.callback(node_type, total_time, self_time, size)
+
+    def report(self):
+        """Return a dict of a NodeProfile per node type, by descending self time."""
+        with self.lock:
+            profiles = [(node_type, NodeProfile(*stats)) for node_type, stats in self.stats.items()]
+        profiles.sort(key=lambda item: item[1].self_time, reverse=True)
+        return dict(profiles)
+
+    def format_report(self):
+        lines = ["%-26s %9s %10s %10s %10s" % ("type", "count", "total ms", "self ms", "chars")]
+        for node_type, profile in self.report().items():
+            lines.append("%-26s %9d %10.2f %10.2f %10d" % (
+                node_type, profile.count, profile.total_time * 1e3, profile.self_time * 1e3, profile.chars))
+        return "\n".join(lines)
+
+    def clear(self):
+        with self.lock:
+            self.stats.clear()
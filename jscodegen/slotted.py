@@ -0,0 +1,129 @@
+from jscodegen.nodes import Node, fields, has_fields, node_class
+from jscodegen.syntax import Syntax
+
+# The ESTree fields of each node type.  Every node can also have the
+# position fields.
+FIELDS = {
+    "AssignmentExpression": ("operator", "left", "right"),
+    "ArrayExpression": ("elements",),
+    "ArrowFunctionExpression": ("id", "params", "body", "generator", "expression", "async"),
+    "BlockStatement": ("body",),
+    "BinaryExpression": ("operator", "left", "right"),
+    "BreakStatement": ("label",),
+    "CallExpression": ("callee", "arguments"),
+    "CatchClause": ("param", "body"),
+    "ConditionalExpression": ("test", "consequent", "alternate"),
+    "ContinueStatement": ("label",),
+    "DoWhileStatement": ("body", "test"),
+    "DebuggerStatement": (),
+    "EmptyStatement": (),
+    "ExpressionStatement": ("expression", "directive"),
+    "ForStatement": ("init", "test", "update", "body"),
+    "ForInStatement": ("left", "right", "body", "each"),
+    "FunctionDeclaration": ("id", "params", "body", "generator", "expression", "async"),
+    "FunctionExpression": ("id", "params", "body", "generator", "expression", "async"),
+    "Identifier": ("name",),
+    "IfStatement": ("test", "consequent", "alternate"),
+    "Literal": ("value", "raw", "regex"),
+    "LabeledStatement": ("label", "body"),
+    "LogicalExpression": ("operator", "left", "right"),
+    "MemberExpression": ("computed", "object", "property"),
+    "NewExpression": ("callee", "arguments"),
+    "ObjectPattern": ("properties",),
+    "ObjectExpression": ("properties",),
+    "Program": ("body", "sourceType"),
+    "Property": ("key", "computed", "value", "kind", "method", "shorthand"),
+    "ReturnStatement": ("argument",),
+    "SequenceExpression": ("expressions",),
+    "SpreadElement": ("argument",),
+    "SwitchStatement": ("discriminant", "cases"),
+    "SwitchCase": ("test", "consequent"),
+    "ThisExpression": (),
+    "ThrowStatement": ("argument",),
+    "TryStatement": ("block", "handler", "finalizer", "handlers"),
+    "UnaryExpression": ("operator", "argument", "prefix"),
+    "UpdateExpression": ("operator", "argument", "prefix"),
+    "VariableDeclaration": ("declarations", "kind"),
+    "VariableDeclarator": ("id", "init"),
+    "WhileStatement": ("test", "body"),
+    "WithStatement": ("object", "body"),
+}
+POSITION_FIELDS = ("loc", "range", "start", "end")
+
+SYNTAX_CLASSES = {syntax.value: node_class(syntax.value, FIELDS[syntax.value] + POSITION_FIELDS)
+                  for syntax in Syntax}
+SourceLocation = node_class("SourceLocation", ("start", "end", "source"), False)
+Position = node_class("Position", ("line", "column"), False)
+
+SCALARS = (str, int, float, bool, type(None))
+
+
+def slotted_class(node_type, names):
+    """Return the class for a node of node_type with the given fields."""
+    cls = SYNTAX_CLASSES.get(node_type)
+    if cls is not None:
+        extra = tuple(name for name in names if name not in cls._fields)
+        if not extra:
+            return cls
+        return node_class(node_type, cls._fields + extra)
+    return node_class(node_type, tuple(names))
+
+
+def location(loc):
+    loc = fields(loc)
+    result = SourceLocation()
+    for key in ("start", "end"):
+        position = loc.get(key)
+        if position is not None:
+            position = fields(position)
+            result[key] = Position()
+            result[key]["line"] = position["line"]
+            result[key]["column"] = position["column"]
+    if loc.get("source") is not None:
+        result["source"] = loc["source"]
+    return result
+
+
+def to_slotted(tree):
+    """Convert an ESTree tree of dicts or node objects to slotted nodes.
+
+    Each node becomes an instance of a class with ``__slots__`` for its
+    fields, such as ``SYNTAX_CLASSES["Identifier"]``, which needs a fraction
+    of the memory of a dict.  Source locations are converted too; other
+    values are kept as they are.  The tree is walked iteratively, so deep
+    trees convert as well.
+    """
+    root = [None]
+    stack = [(tree, root, 0)]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        value, parent, key = pop()
+        if value.__class__ is list:
+            items = parent[key] = [None] * len(value)
+            for i, item in enumerate(value):
+                if item.__class__ in SCALARS:
+                    items[i] = item
+                else:
+                    push((item, items, i))
+            continue
+        if isinstance(value, Node) or value.__class__ in SCALARS:
+            parent[key] = value
+            continue
+        data = fields(value) if has_fields(value) else {}
+        node_type = data.get("type")
+        if node_type is None:
+            # Values that are not nodes, such as regex patterns
+            parent[key] = value
+            continue
+        names = [name for name in data if name != "type"]
+        node = parent[key] = slotted_class(node_type, names)()
+        for name in names:
+            item = data[name]
+            if item.__class__ in SCALARS:
+                node[name] = item
+            elif name == "loc":
+                node[name] = location(item)
+            else:
+                push((item, node, name))
+    return root[0]
@@ -0,0 +1,184 @@
+import json
+from bisect import bisect_right
+from functools import lru_cache
+
+from jscodegen.emitter import Emitter
+from jscodegen.nodes import fields
+
+BASE64 = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+
+
+def vlq(value):
+    """Encode an integer as a Base64 VLQ."""
+    value = (-value << 1) | 1 if value < 0 else value << 1
+    result = ""
+    while True:
+        digit = value & 31
+        value >>= 5
+        if value:
+            result += BASE64[digit | 32]
+        else:
+            return result + BASE64[digit]
+
+
+@lru_cache(maxsize=4096)
+def segment_vlq(*values):
+    """Encode the four fields of a mapping segment."""
+    return "".join(map(vlq, values))
+
+
+class SourceMap:
+    """Source Map v3 built from mappings in generated order.
+
+    Mappings are encoded as they are added, one generated line at a time,
+    so the map is ready as soon as generation ends.  Nodes without ``loc``
+    are mapped from their ``range`` when source_content is given.
+    """
+
+    def __init__(self, file=None, source=None, source_content=None):
+        self.file = file
+        self.source = source or ""
+        self.source_content = source_content
+        self.sources = {}
+        self.names = {}
+        self.mappings = []
+        self.pending = None
+        self.line = 0
+        self.column = 0
+        self.previous = [0, 0, 0, 0]
+        self.line_starts = None
+        if source_content is not None:
+            self.line_starts = [0]
+            offset = source_content.find("\n")
+            while offset >= 0:
+                self.line_starts.append(offset + 1)
+                offset = source_content.find("\n", offset + 1)
+
+    def add(self, line, column, source, original_line, original_column, name=None):
+        """Map the generated position to an original one, all zero-based."""
+        pending = self.pending
+        # The innermost of several nodes starting at one position wins
+        if pending is not None and (pending[0] != line or pending[1] != column):
+            self.encode(pending)
+        self.pending = (line, column, source, original_line, original_column, name)
+
+    def add_node(self, line, column, node):
+        """Map the generated position to the start of node, if it is known."""
+        loc = node.get('loc')
+        if loc is not None:
+            loc = fields(loc)
+            start = fields(loc['start'])
+            source = loc.get('source') or self.source
+            original_line = start['line'] - 1
+            original_column = start['column']
+        else:
+            node_range = node.get('range')
+            if node_range is None or self.line_starts is None:
+                return
+            offset = node_range[0]
+            source = self.source
+            original_line = bisect_right(self.line_starts, offset) - 1
+            original_column = offset - self.line_starts[original_line]
+        pending = self.pending
+        if pending is not None and (pending[0] != line or pending[1] != column):
+            self.encode(pending)
+        self.pending = (line, column, source, original_line, original_column,
+                        node['name'] if node['type'] == 'Identifier' else None)
+
+    def encode(self, segment):
+        line, column, source, original_line, original_column, name = segment
+        mappings = self.mappings
+        if line != self.line:
+            mappings.append(";" * (line - self.line))
+            self.line = line
+            self.column = 0
+        elif mappings:
+            mappings.append(",")
+        index = self.sources.get(source)
+        if index is None:
+            index = self.sources[source] = len(self.sources)
+        previous = self.previous
+        encoded = segment_vlq(column - self.column, index - previous[0],
+                              original_line - previous[1], original_column - previous[2])
+        if name is not None:
+            name_index = self.names.get(name)
+            if name_index is None:
+                name_index = self.names[name] = len(self.names)
+            encoded += vlq(name_index - previous[3])
+            previous[3] = name_index
+        mappings.append(encoded)
+        self.column = column
+        previous[0] = index
+        previous[1] = original_line
+        previous[2] = original_column
+
+    def to_dict(self):
+        if self.pending is not None:
+            self.encode(self.pending)
+            self.pending = None
+        result = {"version": 3}
+        if self.file is not None:
+            result["file"] = self.file
+        result["sources"] = list(self.sources)
+        if self.source_content is not None:
+            result["sourcesContent"] = [self.source_content if source == self.source else None
+                                        for source in self.sources]
+        result["names"] = list(self.names)
+        result["mappings"] = "".join(self.mappings)
+        return result
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+
+class MappingEmitter(Emitter):
+    """Emitter that tracks the generated line and column for a SourceMap.
+
+    Line breaks are separate parts and no other part contains one, so the
+    position advances by part instead of by character.  Nodes among the
+    parts mark where their code starts.
+    """
+
+    def __init__(self, source_map):
+        super().__init__()
+        self.source_map = source_map
+        self.line = 0
+        self.column = 0
+        self.write = self.append
+
+    def extend(self, items):
+        parts = self.parts
+        add_node = self.source_map.add_node
+        line = self.line
+        column = self.column
+        for item in items:
+            if item.__class__ is str:
+                if item == "\n":
+                    line += 1
+                    column = 0
+                else:
+                    column += len(item)
+                parts.append(item)
+            else:
+                add_node(line, column, item)
+        self.line = line
+        self.column = column
+
+    def append(self, item):
+        self.extend((item,))
+
+    def drop(self, char):
+        parts = self.parts
+        if not parts or parts[-1][-1:] != char:
+            return
+        Emitter.drop(self, char)
+        if char != "\n":
+            self.column -= 1
+            return
+        self.line -= 1
+        column = 0
+        for part in reversed(parts):
+            if part == "\n":
+                break
+            column += len(part)
+        self.column = column
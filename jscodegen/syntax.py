@@ -4,7 +4,7 @@ from enum import Enum
 class Syntax(Enum):
     AssignmentExpression = "AssignmentExpression"
     ArrayExpression = "ArrayExpression"
-    # ArrowFunctionExpression = "ArrowFunctionExpression"
+    ArrowFunctionExpression = "ArrowFunctionExpression"
     BlockStatement = "BlockStatement"
     BinaryExpression = "BinaryExpression"
     BreakStatement = "BreakStatement"
@@ -31,11 +31,13 @@ class Syntax(Enum):
     MemberExpression = "MemberExpression"
     # MethodDefinition = "MethodDefinition"
     NewExpression = "NewExpression"
+    ObjectPattern = "ObjectPattern"
     ObjectExpression = "ObjectExpression"
     Program = "Program"
     Property = "Property"
     ReturnStatement = "ReturnStatement"
     SequenceExpression = "SequenceExpression"
+    SpreadElement = "SpreadElement"
     SwitchStatement = "SwitchStatement"
     SwitchCase = "SwitchCase"
     ThisExpression = "ThisExpression"
@@ -52,4 +54,6 @@ Statements = [
     Syntax.Program,
     Syntax.IfStatement,
     Syntax.TryStatement
-]
\ No newline at end of file
+]
+
+Expressions = frozenset(s.value for s in Syntax if s.value.endswith("Expression"))
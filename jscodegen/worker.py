@@ -0,0 +1,76 @@
+import json
+import os
+import socketserver
+import sys
+from time import perf_counter
+
+
+class Worker:
+    """Answers JSON-lines requests for code, one per line.
+
+    A request is an object with the ESTree tree in ``ast``, any ``id`` to be
+    echoed back, and optionally ``indent`` and ``compact``.  The response
+    has the ``id`` and either the ``code`` or an ``error``, and the seconds
+    spent on parsing the request and generating the code in
+    ``parse_time`` and ``generate_time``.  Responses are written in the
+    order of the requests, so clients may send many before reading any.
+    """
+
+    def __init__(self):
+        self.generators = {}
+
+    def generator(self, indent, compact):
+        from jscodegen import CodeGenerator, CompactCodeGenerator
+        key = (indent, compact)
+        g = self.generators.get(key)
+        if g is None:
+            g = self.generators[key] = CompactCodeGenerator() if compact else CodeGenerator(indent)
+        return g
+
+    def handle(self, line):
+        """Return the response to a request line as a dict."""
+        start = perf_counter()
+        response = {"id": None}
+        try:
+            request = json.loads(line)
+            response["id"] = request.get("id")
+            node = request["ast"]
+            parsed = perf_counter()
+            response["parse_time"] = parsed - start
+            g = self.generator(request.get("indent", 2), bool(request.get("compact", False)))
+            if not g.is_statement(node):
+                raise ValueError("cannot generate %s nodes on their own" % node["type"])
+            response["code"] = "".join(g.generate_iter(node, None))
+            response["generate_time"] = perf_counter() - parsed
+        except Exception as error:
+            response["error"] = "%s: %s" % (type(error).__name__, error)
+        return response
+
+    def serve(self, infile, outfile):
+        """Answer the requests read from infile on outfile, both binary."""
+        for line in infile:
+            if not line.strip():
+                continue
+            outfile.write(json.dumps(self.handle(line), ensure_ascii=False).encode("utf-8") + b"\n")
+            outfile.flush()
+
+
+class ConnectionHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        Worker().serve(self.rfile, self.wfile)
+
+
+def serve_stdio():
+    Worker().serve(sys.stdin.buffer, sys.stdout.buffer)
+
+
+def serve_socket(path):
+    """Answer requests on the Unix socket at path, each connection in a thread."""
+    server = socketserver.ThreadingUnixStreamServer(path, ConnectionHandler)
+    server.daemon_threads = True
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        os.unlink(path)
@@ -0,0 +1,29 @@
+"""ESTree nodes for the tests, built as plain dicts."""
+
+
+def ident(name):
+    return {"type": "Identifier", "name": name}
+
+
+def literal(value):
+    return {"type": "Literal", "value": value}
+
+
+def unary(operator, argument):
+    return {"type": "UnaryExpression", "operator": operator, "prefix": True, "argument": argument}
+
+
+def binary(operator, left, right):
+    return {"type": "BinaryExpression", "operator": operator, "left": left, "right": right}
+
+
+def statement(expression):
+    return {"type": "ExpressionStatement", "expression": expression}
+
+
+def block(*body):
+    return {"type": "BlockStatement", "body": list(body)}
+
+
+def program(*body):
+    return {"type": "Program", "body": list(body)}
@@ -0,0 +1,83 @@
+import asyncio
+import functools
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+
+
+def call(name, *args):
+    return {"type": "ExpressionStatement", "expression": {
+        "type": "CallExpression", "callee": {"type": "Identifier", "name": name},
+        "arguments": [{"type": "Literal", "value": arg} for arg in args]}}
+
+
+PROGRAM = {"type": "Program", "body": [
+    {"type": "IfStatement", "test": {"type": "Identifier", "name": "c%d" % i},
+     "consequent": {"type": "BlockStatement", "body": [call("f", i, "x"), call("g")]}, "alternate": None}
+    for i in range(50)]}
+
+
+def run(test):
+    """Run the coroutine method test in an event loop of its own, as
+    IsolatedAsyncioTestCase, which needs Python 3.8, would."""
+    @functools.wraps(test)
+    def run_test(self):
+        asyncio.run(test(self))
+    return run_test
+
+
+class AsyncTestCase(unittest.TestCase):
+
+    @run
+    async def test_same_code(self):
+        for compact in (False, True):
+            self.assertEqual(jscodegen.generate(PROGRAM, compact=compact),
+                             await jscodegen.generate_async(PROGRAM, compact=compact))
+        self.assertEqual(jscodegen.generate(PROGRAM, indent=4),
+                         await jscodegen.generate_async(PROGRAM, indent=4, time_budget=0))
+
+    @run
+    async def test_pauses(self):
+        ticks = 0
+        done = False
+
+        async def tick():
+            nonlocal ticks
+            while not done:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        ticker = asyncio.create_task(tick())
+        await asyncio.sleep(0)
+        ticks = 0
+        code = await jscodegen.generate_async(PROGRAM, node_budget=10)
+        done = True
+        await ticker
+        self.assertEqual(jscodegen.generate(PROGRAM), code)
+        self.assertGreaterEqual(ticks, 20)
+
+    @run
+    async def test_executor(self):
+        with ThreadPoolExecutor(1) as executor:
+            self.assertEqual(jscodegen.generate(PROGRAM, compact=True),
+                             await jscodegen.generate_async(PROGRAM, compact=True, executor=executor))
+
+    @run
+    async def test_not_a_statement(self):
+        with self.assertRaises(ValueError):
+            await jscodegen.generate_async({"type": "Identifier", "name": "x"})
+
+    def test_steps(self):
+        chunks = list(jscodegen.CodeGenerator(2).generate_iter(PROGRAM, jscodegen.BUFFER_SIZE, None, 7))
+        self.assertEqual(jscodegen.generate(PROGRAM), "".join(chunks))
+        # The Program, 50 if statements, their blocks and 100 calls
+        self.assertEqual(201 // 7, chunks.count(""))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -79,6 +79,10 @@ class BaseTestCase(unittest.TestCase):
         result = jscodegen.generate({"type":"Program","body":[{"type":"VariableDeclaration","declarations":[{"type":"VariableDeclarator","id":{"type":"Identifier","name":"a"},"init":{"type":"FunctionExpression","id":None,"params":[{"type":"Identifier","name":"a"},{"type":"Identifier","name":"b"},{"type":"Identifier","name":"c"}],"defaults":[],"body":{"type":"BlockStatement","body":[]},"rest":None,"generator":False,"expression":False}}],"kind":"var"}]})
         self.assertEqual("var a = function(a, b, c) {\n};\n", result)
 
+        # named
+        result = jscodegen.generate({"type":"Program","body":[{"type":"VariableDeclaration","declarations":[{"type":"VariableDeclarator","id":{"type":"Identifier","name":"a"},"init":{"type":"FunctionExpression","id":{"type":"Identifier","name":"foo"},"params":[],"defaults":[],"body":{"type":"BlockStatement","body":[]},"rest":None,"generator":False,"expression":False}}],"kind":"var"}]})
+        self.assertEqual("var a = function foo() {\n};\n", result)
+
     def test_new_expression(self):
         result = jscodegen.generate({"type":"Program","body":[{"type":"ExpressionStatement","expression":{"type":"NewExpression","callee":{"type":"Identifier","name":"Something"},"arguments":[{"type":"Identifier","name":"p"},{"type":"Identifier","name":"p2"}]}}]})
         self.assertEqual("new Something(p, p2);\n", result)
@@ -98,6 +102,10 @@ class BaseTestCase(unittest.TestCase):
         result = jscodegen.generate({"type":"Program","body":[{"type":"IfStatement","test":{"type":"BinaryExpression","operator":"<","left":{"type":"Identifier","name":"a"},"right":{"type":"Identifier","name":"b"}},"consequent":{"type":"BlockStatement","body":[]},"alternate":{"type":"BlockStatement","body":[{"type":"ExpressionStatement","expression":{"type":"UpdateExpression","operator":"--","argument":{"type":"Identifier","name":"a"},"prefix":False}}]}}]})
         self.assertEqual("if (a < b) {\n} else {\n  a--;\n}\n", result)
 
+        # nested in a block
+        result = jscodegen.generate({"type":"Program","body":[{"type":"FunctionDeclaration","id":{"type":"Identifier","name":"f"},"params":[],"defaults":[],"body":{"type":"BlockStatement","body":[{"type":"IfStatement","test":{"type":"Identifier","name":"a"},"consequent":{"type":"BlockStatement","body":[{"type":"ReturnStatement","argument":{"type":"Identifier","name":"b"}}]},"alternate":{"type":"BlockStatement","body":[{"type":"ReturnStatement","argument":{"type":"Identifier","name":"c"}}]}}]},"rest":None,"generator":False,"expression":False}]})
+        self.assertEqual("function f() {\n  if (a) {\n    return b;\n  } else {\n    return c;\n  }\n}\n", result)
+
     def test_while_statement(self):
         result = jscodegen.generate({"type":"Program","body":[{"type":"WhileStatement","test":{"type":"BinaryExpression","operator":"<","left":{"type":"Identifier","name":"a"},"right":{"type":"Literal","value":5,"raw":"5"}},"body":{"type":"BlockStatement","body":[]}}]})
         self.assertEqual("while (a < 5) {\n}\n", result)
@@ -115,6 +123,10 @@ class BaseTestCase(unittest.TestCase):
         result = jscodegen.generate({"type":"Program","body":[{"type":"WhileStatement","test":{"type":"Literal","value":True,"raw":"true"},"body":{"type":"BlockStatement","body":[{"type":"IfStatement","test":{"type":"BinaryExpression","operator":"<","left":{"type":"Identifier","name":"a"},"right":{"type":"Literal","value":5,"raw":"5"}},"consequent":{"type":"BlockStatement","body":[{"type":"BreakStatement","label":None}]},"alternate":None}]}}]})
         self.assertEqual("while (true) {\n  if (a < 5) {\n    break;\n  }\n}\n", result)
 
+        # with a label
+        result = jscodegen.generate({"type":"Program","body":[{"type":"LabeledStatement","label":{"type":"Identifier","name":"outer"},"body":{"type":"WhileStatement","test":{"type":"Literal","value":True,"raw":"true"},"body":{"type":"BlockStatement","body":[{"type":"BreakStatement","label":{"type":"Identifier","name":"outer"}}]}}}]})
+        self.assertEqual("outer: while (true) {\n  break outer;\n}\n", result)
+
     def test_function_declaration(self):
         result = jscodegen.generate({"type":"Program","body":[{"type":"FunctionDeclaration","id":{"type":"Identifier","name":"f"},"params":[],"defaults":[],"body":{"type":"BlockStatement","body":[]},"rest":None,"generator":False,"expression":False}]})
         self.assertEqual("function f() {\n}\n", result)
@@ -130,6 +142,10 @@ class BaseTestCase(unittest.TestCase):
         result = jscodegen.generate({"type":"Program","body":[{"type":"WhileStatement","test":{"type":"Literal","value":True,"raw":"true"},"body":{"type":"BlockStatement","body":[{"type":"ExpressionStatement","expression":{"type":"UpdateExpression","operator":"++","argument":{"type":"Identifier","name":"a"},"prefix":False}},{"type":"IfStatement","test":{"type":"BinaryExpression","operator":">","left":{"type":"Identifier","name":"a"},"right":{"type":"Literal","value":5,"raw":"5"}},"consequent":{"type":"ContinueStatement","label":None},"alternate":None}]}}]})
         self.assertEqual("while (true) {\n  a++;\n  if (a > 5) continue;\n}\n", result)
 
+        # with a label
+        result = jscodegen.generate({"type":"Program","body":[{"type":"LabeledStatement","label":{"type":"Identifier","name":"outer"},"body":{"type":"WhileStatement","test":{"type":"Literal","value":True,"raw":"true"},"body":{"type":"BlockStatement","body":[{"type":"ContinueStatement","label":{"type":"Identifier","name":"outer"}}]}}}]})
+        self.assertEqual("outer: while (true) {\n  continue outer;\n}\n", result)
+
     def test_for_in_statement(self):
         # with declaration
         result = jscodegen.generate({"type":"Program","body":[{"type":"ForInStatement","left":{"type":"VariableDeclaration","declarations":[{"type":"VariableDeclarator","id":{"type":"Identifier","name":"prop"},"init":None}],"kind":"var"},"right":{"type":"MemberExpression","computed":False,"object":{"type":"Identifier","name":"document"},"property":{"type":"Identifier","name":"body"}},"body":{"type":"BlockStatement","body":[{"type":"ExpressionStatement","expression":{"type":"CallExpression","callee":{"type":"MemberExpression","computed":False,"object":{"type":"Identifier","name":"console"},"property":{"type":"Identifier","name":"log"}},"arguments":[{"type":"MemberExpression","computed":True,"object":{"type":"MemberExpression","computed":False,"object":{"type":"Identifier","name":"document"},"property":{"type":"Identifier","name":"body"}},"property":{"type":"Identifier","name":"prop"}}]}}]},"each":False}]})
@@ -143,6 +159,10 @@ class BaseTestCase(unittest.TestCase):
         result = jscodegen.generate({"type":"Program","body":[{"type":"DoWhileStatement","body":{"type":"BlockStatement","body":[{"type":"ExpressionStatement","expression":{"type":"UpdateExpression","operator":"++","argument":{"type":"Identifier","name":"a"},"prefix":True}}]},"test":{"type":"BinaryExpression","operator":"<","left":{"type":"Identifier","name":"a"},"right":{"type":"Literal","value":5,"raw":"5"}}}]})
         self.assertEqual("do {\n  ++a;\n} while (a < 5);", result)
 
+        # nested in a block
+        result = jscodegen.generate({"type":"Program","body":[{"type":"FunctionDeclaration","id":{"type":"Identifier","name":"f"},"params":[],"defaults":[],"body":{"type":"BlockStatement","body":[{"type":"DoWhileStatement","body":{"type":"BlockStatement","body":[{"type":"ExpressionStatement","expression":{"type":"UpdateExpression","operator":"++","argument":{"type":"Identifier","name":"a"},"prefix":True}}]},"test":{"type":"BinaryExpression","operator":"<","left":{"type":"Identifier","name":"a"},"right":{"type":"Literal","value":5,"raw":"5"}}}]},"rest":None,"generator":False,"expression":False}]})
+        self.assertEqual("function f() {\n  do {\n    ++a;\n  } while (a < 5);\n}\n", result)
+
     def test_switch_statement(self):
         result = jscodegen.generate({"type":"Program","body":[{"type":"SwitchStatement","discriminant":{"type":"Identifier","name":"a"},"cases":[{"type":"SwitchCase","test":{"type":"Literal","value":"a","raw":"\"a\""},"consequent":[{"type":"BreakStatement","label":None}]},{"type":"SwitchCase","test":{"type":"Literal","value":42,"raw":"42"},"consequent":[]},{"type":"SwitchCase","test":{"type":"Literal","value":43,"raw":"43"},"consequent":[{"type":"ExpressionStatement","expression":{"type":"CallExpression","callee":{"type":"MemberExpression","computed":False,"object":{"type":"Identifier","name":"console"},"property":{"type":"Identifier","name":"log"}},"arguments":[{"type":"Identifier","name":"a"}]}},{"type":"BreakStatement","label":None}]},{"type":"SwitchCase","test":None,"consequent":[{"type":"ExpressionStatement","expression":{"type":"CallExpression","callee":{"type":"MemberExpression","computed":False,"object":{"type":"Identifier","name":"console"},"property":{"type":"Identifier","name":"log"}},"arguments":[{"type":"Literal","value":"not found","raw":"\"not found\""}]}}]}]}]})
         self.assertEqual("switch (a) {\n  case \"a\":\n    break;\n  case 42:\n  case 43:\n    console.log(a);\n\n    break;\n  default:\n    console.log(\"not found\");\n\n}", result)
@@ -190,5 +210,63 @@ class BaseTestCase(unittest.TestCase):
         result = jscodegen.generate({"type": "Program", "sourceType": "script", "body": [{"type": "VariableDeclaration", "declarations": [{"type": "VariableDeclarator", "id": {"type": "Identifier", "name": "func"}, "init": {"type": "ArrowFunctionExpression", "generator": False, "async": False, "params": [{"type": "Identifier", "name": "x"}, {"type": "Identifier", "name": "y"}], "body": {"type": "BlockStatement", "body": [{"type": "ReturnStatement", "argument": {"type": "BinaryExpression", "operator": "+", "left": {"type": "Identifier", "name": "x"}, "right": {"type": "Identifier", "name": "y"}}}]}, "expression": False}}], "kind": "var"}]})
         self.assertEqual("var func = (x, y) => {\n  return x + y;\n};\n", result)
 
+    def test_handler_override(self):
+        class Upper(jscodegen.CodeGenerator):
+            def identifier(self, expr, precedence):
+                return expr["name"].upper()
+
+        g = Upper(2)
+        self.assertEqual(g.handlers["Identifier"], g.identifier)
+        result = g.generate({"type":"Program","body":[{"type":"ExpressionStatement","expression":{"type":"BinaryExpression","operator":"+","left":{"type":"Identifier","name":"a"},"right":{"type":"Identifier","name":"b"}}}]})
+        self.assertEqual("A + B;\n", result)
+
+    def test_unregistered_handler(self):
+        class Custom(jscodegen.CodeGenerator):
+            def customexpression(self, expr, precedence):
+                return "custom"
+
+        g = Custom(2)
+        self.assertNotIn("CustomExpression", g.handlers)
+        result = g.generate({"type":"Program","body":[{"type":"ExpressionStatement","expression":{"type":"CustomExpression"}}]})
+        self.assertEqual("custom;\n", result)
+        self.assertIn("CustomExpression", g.expression_types)
+
+    def test_deep_binary_chain(self):
+        expr = {"type":"Identifier","name":"a"}
+        for _ in range(10000):
+            expr = {"type":"BinaryExpression","operator":"+","left":expr,"right":{"type":"Identifier","name":"b"}}
+        result = jscodegen.generate({"type":"Program","body":[{"type":"ExpressionStatement","expression":expr}]})
+        self.assertEqual("a" + " + b" * 10000 + ";\n", result)
+
+    def test_deep_then_chain(self):
+        expr = {"type":"Identifier","name":"p"}
+        for _ in range(5000):
+            member = {"type":"MemberExpression","computed":False,"object":expr,"property":{"type":"Identifier","name":"then"}}
+            expr = {"type":"CallExpression","callee":member,"arguments":[{"type":"Identifier","name":"f"}]}
+        result = jscodegen.generate({"type":"Program","body":[{"type":"ExpressionStatement","expression":expr}]})
+        self.assertEqual("p" + "\n.then(f)" * 5000 + ";\n", result)
+
+    def test_deep_nesting(self):
+        expr = {"type":"Identifier","name":"x"}
+        for _ in range(3000):
+            expr = {"type":"ArrayExpression","elements":[expr]}
+        body = {"type":"ExpressionStatement","expression":expr}
+        for _ in range(3000):
+            body = {"type":"BlockStatement","body":[body]}
+        result = jscodegen.generate({"type":"Program","body":[body]})
+        lines = result.splitlines()
+        self.assertEqual(6001, len(lines))
+        self.assertEqual(" " * 3000 * 2 + "[" * 3000 + "x" + "]" * 3000 + ";", lines[3000])
+        self.assertEqual("}", lines[-1])
+
+    def test_deep_else_if_compact(self):
+        leaf = {"type":"ExpressionStatement","expression":{"type":"Identifier","name":"x"}}
+        stmt = leaf
+        for _ in range(5000):
+            stmt = {"type":"IfStatement","test":{"type":"Identifier","name":"a"},"consequent":leaf,"alternate":stmt}
+        body = {"type":"BlockStatement","body":[stmt]}
+        result = jscodegen.generate({"type":"Program","body":[body]}, compact=True)
+        self.assertEqual("{" + "if(a)x;else " * 5000 + "x}", result)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,61 @@
+import json
+import sys
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+
+
+def program(name):
+    return {"type": "Program", "body": [{"type": "ExpressionStatement", "expression": {
+        "type": "CallExpression", "callee": {"type": "Identifier", "name": name}, "arguments": []}}]}
+
+
+BROKEN = {"type": "Program", "body": [{"type": "ExpressionStatement"}]}
+
+
+class BatchTestCase(unittest.TestCase):
+
+    def test_ordered(self):
+        nodes = [program("f%d" % i) for i in range(50)]
+        results = list(jscodegen.generate_many(nodes, workers=2, chunk_size=3))
+        self.assertEqual([(i, "f%d();\n" % i) for i in range(50)], results)
+
+    def test_as_completed(self):
+        nodes = [program("f%d" % i) for i in range(50)]
+        results = jscodegen.generate_many(nodes, workers=2, chunk_size=3, ordered=False, compact=True)
+        self.assertEqual([(i, "f%d();" % i) for i in range(50)], sorted(results))
+
+    def test_json_items(self):
+        nodes = [json.dumps(program("f")), json.dumps(program("g")).encode("utf-8")]
+        self.assertEqual([(0, "f();\n"), (1, "g();\n")], list(jscodegen.generate_many(iter(nodes), workers=2)))
+
+    def test_error(self):
+        nodes = [program("f"), BROKEN, program("g")]
+        results = jscodegen.generate_many(nodes, workers=2, chunk_size=1)
+        self.assertEqual((0, "f();\n"), next(results))
+        with self.assertRaises(jscodegen.GenerationError) as context:
+            next(results)
+        self.assertEqual(1, context.exception.index)
+        self.assertIsInstance(context.exception.error, KeyError)
+        self.assertIn("expressionstatement", context.exception.traceback)
+
+    def test_return_exceptions(self):
+        nodes = [program("f"), BROKEN, program("g")]
+        results = list(jscodegen.generate_many(nodes, workers=1, return_exceptions=True))
+        self.assertEqual((0, "f();\n"), results[0])
+        self.assertIsInstance(results[1][1], jscodegen.GenerationError)
+        self.assertEqual((2, "g();\n"), results[2])
+
+    def test_executor(self):
+        with ProcessPoolExecutor(2) as executor:
+            for _ in range(2):
+                results = jscodegen.generate_many([program("f")] * 5, executor=executor)
+                self.assertEqual(["f();\n"] * 5, [code for _, code in results])
+
+
+if __name__ == '__main__':
+    unittest.main()
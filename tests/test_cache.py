@@ -0,0 +1,87 @@
+import copy
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+from jscodegen.cache import SubtreeCache
+from estree import ident, statement, program
+
+
+def call(callee, *arguments):
+    return {"type": "CallExpression", "callee": callee, "arguments": list(arguments)}
+
+
+def function(name):
+    return {"type": "FunctionExpression", "id": None, "params": [ident("x")], "body": {
+        "type": "BlockStatement", "body": [{"type": "ReturnStatement", "argument": call(ident(name), ident("x"))}]}}
+
+
+class CacheTestCase(unittest.TestCase):
+
+    def test_identity(self):
+        helper = function("f")
+        cache = SubtreeCache()
+        first = program(statement(call(ident("use"), helper)))
+        second = program(statement(call(ident("use"), helper)), statement(call(ident("use"), helper)))
+        self.assertEqual(jscodegen.generate(first), jscodegen.generate(first, cache=cache))
+        self.assertEqual(jscodegen.generate(second), jscodegen.generate(second, cache=cache))
+        self.assertEqual((2, 1, 1024, 1), cache.cache_info())
+        # An equal copy is a different node
+        jscodegen.generate(program(statement(call(ident("use"), copy.deepcopy(helper)))), cache=cache)
+        self.assertEqual((2, 2), cache.cache_info()[:2])
+
+    def test_structural(self):
+        cache = SubtreeCache(structural=True)
+        tree = program(statement(call(ident("use"), function("f"))), statement(call(ident("use"), function("f"))),
+                       statement(call(ident("use"), function("g"))))
+        self.assertEqual(jscodegen.generate(tree), jscodegen.generate(tree, cache=cache))
+        self.assertEqual((1, 2), cache.cache_info()[:2])
+
+    def test_context(self):
+        # The same function generated at another precedence, indentation
+        # or format is a different entry
+        helper = function("f")
+        cache = SubtreeCache()
+        trees = [program(statement(call(ident("use"), helper))),
+                 program(statement(call(helper))),
+                 program({"type": "BlockStatement", "body": [statement(call(ident("use"), helper))]})]
+        for tree in trees:
+            for compact in (False, True):
+                self.assertEqual(jscodegen.generate(tree, compact=compact),
+                                 jscodegen.generate(tree, compact=compact, cache=cache))
+        # except that compact output is not indented
+        self.assertEqual((1, 5), cache.cache_info()[:2])
+
+    def test_eviction(self):
+        helpers = [function("f%d" % i) for i in range(3)]
+        cache = SubtreeCache(maxsize=2)
+        for helper in helpers + helpers[2:] + helpers[:1]:
+            jscodegen.generate(program(statement(call(ident("use"), helper))), cache=cache)
+        self.assertEqual((1, 4, 2, 2), cache.cache_info())
+        cache.clear()
+        self.assertEqual((0, 0, 2, 0), cache.cache_info())
+
+    def test_streaming(self):
+        helper = function("f")
+        tree = program(*[statement(call(ident("use%d" % i), helper)) for i in range(50)])
+        cache = SubtreeCache()
+        expected = jscodegen.generate(tree)
+        self.assertEqual(expected, "".join(jscodegen.generate_iter(tree, buffer_size=10, cache=cache)))
+        self.assertEqual(expected, jscodegen.generate(tree, cache=cache))
+
+    def test_deferred(self):
+        class Shallow(jscodegen.CodeGenerator):
+            max_inline_depth = 3
+
+        helper = function("f")
+        tree = program(*[statement(call(ident("use"), call(ident("use"), helper))) for i in range(3)])
+        generator = Shallow(2, SubtreeCache())
+        self.assertEqual(jscodegen.generate(tree), generator.generate(tree))
+        self.assertEqual(jscodegen.generate(tree), generator.generate(tree))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+from estree import ident, unary, binary, statement, block, program
+
+
+def literal(value):
+    return {"type": "Literal", "value": value, "raw": json.dumps(value)}
+
+
+def compact(*body):
+    return jscodegen.generate(program(*body), compact=True)
+
+
+class CompactTestCase(unittest.TestCase):
+
+    def test_function(self):
+        result = compact({"type": "FunctionDeclaration", "id": ident("f"), "params": [ident("a"), ident("b")],
+                          "body": block({"type": "VariableDeclaration", "kind": "var", "declarations": [
+                              {"type": "VariableDeclarator", "id": ident("c"), "init": binary("+", ident("a"), ident("b"))},
+                              {"type": "VariableDeclarator", "id": ident("d"), "init": None}]},
+                              {"type": "ReturnStatement", "argument": {"type": "ArrayExpression", "elements": [ident("c"), ident("d")]}})})
+        self.assertEqual("function f(a,b){var c=a+b,d;return[c,d]}", result)
+
+    def test_keyword_separator(self):
+        self.assertEqual('return"s";', compact({"type": "ReturnStatement", "argument": literal("s")}))
+        self.assertEqual("return a;", compact({"type": "ReturnStatement", "argument": ident("a")}))
+        self.assertEqual("throw new Error();", compact({"type": "ThrowStatement", "argument": {
+            "type": "NewExpression", "callee": ident("Error"), "arguments": []}}))
+        self.assertEqual("typeof a;!a;", compact(statement(unary("typeof", ident("a"))), statement(unary("!", ident("a")))))
+
+    def test_else(self):
+        result = compact({"type": "IfStatement", "test": ident("a"), "consequent": statement(ident("b")),
+                          "alternate": {"type": "IfStatement", "test": ident("c"), "consequent": block(statement(ident("d"))),
+                                        "alternate": block()}})
+        self.assertEqual("if(a)b;else if(c){d}else{}", result)
+
+    def test_operator_separator(self):
+        self.assertEqual("a- -b;", compact(statement(binary("-", ident("a"), unary("-", ident("b"))))))
+        self.assertEqual("a+ ++b;", compact(statement(binary("+", ident("a"), {
+            "type": "UpdateExpression", "operator": "++", "argument": ident("b"), "prefix": True}))))
+        self.assertEqual("a-+b;", compact(statement(binary("-", ident("a"), unary("+", ident("b"))))))
+        self.assertEqual("a- -b*c;", compact(statement(binary("-", ident("a"), binary("*", unary("-", ident("b")), ident("c"))))))
+        self.assertEqual("a-(-b<<c);", compact(statement(binary("-", ident("a"), binary("<<", unary("-", ident("b")), ident("c"))))))
+        self.assertEqual("a/ /x/;", compact(statement(binary("/", ident("a"), {
+            "type": "Literal", "value": None, "regex": {"pattern": "x", "flags": ""}}))))
+        self.assertEqual("a in b;", compact(statement(binary("in", ident("a"), ident("b")))))
+
+    def test_unary_separator(self):
+        # Also needed in the default format
+        self.assertEqual("- -a;\n", jscodegen.generate(program(statement(unary("-", unary("-", ident("a")))))))
+        self.assertEqual("- -a;", compact(statement(unary("-", unary("-", ident("a"))))))
+
+    def test_semicolon_before_brace(self):
+        loop = {"type": "WhileStatement", "test": ident("a"), "body": {"type": "EmptyStatement"}}
+        self.assertEqual("{a;b}", compact(block(statement(ident("a")), statement(ident("b")))))
+        self.assertEqual("{while(a);}", compact(block(loop)))
+        self.assertEqual("{if(a)b}", compact(block({"type": "IfStatement", "test": ident("a"),
+                                                     "consequent": statement(ident("b")), "alternate": None})))
+
+    def test_switch(self):
+        result = compact({"type": "SwitchStatement", "discriminant": ident("a"), "cases": [
+            {"type": "SwitchCase", "test": literal(1), "consequent": [statement(ident("b")), {"type": "BreakStatement", "label": None}]},
+            {"type": "SwitchCase", "test": None, "consequent": [statement(ident("c"))]}]})
+        self.assertEqual("switch(a){case 1:b;break;default:c}", result)
+
+    def test_member_chain(self):
+        then = {"type": "CallExpression", "arguments": [ident("f")], "callee": {
+            "type": "MemberExpression", "computed": False, "object": ident("p"), "property": ident("then")}}
+        self.assertEqual("p.then(f);", compact(statement(then)))
+        number = {"type": "CallExpression", "arguments": [], "callee": {
+            "type": "MemberExpression", "computed": False, "object": literal(1), "property": ident("toString")}}
+        self.assertEqual("1 .toString();", compact(statement(number)))
+
+    def test_object(self):
+        result = compact(statement({"type": "AssignmentExpression", "operator": "=", "left": ident("o"), "right": {
+            "type": "ObjectExpression", "properties": [
+                {"type": "Property", "key": ident("a"), "value": literal(1), "kind": "init"},
+                {"type": "Property", "key": ident("b"), "value": {"type": "ObjectExpression", "properties": []}, "kind": "init"}]}}))
+        self.assertEqual("o={a:1,b:{}};", result)
+
+    def test_streaming(self):
+        tree = program(*[block(statement(ident("a%d" % i)), statement(ident("b"))) for i in range(100)])
+        self.assertEqual(jscodegen.generate(tree, compact=True),
+                         "".join(jscodegen.generate_iter(tree, buffer_size=10, compact=True)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import gzip
+import io
+import json
+import sys
+import unittest
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+
+
+def program(n):
+    return {"type": "Program", "body": [{"type": "ExpressionStatement", "expression": {
+        "type": "CallExpression", "callee": {"type": "Identifier", "name": "f"},
+        "arguments": [{"type": "Literal", "value": "ü%d" % i}]}} for i in range(n)]}
+
+
+class CompressTestCase(unittest.TestCase):
+
+    def test_formats(self):
+        tree = program(500)
+        code = jscodegen.generate(tree).encode("utf-8")
+        decompress = {"gzip": gzip.decompress, "zlib": zlib.decompress,
+                      "deflate": lambda data: zlib.decompress(data, -zlib.MAX_WBITS)}
+        for format in ("gzip", "zlib", "deflate"):
+            fp = io.BytesIO()
+            info = jscodegen.generate_compressed_to(tree, fp, format, buffer_size=1000)
+            self.assertEqual(code, decompress[format](fp.getvalue()))
+            self.assertEqual((len(code), len(fp.getvalue())), info)
+            self.assertLess(info.compressed_size, info.raw_size)
+
+    def test_options(self):
+        tree = program(500)
+        sizes = []
+        for level in (0, 9):
+            fp = io.BytesIO()
+            sizes.append(jscodegen.generate_compressed_to(tree, fp, level=level, compact=True).compressed_size)
+            self.assertEqual(jscodegen.generate(tree, compact=True), gzip.decompress(fp.getvalue()).decode())
+        self.assertLess(sizes[1], sizes[0])
+        with self.assertRaises(ValueError):
+            jscodegen.CompressedWriter(io.BytesIO(), "brotli")
+        with self.assertRaises(ValueError):
+            jscodegen.CompressedWriter(io.BytesIO(), flush="partial")
+
+    def test_passes(self):
+        class Rename(jscodegen.Pass):
+            def identifier(self, node):
+                return dict(node, name="g")
+
+        tree = program(10)
+        fp = io.BytesIO()
+        jscodegen.generate_compressed_to(tree, fp, passes=[Rename()])
+        self.assertEqual(jscodegen.generate(tree, passes=[Rename()]), gzip.decompress(fp.getvalue()).decode())
+        self.assertIn("g(", gzip.decompress(fp.getvalue()).decode())
+
+    def test_sync_flush(self):
+        # Everything written so far can be decompressed before the end
+        fp = io.BytesIO()
+        writer = jscodegen.CompressedWriter(fp, "zlib", flush="sync")
+        jscodegen.generate_to(program(100), writer, buffer_size=100)
+        code = jscodegen.generate(program(100)).encode("utf-8")
+        self.assertEqual(code, zlib.decompressobj().decompress(fp.getvalue()))
+        writer.close()
+        self.assertEqual(code, zlib.decompress(fp.getvalue()))
+        self.assertFalse(fp.closed)
+
+    def test_json_input(self):
+        tree = program(200)
+        fp = io.BytesIO()
+        with jscodegen.CompressedWriter(fp) as writer:
+            jscodegen.generate_json_to(json.dumps(tree).encode("utf-8"), writer, buffer_size=100)
+        self.assertEqual(jscodegen.generate(tree), gzip.decompress(fp.getvalue()).decode())
+        self.assertEqual(len(fp.getvalue()), writer.info().compressed_size)
+
+
+if __name__ == '__main__':
+    unittest.main()
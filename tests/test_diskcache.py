@@ -0,0 +1,104 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+from jscodegen.diskcache import DiskCache
+
+
+def program(name, size=1):
+    return {"type": "Program", "body": [{"type": "ExpressionStatement", "expression": {
+        "type": "CallExpression", "callee": {"type": "Identifier", "name": name},
+        "arguments": [{"type": "Literal", "value": "x" * size}]},
+        "loc": {"start": {"line": 1, "column": 0}, "end": {"line": 1, "column": 1}}}]}
+
+
+def generate_all(directory, names):
+    cache = DiskCache(directory, maxsize=20000)
+    return [jscodegen.generate(program(name, 400), disk_cache=cache) for name in names]
+
+
+class DiskCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary = tempfile.TemporaryDirectory()
+        self.directory = self.temporary.name
+
+    def tearDown(self):
+        self.temporary.cleanup()
+
+    def test_hits(self):
+        cache = DiskCache(self.directory)
+        self.assertEqual("f(\"x\");\n", jscodegen.generate(program("f"), disk_cache=cache))
+        self.assertEqual("f(\"x\");\n", jscodegen.generate(program("f"), disk_cache=cache))
+        self.assertEqual('f("x");', jscodegen.generate(program("f"), compact=True, disk_cache=cache))
+        self.assertEqual("g(\"x\");\n", jscodegen.generate(program("g"), disk_cache=cache))
+        info = cache.cache_info()
+        self.assertEqual((1, 3), (info.hits, info.misses))
+        self.assertGreater(info.currsize, 0)
+        # Another process, or a later run
+        other = DiskCache(self.directory)
+        self.assertEqual('f("x");', jscodegen.generate(program("f"), compact=True, disk_cache=other))
+        self.assertEqual((1, 0), other.cache_info()[:2])
+        other.clear()
+        self.assertEqual((0, 0, 0), other.cache_info()[:2] + other.cache_info()[-1:])
+
+    def test_source_map(self):
+        cache = DiskCache(self.directory)
+        expected = jscodegen.generate_with_source_map(program("f"), file="f.js", source="f.src.js")
+        for _ in range(2):
+            self.assertEqual(expected, jscodegen.generate_with_source_map(
+                program("f"), file="f.js", source="f.src.js", disk_cache=cache))
+        self.assertEqual(expected[0], jscodegen.generate(program("f"), disk_cache=cache))
+        self.assertEqual((1, 2), cache.cache_info()[:2])
+
+    def test_json(self):
+        cache = DiskCache(Path(self.directory) / "cache")
+        source = json.dumps(program("f")).encode("utf-8")
+        path = Path(self.directory) / "f.json"
+        path.write_bytes(source)
+        for _ in range(2):
+            self.assertEqual("f(\"x\");\n", cache.generate_json(source))
+            fp = io.StringIO()
+            jscodegen.generate_json_to(str(path), fp, compact=True, disk_cache=cache)
+            self.assertEqual('f("x");', fp.getvalue())
+        self.assertEqual((2, 2), cache.cache_info()[:2])
+
+    def test_damaged_entry(self):
+        cache = DiskCache(self.directory)
+        jscodegen.generate(program("f"), disk_cache=cache)
+        path, = [entry[2] for entry in cache.entries()]
+        with open(path, "r+b") as fp:
+            fp.truncate(os.path.getsize(path) - 1)
+        self.assertEqual("f(\"x\");\n", jscodegen.generate(program("f"), disk_cache=cache))
+        self.assertEqual((0, 2), cache.cache_info()[:2])
+
+    def test_eviction(self):
+        cache = DiskCache(self.directory, maxsize=5000)
+        for i in range(40):
+            jscodegen.generate(program("f%d" % i, 1000), disk_cache=cache)
+        self.assertLessEqual(cache.cache_info().currsize, 5000)
+        # The most recent entries are kept
+        jscodegen.generate(program("f39", 1000), disk_cache=cache)
+        self.assertEqual(1, cache.cache_info().hits)
+
+    def test_processes(self):
+        # Together they write more than fits, so they also evict at once
+        names = ["f%d" % i for i in range(100)]
+        with ProcessPoolExecutor(4) as executor:
+            results = list(executor.map(generate_all, [self.directory] * 4, [names] * 4))
+        expected = [jscodegen.generate(program(name, 400)) for name in names]
+        self.assertEqual([expected] * 4, results)
+        self.assertEqual(expected + ['g("%s");\n' % ("x" * 400)], generate_all(self.directory, names + ["g"]))
+        self.assertLessEqual(DiskCache(self.directory).cache_info().currsize, 20000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+import copy
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+from jscodegen.fold import Folder
+from estree import ident, literal, unary, binary, statement, block, program
+
+try:
+    import esprima
+except ImportError:
+    esprima = None
+
+
+def logical(operator, left, right):
+    return {"type": "LogicalExpression", "operator": operator, "left": left, "right": right}
+
+
+def conditional(test, consequent, alternate):
+    return {"type": "ConditionalExpression", "test": test, "consequent": consequent, "alternate": alternate}
+
+
+def call(callee):
+    return {"type": "CallExpression", "callee": callee, "arguments": []}
+
+
+def if_statement(test, consequent, alternate=None):
+    return {"type": "IfStatement", "test": test, "consequent": consequent, "alternate": alternate}
+
+
+def var(*names):
+    return {"type": "VariableDeclaration", "kind": "var", "declarations": [
+        {"type": "VariableDeclarator", "id": ident(name), "init": literal(1)} for name in names]}
+
+
+def folded(*body):
+    return jscodegen.generate(program(*body), compact=True, fold=True)
+
+
+class FoldTestCase(unittest.TestCase):
+
+    def test_arithmetic(self):
+        self.assertEqual("x=6e4;", folded(statement({
+            "type": "AssignmentExpression", "operator": "=", "left": ident("x"),
+            "right": binary("*", binary("*", literal(1), literal(60)), literal(1000))})))
+        self.assertEqual("-1.5;", folded(statement(binary("-", literal(1), literal(2.5)))))
+        self.assertEqual("-0;", folded(statement(unary("-", literal(0)))))
+        self.assertEqual("3;", folded(statement(binary(">>>", literal(7), literal(1)))))
+        self.assertEqual("-1;", folded(statement(binary("|", literal(4294967295), literal(0)))))
+        self.assertEqual("-1;", folded(statement(binary("%", unary("-", literal(7)), literal(2)))))
+
+    def test_not_folded(self):
+        # Longer as values, or not the same in JavaScript
+        for expression in (binary("/", literal(1), literal(3)), binary("/", literal(1), literal(0)),
+                           binary("<", literal(1), literal(2)), binary("==", literal(1), literal("1")),
+                           binary("+", literal(2 ** 53), literal(1)), binary("+", ident("x"), literal(1)),
+                           binary("<", literal("\U0001f600"), literal("￿"))):
+            tree = program(statement(expression))
+            self.assertEqual(jscodegen.generate(tree, compact=True), folded(statement(expression)))
+
+    def test_strings(self):
+        self.assertEqual('"ab";', folded(statement(binary("+", literal("a"), literal("b")))))
+        self.assertEqual('"a1null0true";', folded(statement(binary("+", binary("+", binary("+", binary(
+            "+", literal("a"), literal(1)), literal(None)), unary("-", literal(0))), literal(True)))))
+        self.assertEqual('"a"+1/3;', folded(statement(binary("+", literal("a"), binary("/", literal(1), literal(3))))))
+        self.assertEqual('"number";', folded(statement(unary("typeof", literal(1.5)))))
+        self.assertEqual("true;", folded(statement(binary("===", literal(1), literal(1.0)))))
+        self.assertEqual("true;", folded(statement(binary("!==", literal(1), literal(True)))))
+
+    def test_logical(self):
+        self.assertEqual("x;", folded(statement(logical("&&", literal(1), ident("x")))))
+        self.assertEqual("0;", folded(statement(logical("&&", literal(0), ident("x")))))
+        self.assertEqual("x;", folded(statement(logical("||", literal(""), ident("x")))))
+        self.assertEqual("0;", folded(statement(logical("??", literal(0), ident("x")))))
+        self.assertEqual("x;", folded(statement(logical("??", literal(None), ident("x")))))
+        self.assertEqual("y&&x;", folded(statement(logical("&&", ident("y"), logical("||", literal(0), ident("x"))))))
+        # Called as a value, not as a method of o
+        member = {"type": "MemberExpression", "object": ident("o"), "property": ident("m"), "computed": False}
+        self.assertEqual("(0,o.m)();", folded(statement(call(logical("||", literal(0), member)))))
+        self.assertEqual("o.m();", folded(statement(call(member))))
+        self.assertEqual("typeof o.m;", folded(statement(unary("typeof", logical("||", literal(0), member)))))
+
+    def test_branches(self):
+        self.assertEqual("a();", folded(statement(conditional(literal("x"), call(ident("a")), call(ident("b"))))))
+        self.assertEqual("b();", folded(if_statement(binary("===", literal(1), literal(2)),
+                                                     statement(call(ident("a"))), statement(call(ident("b"))))))
+        self.assertEqual("x();", folded(if_statement(literal(False), block(statement(call(ident("a"))))),
+                                        statement(call(ident("x")))))
+        # if (1 / 3) is decided though 1 / 3 stays as it is
+        self.assertEqual("a();", folded(if_statement(binary("/", literal(1), literal(3)), statement(call(ident("a"))))))
+        self.assertEqual("", folded(if_statement(literal(0), statement(call(ident("a"))))))
+        self.assertEqual("while(x);", folded({"type": "WhileStatement", "test": ident("x"),
+                                              "body": if_statement(literal(0), statement(call(ident("a"))))}))
+
+    def test_hoisting(self):
+        function = {"type": "FunctionDeclaration", "id": ident("f"), "params": [], "body": block(var("inner"))}
+        self.assertEqual("var a,f,b;", folded(if_statement(literal(0), block(var("a"), function, block(var("b")),
+                                                                             var("a")))))
+        self.assertEqual("{x();var a}", folded(if_statement(literal(1), statement(call(ident("x"))), var("a"))))
+        # Patterns are left as they are
+        pattern = {"type": "VariableDeclaration", "kind": "var", "declarations": [
+            {"type": "VariableDeclarator", "id": {"type": "ArrayPattern", "elements": [ident("a")]}, "init": None}]}
+        tree = program(if_statement(literal(0), pattern))
+        self.assertIs(tree, jscodegen.fold_constants(tree))
+
+    def test_directives(self):
+        self.assertEqual('"use strict";;"a";x;', folded(
+            statement(literal("use strict")), if_statement(literal(0), statement(ident("y"))),
+            statement(literal("a")), statement(ident("x"))))
+        self.assertEqual('x;"a";', folded(
+            statement(ident("x")), if_statement(literal(0), statement(ident("y"))), statement(literal("a"))))
+
+    def test_dangling_else(self):
+        tree = program(if_statement(ident("a"), if_statement(literal(1), if_statement(ident("b"), statement(ident("x")))),
+                                    statement(ident("y"))))
+        self.assertEqual("if (a) {\n  if (b) x;\n} else y;\n", jscodegen.generate(tree, fold=True))
+
+    def test_statement_start(self):
+        # A statement that starts with function or { is a declaration or a
+        # block
+        function = {"type": "FunctionExpression", "id": None, "params": [], "body": block()}
+        obj = {"type": "ObjectExpression", "properties": [
+            {"type": "Property", "key": ident("a"), "value": literal(1), "kind": "init", "computed": False}]}
+        self.assertEqual("0,function(){}();", folded(statement(logical("||", literal(False), call(function)))))
+        self.assertEqual("0,{a:1};", folded(statement(logical("&&", literal(True), obj))))
+        self.assertEqual("0,function(){}();", folded(statement(conditional(literal(True), call(function), literal(0)))))
+        self.assertEqual("0,function(){}();", folded(statement(call(logical("||", literal(False), function)))))
+        self.assertEqual("x;", folded(statement(logical("&&", literal(True), ident("x")))))
+        # Nor the body of an arrow function with {
+        arrow = {"type": "ArrowFunctionExpression", "id": None, "params": [],
+                 "body": logical("&&", literal(True), obj), "expression": True}
+        self.assertEqual("x=()=>true&&{a:1};", folded(statement({
+            "type": "AssignmentExpression", "operator": "=", "left": ident("x"), "right": arrow})))
+
+    def test_input_not_modified(self):
+        tree = program(if_statement(literal(1), statement(binary("+", literal(1), literal(2)))),
+                       statement(ident("x")))
+        original = copy.deepcopy(tree)
+        result = jscodegen.fold_constants(tree)
+        self.assertEqual(original, tree)
+        self.assertEqual("3;\nx;\n", jscodegen.generate(result))
+        # Unchanged parts are shared
+        self.assertIs(tree["body"][1], result["body"][1])
+        unchanged = program(statement(ident("x")))
+        self.assertIs(unchanged, jscodegen.fold_constants(unchanged))
+
+    @unittest.skipIf(esprima is None, "esprima is not installed")
+    def test_regex(self):
+        # esprima-python sets the value of a regex literal to the compiled
+        # pattern
+        tree = esprima.parseScript("var r = /a+/g;\nif (0) { var s = /b/; }\nr.x = 1 + 2;")
+        expected = "var r = /a+/g;\nvar s;\nr.x = 3;\n"
+        self.assertEqual(expected, jscodegen.generate(tree, fold=True))
+        self.assertEqual(expected, jscodegen.generate(jscodegen.fold_constants(tree.toDict())))
+
+    def test_slotted(self):
+        tree = program(if_statement(literal(False), var("a"), statement(binary("*", literal(6), literal(7)))))
+        self.assertEqual(jscodegen.generate(tree, fold=True),
+                         jscodegen.generate(jscodegen.to_slotted(tree), fold=True))
+
+    def test_deep(self):
+        expression = literal(0)
+        for i in range(20000):
+            expression = binary("+", expression, literal(1))
+        self.assertEqual("2e4;", folded(statement(expression)))
+
+    def test_counts(self):
+        folder = Folder()
+        folder.fold(program(statement(binary("+", literal(1), literal(2))), if_statement(literal(0), var("a"))))
+        self.assertEqual((1, 1), (folder.folded, folder.dropped))
+
+
+if __name__ == '__main__':
+    unittest.main()
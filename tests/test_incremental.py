@@ -0,0 +1,74 @@
+import copy
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+from jscodegen.incremental import Edit
+from estree import program
+
+
+def statement(name, value):
+    return {"type": "ExpressionStatement", "expression": {
+        "type": "AssignmentExpression", "operator": "=", "left": {"type": "Identifier", "name": name},
+        "right": {"type": "Literal", "value": value, "raw": repr(value)}}}
+
+
+class IncrementalTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.body = [statement("a", 1), {"type": "FunctionDeclaration", "id": {"type": "Identifier", "name": "f"},
+                                         "params": [], "body": {"type": "BlockStatement", "body": [statement("é", 2)]}},
+                     statement("c", 3)]
+
+    def check(self, generator, tree, before, edits):
+        code, changes = generator.update(tree)
+        self.assertEqual(jscodegen.generate(tree), code)
+        patched = before.encode("utf-8")
+        for edit in reversed(changes):
+            patched = patched[:edit.old_start] + code.encode("utf-8")[edit.new_start:edit.new_end] + patched[edit.old_end:]
+        self.assertEqual(code.encode("utf-8"), patched)
+        self.assertEqual(edits, changes)
+        return code
+
+    def test_identity(self):
+        generator = jscodegen.IncrementalGenerator()
+        code = self.check(generator, program(*self.body), "", [Edit(0, 0, 0, 41)])
+        self.assertEqual(3, generator.rendered)
+        # Replace the first statement, insert one after the function and remove the last
+        body = [statement("a", 10)] + self.body[1:2] + [statement("d", 4)]
+        self.check(generator, program(*body), code, [Edit(0, 7, 0, 8), Edit(34, 41, 35, 42)])
+        self.assertEqual(2, generator.rendered)
+
+    def test_unchanged_code(self):
+        generator = jscodegen.IncrementalGenerator()
+        code = self.check(generator, program(*self.body), "", [Edit(0, 0, 0, 41)])
+        self.check(generator, program(copy.deepcopy(self.body[0]), *self.body[1:]), code, [])
+        self.assertEqual(1, generator.rendered)
+
+    def test_version(self):
+        generator = jscodegen.IncrementalGenerator(version="version")
+        code = self.check(generator, program(*self.body), "", [Edit(0, 0, 0, 41)])
+        self.body[2]["expression"]["right"] = {"type": "Literal", "value": 30, "raw": "30"}
+        self.body[2]["version"] = 1
+        self.check(generator, program(*self.body), code, [Edit(34, 41, 34, 42)])
+        self.assertEqual(1, generator.rendered)
+
+    def test_structural(self):
+        generator = jscodegen.IncrementalGenerator(structural=True)
+        code = self.check(generator, program(*self.body), "", [Edit(0, 0, 0, 41)])
+        body = copy.deepcopy(self.body)
+        body[1]["body"]["body"].append(statement("g", 5))
+        self.check(generator, program(*body), code, [Edit(7, 34, 7, 43)])
+        self.assertEqual(1, generator.rendered)
+
+    def test_compact(self):
+        generator = jscodegen.IncrementalGenerator(compact=True)
+        code, edits = generator.update(program(*self.body))
+        self.assertEqual(jscodegen.generate(program(*self.body), compact=True), code)
+
+
+if __name__ == '__main__':
+    unittest.main()
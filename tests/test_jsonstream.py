@@ -0,0 +1,96 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+from jscodegen.jsonstream import iter_statements
+
+
+def statement(i):
+    return {"type": "ExpressionStatement", "expression": {
+        "type": "CallExpression", "callee": {"type": "Identifier", "name": "f"},
+        "arguments": [{"type": "Literal", "value": "é中 %d" % i}, {"type": "Literal", "value": 12345.5 + i},
+                      {"type": "ArrayExpression", "elements": [{"type": "Literal", "value": i}] * 3}]}}
+
+
+PROGRAM = {"type": "Program", "body": [statement(i) for i in range(20)], "sourceType": "script"}
+
+
+class JSONStreamTestCase(unittest.TestCase):
+
+    def test_statements(self):
+        for text in (json.dumps(PROGRAM), json.dumps(PROGRAM, ensure_ascii=False, indent=1)):
+            data = text.encode("utf-8")
+            for chunk_size in (1, 7, 64, 1 << 20):
+                self.assertEqual(PROGRAM["body"], list(iter_statements(data, chunk_size)))
+
+    def test_members(self):
+        tail = {"sourceType": "module", "body": PROGRAM["body"][:2], "type": "Program", "range": [0, 123456]}
+        self.assertEqual(tail["body"], list(iter_statements(json.dumps(tail).encode(), 5)))
+        self.assertEqual([], list(iter_statements(b' { "type" : "Program" , "body" : [ ] } ')))
+        self.assertEqual([], list(iter_statements(b'{}')))
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            list(iter_statements(json.dumps({"type": "Identifier", "name": "x"}).encode()))
+        with self.assertRaises(ValueError):
+            list(iter_statements(json.dumps(PROGRAM).encode()[:-10], 16))
+        with self.assertRaises(ValueError):
+            list(iter_statements(b""))
+
+    def test_generate(self):
+        expected = jscodegen.generate(PROGRAM)
+        data = json.dumps(PROGRAM).encode()
+        self.assertEqual(expected, "".join(jscodegen.generate_json_iter(data)))
+        chunks = list(jscodegen.generate_json_iter(data, buffer_size=100))
+        self.assertEqual(expected, "".join(chunks))
+        self.assertGreater(len(chunks), 5)
+        self.assertEqual(jscodegen.generate(PROGRAM, compact=True),
+                         "".join(jscodegen.generate_json_iter(bytearray(data), compact=True)))
+
+    def test_fold(self):
+        # Statements that fold away are left out, as in the whole Program,
+        # unless a string statement would become a directive
+        dead = {"type": "IfStatement", "test": {"type": "Literal", "value": False}, "consequent": {
+            "type": "ExpressionStatement", "expression": {"type": "Identifier", "name": "x"}}, "alternate": None}
+        directive = {"type": "ExpressionStatement", "expression": {"type": "Literal", "value": "use strict"}}
+        for body, expected in (([dead, statement(0)], 'f("\\u00e9\\u4e2d 0", 12345.5, [0, 0, 0]);\n'),
+                               ([directive, dead, directive, dead], '"use strict";\n;"use strict";\n')):
+            program = {"type": "Program", "body": body}
+            self.assertEqual(expected, jscodegen.generate(program, fold=True))
+            self.assertEqual(expected, "".join(jscodegen.generate_json_iter(json.dumps(program).encode(), fold=True)))
+
+    def test_mangle(self):
+        # The parameter may not take the name of the global of the next
+        # statement, though that statement is parsed later
+        function = {"type": "FunctionDeclaration", "id": {"type": "Identifier", "name": "g"},
+                    "params": [{"type": "Identifier", "name": "x"}], "body": {"type": "BlockStatement", "body": [
+                        {"type": "ReturnStatement", "argument": {"type": "Identifier", "name": "x"}}]}}
+        program = {"type": "Program", "body": [function, {"type": "ExpressionStatement", "expression": {
+            "type": "Identifier", "name": "a"}}]}
+        expected = jscodegen.generate(program, compact=True, mangle=True)
+        self.assertEqual("function g(b){return b}a;", expected)
+        self.assertEqual(expected, "".join(jscodegen.generate_json_iter(json.dumps(program).encode(), compact=True,
+                                                                        mangle=True)))
+
+    def test_file(self):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fp:
+                json.dump(PROGRAM, fp, ensure_ascii=False)
+            fp = io.BytesIO()
+            jscodegen.generate_json_to(path, fp)
+            self.assertEqual(jscodegen.generate(PROGRAM), fp.getvalue().decode("utf-8"))
+            self.assertEqual(PROGRAM["body"], list(iter_statements(Path(path))))
+        finally:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+import random
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+from jscodegen.literals import string_literal, number_literal
+from estree import literal
+
+
+def expression(expr):
+    return {"type": "Program", "body": [{"type": "ExpressionStatement", "expression": expr}]}
+
+
+class StringLiteralTestCase(unittest.TestCase):
+
+    def test_quotes(self):
+        self.assertEqual('"abc"', string_literal("abc"))
+        self.assertEqual('"it\'s"', string_literal("it's"))
+        self.assertEqual("'He said \"hi\"'", string_literal('He said "hi"'))
+        self.assertEqual('"\\"\'"', string_literal('"\''))
+        self.assertEqual("'\"\"\\''", string_literal('""\''))
+
+    def test_escapes(self):
+        self.assertEqual('"a\\nb\\t\\\\"', string_literal("a\nb\t\\"))
+        self.assertEqual('"\\u00e9\\u4e2d\\ud83d\\ude00"', string_literal("é中😀"))
+        self.assertEqual("'\\\\\"\\n'", string_literal('\\"\n'))
+
+
+class NumberLiteralTestCase(unittest.TestCase):
+
+    def test_javascript(self):
+        cases = [(0, "0"), (3, "3"), (1.0, "1"), (0.5, "0.5"), (123.456, "123.456"), (1e16, "10000000000000000"),
+                 (1e21, "1e+21"), (1.5e300, "1.5e+300"), (1e-6, "0.000001"), (2.5e-7, "2.5e-7"),
+                 (5e-324, "5e-324"), (-1.5, "-1.5"), (2 ** 64, "18446744073709551616"), (10 ** 21, "1e+21"),
+                 (float("inf"), "Infinity"), (float("-inf"), "-Infinity"), (float("nan"), "NaN"), (-0.0, "-0")]
+        for value, code in cases:
+            self.assertEqual(code, number_literal(value), value)
+
+    def test_shortest(self):
+        cases = [(0, "0"), (1000, "1e3"), (100, "100"), (1000000, "1e6"), (1234000, "1234e3"), (0.5, ".5"),
+                 (0.001, ".001"), (0.0001, "1e-4"), (1.0, "1"), (1e21, "1e21"), (2.5e-7, "25e-8"),
+                 (-0.5, "-.5")]
+        for value, code in cases:
+            self.assertEqual(code, number_literal(value, True), value)
+
+
+class GenerateLiteralTestCase(unittest.TestCase):
+
+    def test_generate(self):
+        self.assertEqual("'say \"hi\"';\n", jscodegen.generate(expression(literal('say "hi"'))))
+        self.assertEqual("[1, 0.5, 1e+21];\n", jscodegen.generate(expression(
+            {"type": "ArrayExpression", "elements": [literal(1.0), literal(0.5), literal(1e21)]})))
+        self.assertEqual("[1,.5,1e21,1e6];", jscodegen.generate(expression(
+            {"type": "ArrayExpression", "elements": [literal(1.0), literal(0.5), literal(1e21), literal(1000000)]}),
+            compact=True))
+
+    def test_member_access(self):
+        member = {"type": "CallExpression", "arguments": [], "callee": {
+            "type": "MemberExpression", "computed": False, "object": literal(2.0),
+            "property": {"type": "Identifier", "name": "toString"}}}
+        self.assertEqual("2 .toString();\n", jscodegen.generate(expression(member)))
+        member["callee"]["object"] = literal(2.5)
+        self.assertEqual("2.5.toString();\n", jscodegen.generate(expression(member)))
+
+    def test_cache_size(self):
+        class Generator(jscodegen.CodeGenerator):
+            literal_cache_size = 16
+
+        generator = Generator(2)
+        text = "x" * 1000
+        program = expression({"type": "ArrayExpression", "elements": [literal(text), literal(text)]})
+        self.assertEqual('["%s", "%s"];\n' % (text, text), generator.generate(program))
+        self.assertEqual(1, generator.string_literal.cache_info().hits)
+
+
+class PerNodeGenerator(jscodegen.CodeGenerator):
+
+    def literal(self, expr, precedence):
+        super().literal(expr, precedence)
+
+
+class PerNodeCompactGenerator(jscodegen.CompactCodeGenerator):
+
+    def literal(self, expr, precedence):
+        super().literal(expr, precedence)
+
+
+def data(r, depth=0):
+    choice = r.randrange(6 if depth < 3 else 3)
+    if choice == 0:
+        return literal(r.choice([0, 1.5, 1e21, -1, "s", 'q"', True, None]))
+    if choice == 1:
+        return {"type": "Identifier", "name": "a"}
+    if choice == 2:
+        return {"type": "UnaryExpression", "operator": "-", "argument": literal(1), "prefix": True}
+    if choice == 3:
+        return {"type": "ArrayExpression", "elements": [
+            literal(r.randrange(100)) if r.random() < 0.7 else data(r, depth + 1) for _ in range(r.randrange(8))]}
+    return {"type": "ObjectExpression", "properties": [
+        {"type": "Property", "kind": "init",
+         "key": r.choice([{"type": "Identifier", "name": "k"}, literal("k k"), literal(3)]),
+         "value": literal(r.randrange(100)) if r.random() < 0.7 else data(r, depth + 1)}
+        for _ in range(r.randrange(8))]}
+
+
+def namespace(node):
+    if isinstance(node, dict):
+        return SimpleNamespace(**{key: namespace(value) for key, value in node.items()})
+    if isinstance(node, list):
+        return [namespace(item) for item in node]
+    return node
+
+
+class LiteralRunTestCase(unittest.TestCase):
+
+    def test_same_as_per_node(self):
+        r = random.Random(14)
+        for _ in range(300):
+            program = {"type": "Program", "body": [
+                {"type": "VariableDeclaration", "kind": "var", "declarations": [
+                    {"type": "VariableDeclarator", "id": {"type": "Identifier", "name": "x"}, "init": data(r)}]}
+                for _ in range(3)]}
+            for bulk, per_node in ((jscodegen.CodeGenerator(4), PerNodeGenerator(4)),
+                                   (jscodegen.CompactCodeGenerator(), PerNodeCompactGenerator())):
+                self.assertFalse(per_node.literal_run_types)
+                code = per_node.generate(program)
+                self.assertEqual(code, bulk.generate(program))
+                self.assertEqual(code, bulk.generate(namespace(program)))
+
+    def test_instrumented(self):
+        program = expression({"type": "ArrayExpression", "elements": [literal(1), literal(2), literal(3)]})
+        profiler = jscodegen.Profiler()
+        self.assertEqual("[1, 2, 3];\n", jscodegen.generate(program, profiler=profiler))
+        self.assertEqual(3, profiler.report()["Literal"].count)
+        for node in program["body"][0]["expression"]["elements"]:
+            node["loc"] = {"start": {"line": 1, "column": 0}}
+        code, source_map = jscodegen.generate_with_source_map(program)
+        self.assertEqual("[1, 2, 3];\n", code)
+        self.assertEqual("CAAA,GAAA,GAAA", source_map["mappings"])
+
+
+if __name__ == '__main__':
+    unittest.main()
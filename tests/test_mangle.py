@@ -0,0 +1,101 @@
+import copy
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+from jscodegen.mangle import Mangler
+from estree import ident
+
+try:
+    import esprima
+except ImportError:
+    esprima = None
+
+
+def function(name, params, *body):
+    return {"type": "FunctionDeclaration", "id": ident(name), "params": [ident(param) for param in params],
+            "body": {"type": "BlockStatement", "body": list(body)}}
+
+
+def ret(argument):
+    return {"type": "ReturnStatement", "argument": argument}
+
+
+def binary(left, right):
+    return {"type": "BinaryExpression", "operator": "+", "left": left, "right": right}
+
+
+def mangled(source):
+    return jscodegen.generate(esprima.parseScript(source), compact=True, mangle=True)
+
+
+class MangleTestCase(unittest.TestCase):
+
+    def test_parameters(self):
+        tree = {"type": "Program", "body": [
+            function("add", ["first", "second"], ret(binary(binary(ident("first"), ident("second")), ident("g"))))]}
+        original = copy.deepcopy(tree)
+        self.assertEqual("function add(a,b){return a+b+g}", jscodegen.generate(tree, compact=True, mangle=True))
+        self.assertEqual(original, tree)
+
+    def test_unchanged(self):
+        # Nothing local to rename
+        tree = {"type": "Program", "body": [function("f", [], ret(ident("g")))]}
+        self.assertIs(tree, jscodegen.mangle_names(tree))
+
+    def test_counts(self):
+        mangler = Mangler()
+        mangler.mangle({"type": "Program", "body": [function("f", ["value"], ret(ident("value")))]})
+        self.assertEqual((1, 8), (mangler.renamed, mangler.saved))
+
+    def test_deep(self):
+        body = ret(ident("x0"))
+        for i in range(3000):
+            body = function("f%d" % i, ["x%d" % i], body, ret(ident("x%d" % i)))
+        code = jscodegen.generate({"type": "Program", "body": [body]}, compact=True, mangle=True)
+        self.assertNotIn("x2999", code)
+
+    @unittest.skipIf(esprima is None, "esprima is not installed")
+    def test_scopes(self):
+        self.assertEqual("var global=1;function f(a,b){var c=a*b;return c+global}", mangled(
+            "var global = 1; function f(width, height) { var area = width * height; return area + global; }"))
+        # Inner functions do not take the names of outer bindings they use
+        self.assertEqual("function f(a){return function(b){return a+b}}",
+                         mangled("function f(outer) { return function (inner) { return outer + inner; }; }"))
+        # Nor those of globals they use
+        self.assertEqual("function f(b){return a+b}", mangled("function f(value) { return a + value; }"))
+        self.assertEqual("function f(a){{let b=a;a=b}try{}catch(b){a=b}return a}", mangled(
+            "function f(value) { { let copy = value; value = copy; } try {} catch (error) { value = error; }"
+            " return value; }"))
+
+    @unittest.skipIf(esprima is None, "esprima is not installed")
+    def test_regex(self):
+        # esprima-python sets the value of a regex literal to the compiled
+        # pattern
+        source = "function f(value) { var pattern = /a+/g; return pattern.test(value); }"
+        expected = "function f(a){var b=/a+/g;return b.test(a)}"
+        self.assertEqual(expected, mangled(source))
+        self.assertEqual(expected, jscodegen.generate(esprima.parseScript(source).toDict(), compact=True, mangle=True))
+
+    @unittest.skipIf(esprima is None, "esprima is not installed")
+    def test_names_kept(self):
+        # Properties, labels and function names
+        self.assertEqual("function f(a){var b={key:a,value:a};loop:for(;;)break loop;return b.key}", mangled(
+            "function f(value) { var object = {key: value, value}; loop: for (;;) break loop; return object.key; }"))
+        self.assertEqual("function f(){return function inner(){return inner}}",
+                         mangled("function f() { return function inner() { return inner; }; }"))
+        # Names eval may see, and names used in with statements
+        self.assertEqual('function f(value){eval("value");return function(a){return a}}',
+                         mangled('function f(value) { eval("value"); return function (x) { return x; }; }'))
+        self.assertEqual("function f(value,other){with(o)value=other}",
+                         mangled("function f(value, other) { with (o) value = other; }"))
+        # A var that assigns to a catch parameter
+        self.assertEqual("function f(error){try{}catch(error){var error=1}return error}",
+                         mangled("function f(error) { try {} catch (error) { var error = 1; } return error; }"))
+
+
+if __name__ == '__main__':
+    unittest.main()
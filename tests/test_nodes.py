@@ -0,0 +1,57 @@
+import json
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+
+try:
+    import esprima
+except ImportError:
+    esprima = None
+
+CORPUS = Path(__file__).parent.parent / "benchmarks" / "corpus"
+
+
+def to_namespace(node):
+    # Attribute access like esprima-python's Node objects
+    if isinstance(node, list):
+        return [to_namespace(value) for value in node]
+    if isinstance(node, dict):
+        return SimpleNamespace(**{key: to_namespace(value) for key, value in node.items()})
+    return node
+
+
+class NodesTestCase(unittest.TestCase):
+
+    def test_attribute_nodes(self):
+        with open(CORPUS / "app.json") as fp:
+            tree = json.load(fp)
+        nodes = to_namespace(tree)
+        for compact in (False, True):
+            self.assertEqual(jscodegen.generate(tree, compact=compact), jscodegen.generate(nodes, compact=compact))
+        self.assertEqual(jscodegen.generate_with_source_map(tree), jscodegen.generate_with_source_map(nodes))
+
+    def test_try_finalizer(self):
+        block = {"type": "BlockStatement", "body": []}
+        tree = {"type": "Program", "body": [{"type": "TryStatement", "block": block, "handler": {
+            "type": "CatchClause", "param": {"type": "Identifier", "name": "e"}, "body": block}, "finalizer": block}]}
+        self.assertEqual("try {\n} catch (e){\n} finally {\n}\n", jscodegen.generate(tree))
+        self.assertEqual("try{}catch(e){}finally{}", jscodegen.generate(tree, compact=True))
+
+    @unittest.skipIf(esprima is None, "esprima is not installed")
+    def test_esprima(self):
+        source = (CORPUS / "app.js").read_text() + "try { a(); } finally { b(); }\nvar r = /a+/g;\nl: for (;;) break l;\n"
+        tree = esprima.parseScript(source, {"loc": True})
+        code = jscodegen.generate(tree)
+        self.assertEqual(code, jscodegen.generate(esprima.parseScript(code)))
+        self.assertIn("finally {\n  b();\n}", code)
+        self.assertEqual(code, jscodegen.generate_with_source_map(tree)[0])
+        self.assertEqual(code, jscodegen.IncrementalGenerator().update(tree)[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
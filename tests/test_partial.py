@@ -0,0 +1,113 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+from estree import ident, block
+
+
+def call(name, *args):
+    return {"type": "ExpressionStatement", "expression": {
+        "type": "CallExpression", "callee": ident(name),
+        "arguments": [{"type": "Literal", "value": a} for a in args]}}
+
+
+def function(name, *body):
+    return {"type": "FunctionDeclaration", "id": ident(name), "params": [], "body": block(*body)}
+
+
+TREE = {"type": "Program", "body": [
+    function("f",
+             {"type": "IfStatement", "test": ident("a"), "consequent": block(call("g", 1), call("h")),
+              "alternate": None},
+             {"type": "SwitchStatement", "discriminant": ident("b"), "cases": [
+                 {"type": "SwitchCase", "test": {"type": "Literal", "value": 1}, "consequent": [call("g", 2)]},
+                 {"type": "SwitchCase", "test": None, "consequent": [call("g", 3), call("h")]}]},
+             {"type": "ReturnStatement", "argument": {"type": "ObjectExpression", "properties": [
+                 {"type": "Property", "key": ident("key"), "computed": False, "kind": "init",
+                  "value": {"type": "FunctionExpression", "id": None, "params": [], "body": block(call("g"))}}]}}),
+    call("f", "ü")]}
+
+
+class PrefixTestCase(unittest.TestCase):
+
+    def test_bytes(self):
+        code = jscodegen.generate(TREE)
+        size = len(code.encode("utf-8"))
+        for max_bytes in (0, 1, 10, 100, size - 3, size - 1):
+            prefix, truncated = jscodegen.generate_prefix(TREE, max_bytes=max_bytes)
+            self.assertTrue(truncated)
+            self.assertTrue(code.startswith(prefix))
+            self.assertLessEqual(len(prefix.encode("utf-8")), max_bytes)
+            self.assertGreater(len(prefix.encode("utf-8")), max_bytes - 2)
+        self.assertEqual((code, False), jscodegen.generate_prefix(TREE, max_bytes=size))
+        self.assertEqual((code, False), jscodegen.generate_prefix(TREE))
+
+    def test_lines(self):
+        code = jscodegen.generate(TREE)
+        lines = code.splitlines(True)
+        self.assertEqual(("", True), jscodegen.generate_prefix(TREE, max_lines=0))
+        self.assertEqual(("".join(lines[:3]), True), jscodegen.generate_prefix(TREE, max_lines=3))
+        self.assertEqual(("".join(lines[:3])[:20], True), jscodegen.generate_prefix(TREE, max_bytes=20, max_lines=3))
+        self.assertEqual((code, False), jscodegen.generate_prefix(TREE, max_lines=len(lines)))
+        compact = jscodegen.generate(TREE, compact=True)
+        self.assertEqual((compact, False), jscodegen.generate_prefix(TREE, max_lines=1, compact=True))
+
+    def test_stops_early(self):
+        # Generating a statement that is never reached would fail
+        tree = {"type": "Program", "body": [call("f", i) for i in range(2000)] + [{"type": "Unknown"}]}
+        prefix, truncated = jscodegen.generate_prefix(tree, max_lines=10)
+        self.assertEqual("f(0);\n", prefix[:6])
+        self.assertEqual(10, prefix.count("\n"))
+        self.assertTrue(truncated)
+
+
+    def test_not_a_statement(self):
+        with self.assertRaises(ValueError):
+            jscodegen.generate_prefix({"type": "Identifier", "name": "x"}, max_lines=1)
+
+class SubtreeTestCase(unittest.TestCase):
+
+    def check(self, path, expected, compact=False):
+        code = jscodegen.generate_subtree(TREE, path, compact=compact)
+        self.assertEqual(expected, code)
+        self.assertIn(code, jscodegen.generate(TREE, compact=compact))
+
+    def test_statements(self):
+        self.check(("body", 1), 'f("\\u00fc");\n')
+        self.check(("body", 0, "body", "body", 0), "  if (a) {\n    g(1);\n    h();\n  }")
+        self.check(("body", 0, "body", "body", 0, "consequent", "body", 1), "    h();\n")
+        self.check(("body", 0, "body", "body", 1, "cases", 1), "    default:\n      g(3);\n\n      h();\n\n")
+        self.check(("body", 0, "body", "body", 1, "cases", 1, "consequent", 0), "      g(3);\n")
+
+    def test_expressions(self):
+        self.check(("body", 0, "body", "body", 0, "test"), "a")
+        self.check(("body", 0, "body", "body", 2, "argument"),
+                   "{\n    key: function() {\n      g();\n    }\n  }")
+        self.check(("body", 0, "body", "body", 2, "argument", "properties", 0),
+                   "    key: function() {\n      g();\n    }")
+
+    def test_same_line(self):
+        # The parent goes on after the block on the same line
+        tree = {"type": "Program", "body": [
+            {"type": "DoWhileStatement", "test": ident("x"), "body": block(call("a"))},
+            {"type": "IfStatement", "test": ident("x"), "consequent": block(call("b")),
+             "alternate": block(call("c"))}]}
+        code = jscodegen.generate(tree)
+        for path, expected in ((("body", 0, "body"), "{\n  a();\n}"), (("body", 1, "consequent"), "{\n  b();\n}"),
+                               (("body", 1, "alternate"), "{\n  c();\n}\n")):
+            self.assertEqual(expected, jscodegen.generate_subtree(tree, path))
+            self.assertIn(expected, code)
+
+    def test_compact(self):
+        # The semicolon before a "}" is left out, as in the whole program
+        self.check(("body", 0, "body", "body", 0, "consequent", "body", 1), "h()", True)
+        self.check(("body", 0, "body", "body", 0, "consequent", "body", 0), "g(1);", True)
+        self.check(("body", 0, "body", "body", 1, "cases", 1), "default:g(3);h()", True)
+        self.check(("body", 0, "body", "body", 1, "cases", 0), "case 1:g(2);", True)
+
+
+if __name__ == '__main__':
+    unittest.main()
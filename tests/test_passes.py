@@ -0,0 +1,147 @@
+import copy
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+from jscodegen.nodes import fields
+from jscodegen.passes import Pass, Pipeline
+from jscodegen.slotted import to_slotted
+from jscodegen.syntax import Syntax
+from estree import ident, literal, statement, program
+
+CORPUS = Path(__file__).parent.parent / "benchmarks" / "corpus"
+
+
+def count_nodes(node, counts):
+    if isinstance(node, list):
+        for item in node:
+            count_nodes(item, counts)
+    elif isinstance(node, dict) and "type" in node:
+        counts[node["type"]] = counts.get(node["type"], 0) + 1
+        for key, value in node.items():
+            if key != "loc":
+                count_nodes(value, counts)
+    return counts
+
+
+class Count(Pass):
+    """Counts the nodes of every type."""
+
+    def __init__(self):
+        self.counts = {}
+
+    def callbacks(self):
+        return {syntax.value: self.count for syntax in Syntax}
+
+    def count(self, node):
+        node_type = fields(node)["type"]
+        self.counts[node_type] = self.counts.get(node_type, 0) + 1
+
+
+class Rename(Pass):
+
+    def __init__(self, names):
+        self.names = names
+
+    def identifier(self, node):
+        node = fields(node)
+        if node["name"] in self.names:
+            return dict(node.items(), type="Identifier", name=self.names[node["name"]])
+
+
+class PassesTestCase(unittest.TestCase):
+
+    def test_every_node_once(self):
+        tree = json.loads((CORPUS / "app.json").read_text())
+        expected = count_nodes(tree, {})
+        for compact in (False, True):
+            for buffer_size in (None, 64):
+                count = Count()
+                code = "".join(jscodegen.generate_iter(tree, compact=compact, buffer_size=buffer_size,
+                                                       passes=[count]))
+                self.assertEqual("".join(jscodegen.generate_iter(tree, compact=compact, buffer_size=buffer_size)),
+                                 code)
+                self.assertEqual(expected, count.counts)
+
+    def test_deep_tree(self):
+        # Deeper than max_inline_depth, so nodes are deferred before they
+        # are visited
+        node = ident("x")
+        for i in range(1000):
+            node = {"type": "UnaryExpression", "operator": "!", "prefix": True, "argument": node}
+        count = Count()
+        code = jscodegen.generate(program(statement(node)), passes=[count])
+        self.assertEqual("!" * 1000 + "x;\n", code)
+        self.assertEqual({"Program": 1, "ExpressionStatement": 1, "UnaryExpression": 1000, "Identifier": 1},
+                         count.counts)
+
+    def test_rename(self):
+        tree = program({
+            "type": "FunctionDeclaration", "id": ident("f"), "params": [ident("a")],
+            "body": {"type": "BlockStatement", "body": [{
+                "type": "LabeledStatement", "label": ident("a"), "body": {"type": "BreakStatement",
+                                                                          "label": ident("a")}}, {
+                "type": "ReturnStatement", "argument": {"type": "ObjectExpression", "properties": [{
+                    "type": "Property", "key": ident("a"), "value": ident("a"), "kind": "init",
+                    "computed": False, "shorthand": True}]}}]}})
+        original = copy.deepcopy(tree)
+        code = jscodegen.generate(tree, compact=True, passes=[Rename({"a": "b", "f": "g"})])
+        self.assertEqual("function g(b){b:break b;return{b}}", code)
+        self.assertEqual(original, tree)
+
+    def test_order(self):
+        # Each pass sees what the ones before it returned, and a node of
+        # another type goes to the callbacks of that type
+        class Number(Pass):
+            def identifier(self, node):
+                if node["name"] == "two":
+                    return literal(2)
+
+        class Double(Pass):
+            def literal(self, node):
+                return literal(node["value"] * 2)
+
+        tree = program(statement({"type": "BinaryExpression", "operator": "+", "left": ident("one"),
+                                  "right": ident("two")}))
+        self.assertEqual("4+4;", jscodegen.generate(tree, compact=True, passes=[
+            Rename({"one": "two"}), Number(), Double()]))
+        self.assertEqual("two+4;", jscodegen.generate(tree, compact=True, passes=[
+            Rename({"one": "two"}), Number(), Double()][::-1]))
+        pipeline = Pipeline(Number())
+        pipeline.register("Literal", lambda node: literal(str(node["value"])))
+        self.assertEqual('one+"2";', jscodegen.generate(tree, compact=True, passes=pipeline))
+
+    def test_separators(self):
+        # Keywords and operators are separated from what the passes return
+        class Unwrap(Pass):
+            def arrayexpression(self, node):
+                return ident("x")
+
+            def unaryexpression(self, node):
+                if node["argument"]["type"] == "Literal":
+                    return dict(node, argument={"type": "UnaryExpression", "operator": "+", "prefix": True,
+                                                "argument": ident("y")})
+
+        tree = program({"type": "ReturnStatement", "argument": {"type": "ArrayExpression", "elements": []}},
+                       statement({"type": "UnaryExpression", "operator": "+", "prefix": True,
+                                  "argument": literal(1)}))
+        self.assertEqual("return[];+1;", jscodegen.generate(tree, compact=True))
+        self.assertEqual("return x;+ +y;", jscodegen.generate(tree, compact=True, passes=[Unwrap()]))
+
+    def test_slotted(self):
+        tree = to_slotted(program(statement({"type": "CallExpression", "callee": {
+            "type": "MemberExpression", "object": ident("a"), "property": ident("f"), "computed": False},
+            "arguments": [ident("a")]})))
+        self.assertEqual("b.f(b);\n", jscodegen.generate(tree, passes=[Rename({"a": "b"})]))
+
+    def test_disk_cache(self):
+        with self.assertRaises(ValueError):
+            jscodegen.generate(program(), disk_cache=object(), passes=[Count()])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+from estree import ident
+
+
+# a = b + 1;
+# f(a);
+PROGRAM = {"type": "Program", "body": [
+    {"type": "ExpressionStatement", "expression": {
+        "type": "AssignmentExpression", "operator": "=", "left": ident("a"), "right": {
+            "type": "BinaryExpression", "operator": "+", "left": ident("b"),
+            "right": {"type": "Literal", "value": 1, "raw": "1"}}}},
+    {"type": "ExpressionStatement", "expression": {"type": "CallExpression", "callee": ident("f"),
+                                                   "arguments": [ident("a")]}}]}
+
+
+class ProfilerTestCase(unittest.TestCase):
+
+    def test_report(self):
+        profiler = jscodegen.Profiler()
+        code = jscodegen.generate(PROGRAM, profiler=profiler)
+        self.assertEqual("a = b + 1;\nf(a);\n", code)
+        report = profiler.report()
+        self.assertEqual({"Program": (1, 0), "ExpressionStatement": (2, 4), "AssignmentExpression": (1, 3),
+                          "BinaryExpression": (1, 3), "Identifier": (4, 4), "Literal": (1, 1),
+                          "CallExpression": (1, 2)},
+                         {node_type: (profile.count, profile.chars) for node_type, profile in report.items()})
+        for profile in report.values():
+            self.assertLessEqual(profile.self_time, profile.total_time)
+        self.assertGreaterEqual(report["Program"].total_time, report["ExpressionStatement"].total_time)
+        self.assertEqual(sorted(report.values(), key=lambda profile: -profile.self_time), list(report.values()))
+        self.assertIn("AssignmentExpression", profiler.format_report())
+
+    def test_chars(self):
+        # Characters, not bytes of UTF-8
+        profiler = jscodegen.Profiler()
+        jscodegen.generate({"type": "Program", "body": [
+            {"type": "ExpressionStatement", "expression": ident("é中")}]}, profiler=profiler)
+        self.assertEqual(2, profiler.report()["Identifier"].chars)
+
+    def test_callback(self):
+        visits = []
+        profiler = jscodegen.Profiler(lambda *values: visits.append(values))
+        jscodegen.generate(PROGRAM, profiler=profiler)
+        jscodegen.generate(PROGRAM, profiler=profiler)
+        self.assertEqual(22, len(visits))
+        self.assertEqual(("Identifier", 1), (visits[0][0], visits[0][3]))
+        self.assertEqual(2, profiler.report()["Program"].count)
+        profiler.clear()
+        self.assertEqual({}, profiler.report())
+
+    def test_deferred(self):
+        class Shallow(jscodegen.CodeGenerator):
+            max_inline_depth = 2
+
+        profiler = jscodegen.Profiler()
+        self.assertEqual(jscodegen.generate(PROGRAM), Shallow(2, profiler=profiler).generate(PROGRAM))
+        self.assertEqual(4, profiler.report()["Identifier"].count)
+
+    def test_streaming(self):
+        profiler = jscodegen.Profiler()
+        self.assertEqual(jscodegen.generate(PROGRAM),
+                         "".join(jscodegen.generate_iter(PROGRAM, buffer_size=1, profiler=profiler)))
+        self.assertEqual(2, profiler.report()["ExpressionStatement"].count)
+
+    def test_disabled(self):
+        generator = jscodegen.CodeGenerator(2)
+        generator.generate(PROGRAM)
+        self.assertNotIn("generate_expression", vars(generator))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import copy
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+from estree import ident
+
+
+def program(i):
+    # function f<i>(x) { if (x) return [<i>, null, /a/g, {k: "v"}]; else x = x + i; }
+    return {"type": "Program", "body": [
+        {"type": "FunctionDeclaration", "id": ident("f%d" % i), "params": [ident("x")],
+         "body": {"type": "BlockStatement", "body": [
+             {"type": "IfStatement", "test": ident("x"),
+              "consequent": {"type": "ReturnStatement", "argument": {"type": "ArrayExpression", "elements": [
+                  {"type": "Literal", "value": i}, {"type": "Literal", "raw": "null"},
+                  {"type": "Literal", "regex": {"pattern": "a", "flags": "g"}},
+                  {"type": "ObjectExpression", "properties": [
+                      {"type": "Property", "key": ident("k"), "value": {"type": "Literal", "value": "v"},
+                       "kind": "init"}]}]}},
+              "alternate": {"type": "ExpressionStatement", "expression": {
+                  "type": "AssignmentExpression", "operator": "=", "left": ident("x"), "right": {
+                      "type": "BinaryExpression", "operator": "+", "left": ident("x"),
+                      "right": {"type": "Literal", "value": i}}}}}]}}]}
+
+
+class ReentrantTestCase(unittest.TestCase):
+
+    def test_input_not_modified(self):
+        tree = program(1)
+        original = copy.deepcopy(tree)
+        self.assertIn("null", jscodegen.generate(tree))
+        jscodegen.generate(tree, compact=True, cache=jscodegen.SubtreeCache(), profiler=jscodegen.Profiler())
+        jscodegen.generate_with_source_map(tree)
+        self.assertEqual(original, tree)
+
+    def test_interleaved(self):
+        generator = jscodegen.CodeGenerator(2)
+        expected = [generator.generate(program(i)) for i in range(3)]
+        pending = [(i, generator.generate_iter(program(i), 8, None, 1)) for i in range(3)]
+        chunks = [[], [], []]
+        while pending:
+            for i, iterator in pending:
+                chunks[i].append(next(iterator, ""))
+            pending = [(i, iterator) for i, iterator in pending if iterator.gi_frame is not None]
+        self.assertEqual(expected, ["".join(parts) for parts in chunks])
+        # The generator and the copies made for the calls are free again
+        self.assertIn(generator, generator.idle)
+
+    def test_threads(self):
+        profiler = jscodegen.Profiler()
+        generator = jscodegen.CompactCodeGenerator(0, jscodegen.SubtreeCache(16, structural=True), profiler)
+        trees = [program(i % 20) for i in range(200)]
+        expected = [jscodegen.generate(tree, compact=True) for tree in trees]
+        with ThreadPoolExecutor(8) as executor:
+            self.assertEqual(expected, list(executor.map(generator.generate, trees)))
+        self.assertEqual(200, profiler.report()["Program"].count)
+
+
+if __name__ == '__main__':
+    unittest.main()
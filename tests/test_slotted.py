@@ -0,0 +1,111 @@
+import copy
+import pickle
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+from jscodegen.cache import fingerprint
+from jscodegen.slotted import SYNTAX_CLASSES
+
+try:
+    import esprima
+except ImportError:
+    esprima = None
+
+
+def ident(name, line=1, column=0):
+    return {"type": "Identifier", "name": name,
+            "loc": {"start": {"line": line, "column": column}, "end": {"line": line, "column": column + len(name)}}}
+
+
+# if (a) { f(a, [1, "x"], /y+/g); } else x = {k: 1};
+PROGRAM = {"type": "Program", "sourceType": "script", "body": [
+    {"type": "IfStatement", "test": ident("a", 1, 4),
+     "consequent": {"type": "BlockStatement", "body": [
+         {"type": "ExpressionStatement", "expression": {
+             "type": "CallExpression", "callee": ident("f", 1, 9), "arguments": [
+                 ident("a", 1, 11),
+                 {"type": "ArrayExpression", "elements": [{"type": "Literal", "value": 1, "raw": "1"},
+                                                          {"type": "Literal", "value": "x", "raw": '"x"'}]},
+                 {"type": "Literal", "value": None, "raw": "/y+/g", "regex": {"pattern": "y+", "flags": "g"}}]}}]},
+     "alternate": {"type": "ExpressionStatement", "expression": {
+         "type": "AssignmentExpression", "operator": "=", "left": ident("x", 1, 30), "right": {
+             "type": "ObjectExpression", "properties": [
+                 {"type": "Property", "key": ident("k"), "value": {"type": "Literal", "value": 1, "raw": "1"},
+                  "kind": "init", "computed": False}]}}}}]}
+
+
+def namespace(node):
+    if isinstance(node, dict):
+        return SimpleNamespace(**{key: namespace(value) for key, value in node.items()})
+    if isinstance(node, list):
+        return [namespace(item) for item in node]
+    return node
+
+
+class SlottedTestCase(unittest.TestCase):
+
+    def test_generate(self):
+        slotted = jscodegen.to_slotted(PROGRAM)
+        for compact in (False, True):
+            self.assertEqual(jscodegen.generate(PROGRAM, compact=compact),
+                             jscodegen.generate(slotted, compact=compact))
+        self.assertEqual(jscodegen.generate(PROGRAM), jscodegen.generate(jscodegen.to_slotted(namespace(PROGRAM))))
+        self.assertEqual(jscodegen.generate_with_source_map(PROGRAM),
+                         jscodegen.generate_with_source_map(slotted))
+
+    def test_nodes(self):
+        slotted = jscodegen.to_slotted(PROGRAM)
+        test = slotted["body"][0]["test"]
+        self.assertIs(SYNTAX_CLASSES["Identifier"], type(test))
+        self.assertFalse(hasattr(test, "__dict__"))
+        self.assertEqual(("Identifier", "a"), (test["type"], test.name))
+        self.assertEqual(4, test["loc"]["start"]["column"])
+        literal = slotted["body"][0]["consequent"]["body"][0]["expression"]["arguments"][1]["elements"][0]
+        self.assertNotIn("regex", literal)
+        self.assertIsNone(literal.get("regex"))
+        self.assertIn("raw", literal)
+        self.assertEqual([("value", 1), ("raw", "1")], literal.items())
+
+    def test_extra_fields(self):
+        node = jscodegen.to_slotted({"type": "Identifier", "name": "a", "optional": False})
+        self.assertEqual("Identifier", type(node).__name__)
+        self.assertIn("optional", node)
+        node = jscodegen.to_slotted({"type": "TemplateElement", "value": {"raw": "a", "cooked": "a"}, "tail": True})
+        self.assertEqual(("TemplateElement", {"raw": "a", "cooked": "a"}), (node["type"], node["value"]))
+
+    @unittest.skipIf(esprima is None, "esprima is not installed")
+    def test_regex(self):
+        # esprima-python sets the value of a regex literal to the compiled
+        # pattern, which is kept as it is
+        tree = esprima.parseScript("var r = /a+/g;")
+        slotted = jscodegen.to_slotted(tree)
+        literal = slotted["body"][0]["declarations"][0]["init"]
+        self.assertIs(tree.body[0].declarations[0].init.value, literal["value"])
+        self.assertEqual("var r = /a+/g;\n", jscodegen.generate(slotted))
+        self.assertEqual("var r = /a+/g;\n", jscodegen.generate(jscodegen.to_slotted(tree.toDict())))
+
+    def test_deep(self):
+        expr = {"type": "Identifier", "name": "a"}
+        for _ in range(20000):
+            expr = {"type": "UnaryExpression", "operator": "!", "argument": expr, "prefix": True}
+        program = {"type": "Program", "body": [{"type": "ExpressionStatement", "expression": expr}]}
+        self.assertEqual("!" * 20000 + "a;\n", jscodegen.generate(jscodegen.to_slotted(program)))
+
+    def test_pickle(self):
+        slotted = jscodegen.to_slotted(PROGRAM)
+        copied = pickle.loads(pickle.dumps(slotted))
+        self.assertEqual(jscodegen.generate(slotted), jscodegen.generate(copied))
+        self.assertEqual(fingerprint(slotted), fingerprint(jscodegen.to_slotted(copy.deepcopy(PROGRAM))))
+        cache = jscodegen.SubtreeCache(structural=True)
+        for _ in range(2):
+            self.assertEqual(jscodegen.generate(PROGRAM), jscodegen.generate(copied, cache=cache))
+        self.assertEqual(2, cache.cache_info().hits)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+from jscodegen.sourcemap import SourceMap, vlq
+
+
+def loc(line, column):
+    return {"start": {"line": line, "column": column}, "end": {"line": line, "column": column + 1}}
+
+
+def ident(name, line, column):
+    return {"type": "Identifier", "name": name, "loc": loc(line, column)}
+
+
+# a = b;
+# f(c);
+PROGRAM = {"type": "Program", "body": [
+    {"type": "ExpressionStatement", "loc": loc(1, 0), "expression": {
+        "type": "AssignmentExpression", "operator": "=", "loc": loc(1, 0),
+        "left": ident("a", 1, 0), "right": ident("b", 1, 4)}},
+    {"type": "ExpressionStatement", "loc": loc(2, 0), "expression": {
+        "type": "CallExpression", "loc": loc(2, 0),
+        "callee": ident("f", 2, 0), "arguments": [ident("c", 2, 2)]}}]}
+
+
+class SourceMapTestCase(unittest.TestCase):
+
+    def test_vlq(self):
+        self.assertEqual(["A", "C", "D", "e", "gB", "hB", "2H"], [vlq(v) for v in (0, 1, -1, 15, 16, -16, 123)])
+
+    def test_generate_with_source_map(self):
+        code, source_map = jscodegen.generate_with_source_map(PROGRAM, file="out.js", source="in.js")
+        self.assertEqual("a = b;\nf(c);\n", code)
+        self.assertEqual({"version": 3, "file": "out.js", "sources": ["in.js"], "names": ["a", "b", "f", "c"],
+                          "mappings": "AAAAA,IAAIC;AACJC,EAAEC"}, source_map)
+
+    def test_compact(self):
+        code, source_map = jscodegen.generate_with_source_map(PROGRAM, compact=True)
+        self.assertEqual("a=b;f(c);", code)
+        self.assertEqual("AAAAA,EAAIC,EACJC,EAAEC", source_map["mappings"])
+
+    def test_range(self):
+        source = "x;\n  y;\n"
+        program = {"type": "Program", "body": [
+            {"type": "ExpressionStatement", "range": [0, 2], "expression": {"type": "Identifier", "name": "x", "range": [0, 1]}},
+            {"type": "ExpressionStatement", "range": [5, 7], "expression": {"type": "Identifier", "name": "y", "range": [5, 6]}}]}
+        code, source_map = jscodegen.generate_with_source_map(program, source="in.js", source_content=source)
+        self.assertEqual("x;\ny;\n", code)
+        self.assertEqual([source], source_map["sourcesContent"])
+        self.assertEqual("AAAAA;AACEC", source_map["mappings"])
+
+    def test_unmapped_nodes(self):
+        program = {"type": "Program", "body": [{"type": "ExpressionStatement", "expression": ident("a", 3, 2)}]}
+        code, source_map = jscodegen.generate_with_source_map(program)
+        self.assertEqual("AAEEA", source_map["mappings"])
+
+    def test_streaming(self):
+        code, expected = jscodegen.generate_with_source_map(PROGRAM)
+        source_map = SourceMap()
+        chunks = list(jscodegen.generate_iter(PROGRAM, buffer_size=1, source_map=source_map))
+        self.assertEqual(code, "".join(chunks))
+        self.assertEqual(expected, source_map.to_dict())
+
+    def test_deferred_nodes(self):
+        class Shallow(jscodegen.CodeGenerator):
+            max_inline_depth = 1
+
+        code, expected = jscodegen.generate_with_source_map(PROGRAM)
+        source_map = SourceMap()
+        self.assertEqual(code, "".join(Shallow(2).generate_iter(PROGRAM, None, source_map)))
+        self.assertEqual(expected, source_map.to_dict())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+
+
+def call(name, *args):
+    return {"type": "ExpressionStatement", "expression": {
+        "type": "CallExpression",
+        "callee": {"type": "Identifier", "name": name},
+        "arguments": [{"type": "Literal", "value": a, "raw": repr(a)} for a in args]}}
+
+
+def program(n):
+    body = []
+    for i in range(n):
+        body.append(call("f", i))
+        body.append({"type": "IfStatement", "test": {"type": "Identifier", "name": "x"},
+                     "consequent": {"type": "BlockStatement", "body": [call("g", i), call("h")]},
+                     "alternate": None})
+    return {"type": "Program", "body": body}
+
+
+class StreamingTestCase(unittest.TestCase):
+
+    def test_generate_iter(self):
+        tree = program(200)
+        expected = jscodegen.generate(tree)
+        chunks = list(jscodegen.generate_iter(tree, buffer_size=1000))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(expected, "".join(chunks))
+
+    def test_generate_iter_unbuffered(self):
+        tree = program(200)
+        chunks = list(jscodegen.generate_iter(tree, buffer_size=None))
+        self.assertEqual([jscodegen.generate(tree)], chunks)
+
+    def test_trailing_newline_of_flushed_statement(self):
+        # The try block ends with a line break that is taken back after it
+        # was generated, which must still work when output was flushed.
+        tree = {"type": "Program", "body": [{"type": "TryStatement",
+                "block": {"type": "BlockStatement", "body": [call("f", i) for i in range(50)]},
+                "handlers": [], "finalizer": {"type": "BlockStatement", "body": [call("g")]}}]}
+        expected = jscodegen.generate(tree)
+        self.assertEqual(expected, "".join(jscodegen.generate_iter(tree, buffer_size=1)))
+
+    def test_generate_to_text(self):
+        tree = program(50)
+        fp = io.StringIO()
+        jscodegen.generate_to(tree, fp, buffer_size=100)
+        self.assertEqual(jscodegen.generate(tree), fp.getvalue())
+
+    def test_generate_to_binary(self):
+        tree = {"type": "Program", "body": [call("f", "ü") for _ in range(100)]}
+        fp = io.BytesIO()
+        jscodegen.generate_to(tree, fp, buffer_size=100)
+        self.assertEqual(jscodegen.generate(tree).encode("utf-8"), fp.getvalue())
+
+    def test_generate_to_file(self):
+        tree = program(50)
+        with tempfile.TemporaryFile("w+b") as fp:
+            jscodegen.generate_to(tree, fp)
+            fp.seek(0)
+            self.assertEqual(jscodegen.generate(tree), fp.read().decode("utf-8"))
+
+
+if __name__ == '__main__':
+    unittest.main()
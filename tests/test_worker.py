@@ -0,0 +1,89 @@
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jscodegen
+from jscodegen.worker import Worker, serve_socket
+
+
+def program(name):
+    return {"type": "Program", "body": [
+        {"type": "ReturnStatement", "argument": {"type": "Identifier", "name": name}}]}
+
+
+def requests(count):
+    return b"".join(json.dumps({"id": i, "ast": program("v%d" % i)}).encode() + b"\n" for i in range(count))
+
+
+class WorkerTestCase(unittest.TestCase):
+
+    def test_handle(self):
+        worker = Worker()
+        response = worker.handle(json.dumps({"id": "a", "ast": program("é")}))
+        self.assertEqual(("a", "return é;\n"), (response["id"], response["code"]))
+        self.assertGreaterEqual(response["parse_time"], 0)
+        self.assertGreater(response["generate_time"], 0)
+        response = worker.handle(json.dumps({"id": 2, "ast": program("x"), "compact": True}))
+        self.assertEqual("return x;", response["code"])
+        tree = {"type": "Program", "body": [{"type": "IfStatement", "test": {"type": "Identifier", "name": "c"},
+                                             "consequent": program("x")["body"][0], "alternate": None}]}
+        self.assertEqual(jscodegen.generate(tree, indent=4),
+                         worker.handle(json.dumps({"ast": tree, "indent": 4}))["code"])
+
+    def test_errors(self):
+        worker = Worker()
+        self.assertEqual({"id": None, "error": "JSONDecodeError: Expecting value: line 1 column 1 (char 0)"},
+                         worker.handle("nope"))
+        response = worker.handle(json.dumps({"id": 7, "ast": {"type": "Identifier", "name": "x"}}))
+        self.assertEqual((7, "ValueError: cannot generate Identifier nodes on their own"),
+                         (response["id"], response["error"]))
+        self.assertIn("KeyError", worker.handle('{"id": 8}')["error"])
+
+    def test_serve(self):
+        out = io.BytesIO()
+        Worker().serve(io.BytesIO(requests(3) + b"\n"), out)
+        responses = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([(0, "return v0;\n"), (1, "return v1;\n"), (2, "return v2;\n")],
+                         [(response["id"], response["code"]) for response in responses])
+
+    def test_stdio(self):
+        result = subprocess.run([sys.executable, "-m", "jscodegen", "serve"], input=requests(50),
+                                stdout=subprocess.PIPE, cwd=str(Path(__file__).parent.parent), check=True)
+        responses = [json.loads(line) for line in result.stdout.splitlines()]
+        self.assertEqual(list(range(50)), [response["id"] for response in responses])
+        self.assertEqual("return v49;\n", responses[-1]["code"])
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "needs Unix sockets")
+    def test_socket(self):
+        path = os.path.join(tempfile.mkdtemp(), "jscodegen.sock")
+        threading.Thread(target=serve_socket, args=(path,), daemon=True).start()
+        for _ in range(100):
+            if os.path.exists(path):
+                break
+            time.sleep(0.01)
+        with socket.socket(socket.AF_UNIX) as client:
+            client.connect(path)
+            client.sendall(requests(20))
+            client.shutdown(socket.SHUT_WR)
+            data = b""
+            while True:
+                chunk = client.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+        responses = [json.loads(line) for line in data.splitlines()]
+        self.assertEqual(list(range(20)), [response["id"] for response in responses])
+
+
+if __name__ == '__main__':
+    unittest.main()